@@ -1,55 +1,60 @@
 # Document endpoints
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from typing import List
+import json
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from models import DocumentInfo, DocumentListResponse, DocumentOutline
 from services import document_service
+from services.documents import UploadTooLargeError, DocumentUtils
+from config import settings
+from outline_engine.shared_utils import OutlineMode
 
 router = APIRouter()
 
+OUTLINE_MODE_QUERY = Query(None, description="Outline mode: fast, balanced or thorough (default from server config)")
+
+def _check_declared_size(file: UploadFile):
+    # Cheap early rejection when the size is known up front; the streamed copy enforces the limit anyway
+    if file.size is not None and file.size > settings.max_file_size:
+        raise HTTPException(status_code=400, detail=f"File {file.filename} exceeds {DocumentUtils.format_size(settings.max_file_size)} size limit")
+
+def _check_outline_mode(outline_mode: Optional[str]):
+    try:
+        OutlineMode.get(outline_mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/upload", response_model=DocumentInfo)
-async def upload_document(file: UploadFile = File(...)):
+async def upload_document(file: UploadFile = File(...), outline_mode: Optional[str] = OUTLINE_MODE_QUERY):
     """Upload a single PDF document"""
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-    
-    # Check file size (50MB limit)
-    content = await file.read()
-    if len(content) > 50 * 1024 * 1024:  # 50MB in bytes
-        raise HTTPException(status_code=400, detail="File size must be less than 50MB")
-    
-    # Reset file pointer after reading
-    await file.seek(0)
+    _check_outline_mode(outline_mode)
+    _check_declared_size(file)
     
     try:
-        document = await document_service.upload_document(file)
+        document = await document_service.upload_document(file, outline_mode)
         return document
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/bulk-upload", response_model=List[DocumentInfo])
-async def bulk_upload_documents(files: List[UploadFile] = File(...)):
+async def bulk_upload_documents(files: List[UploadFile] = File(...), outline_mode: Optional[str] = OUTLINE_MODE_QUERY):
     """Upload multiple PDF documents"""
-    # Validate all files are PDFs and check file sizes
+    _check_outline_mode(outline_mode)
+    # Validate all files are PDFs and check declared sizes before storing any
     for file in files:
         if not file.filename.endswith('.pdf'):
             raise HTTPException(
                 status_code=400, 
                 detail=f"File {file.filename} is not a PDF"
             )
-        
-        # Check file size (50MB limit)
-        content = await file.read()
-        if len(content) > 50 * 1024 * 1024:  # 50MB in bytes
-            raise HTTPException(
-                status_code=400, 
-                detail=f"File {file.filename} exceeds 50MB size limit"
-            )
-        
-        # Reset file pointer after reading
-        await file.seek(0)
+        _check_declared_size(file)
     
     try:
-        documents = await document_service.bulk_upload_documents(files)
+        documents = await document_service.bulk_upload_documents(files, outline_mode)
         return documents
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -76,6 +81,19 @@ async def sync_documents():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/reclassify")
+def reclassify_documents():
+    """Re-classify all outlines with the current heading classifier settings, from stored layout features"""
+    # Plain def: the whole-library run blocks, so FastAPI runs it in its threadpool
+    try:
+        updated = document_service.reclassify_document_outlines()
+        return {
+            "message": "Outlines re-classified successfully",
+            "updated_documents": updated
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{document_id}", response_model=DocumentInfo)
 async def get_document(document_id: str):
     """Get document by ID"""
@@ -92,6 +110,29 @@ async def get_document_outline(document_id: str):
         raise HTTPException(status_code=404, detail="Outline not found")
     return DocumentOutline(**outline)
 
+@router.get("/{document_id}/outline/stream")
+async def stream_document_outline(document_id: str):
+    """Stream the document outline as NDJSON (the saved outline, or extracted live while it is incomplete)"""
+    events = document_service.stream_document_outline(document_id)
+    if events is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return StreamingResponse(
+        (json.dumps(event, ensure_ascii=False) + "\n" for event in events),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/{document_id}/sections/{heading_index}")
+async def get_section_text(document_id: str, heading_index: int):
+    """Get the body text under one outline heading (0-based index into the outline)"""
+    text = document_service.get_section_text(document_id, heading_index)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Section not found")
+    return {
+        "document_id": document_id,
+        "heading_index": heading_index,
+        "text": text
+    }
+
 @router.delete("/{document_id}")
 async def delete_document(document_id: str):
     """Delete a document"""
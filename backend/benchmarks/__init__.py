@@ -0,0 +1 @@
+# Outline engine benchmarks (run from backend/, e.g. python -m benchmarks.pattern_scanner)
@@ -0,0 +1,94 @@
+"""
+Heading memory benchmark: resident size of a library's outlines held as JSON-style dicts
+(plus the per-heading dict copies search used to build) versus the shared, slotted
+HeadingRecords of services.documents.outline_index.
+
+Outlines are synthetic but go through json.loads like the stored outline files, so
+strings are allocated the way the real loaders allocate them.
+
+Usage (from backend/):
+    python -m benchmarks.heading_memory [--documents 10000] [--headings 40]
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+from services.documents.outline_index import IndexedOutline
+
+WORDS = ("introduction overview background method results discussion analysis design "
+         "summary appendix data model system performance evaluation future work scope").split()
+
+
+def synthetic_outlines(documents: int, headings: int, seed: int = 7) -> List[str]:
+    """Outline JSON strings, one per document"""
+    rng = random.Random(seed)
+    outlines = []
+    for doc in range(documents):
+        items = [{"level": rng.choice(("H1", "H2", "H2", "H3", "H3", "H3")),
+                  "text": f"{i + 1}. " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))).title(),
+                  "page": 1 + i // 2}
+                 for i in range(headings)]
+        outlines.append(json.dumps({"title": f"Document {doc}", "outline": items}))
+    return outlines
+
+
+def dict_layout(outlines: List[str]) -> Dict:
+    """Outlines held as loaded, plus search's heading_data dict per heading"""
+    loaded, heading_data = {}, []
+    for doc, raw in enumerate(outlines):
+        doc_id = f"{doc:08d}-document.pdf"
+        outline = loaded[doc_id] = json.loads(raw)
+        for item in outline["outline"]:
+            heading_data.append({"heading": item["text"], "page": item["page"], "pdf_name": doc_id,
+                                 "pdf_id": doc_id, "level": item["level"]})
+    return {"outlines": loaded, "heading_data": heading_data}
+
+
+def record_layout(outlines: List[str]) -> Dict:
+    """IndexedOutlines, with search holding references to the same records"""
+    indexed, heading_data = {}, []
+    for doc, raw in enumerate(outlines):
+        doc_id = f"{doc:08d}-document.pdf"
+        outline = indexed[doc_id] = IndexedOutline.from_outline(doc_id, json.loads(raw))
+        heading_data.extend(outline.headings)
+    return {"outlines": indexed, "heading_data": heading_data}
+
+
+def measure(build: Callable[[List[str]], Dict], outlines: List[str]) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    held = build(outlines)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    headings = len(held["heading_data"])
+    return {"resident_mb": round((current - start) / 2**20, 2), "peak_mb": round((peak - start) / 2**20, 2),
+            "bytes_per_heading": round((current - start) / max(headings, 1), 1), "headings": headings}
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Compare heading memory layouts")
+    parser.add_argument('--documents', type=int, default=10000)
+    parser.add_argument('--headings', type=int, default=40, help="headings per document")
+    args = parser.parse_args(argv)
+
+    outlines = synthetic_outlines(args.documents, args.headings)
+    results = {"dicts": measure(dict_layout, outlines), "records": measure(record_layout, outlines)}
+
+    print(f"{args.documents} documents x {args.headings} headings")
+    print(f"{'layout':<10}{'resident MB':>14}{'peak MB':>10}{'B/heading':>12}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['resident_mb']:>14}{result['peak_mb']:>10}{result['bytes_per_heading']:>12}")
+    saved = 1 - results["records"]["resident_mb"] / results["dicts"]["resident_mb"]
+    print(f"records use {saved:.0%} less resident memory")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
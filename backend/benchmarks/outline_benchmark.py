@@ -0,0 +1,207 @@
+"""
+Outline engine benchmark: throughput, per-stage time, peak memory and accuracy
+against the ground truth of the synthetic corpus (see benchmarks.synthetic_corpus).
+
+Results are written as JSON (engine version, git commit, per-document and summary
+numbers) so runs on different commits can be compared with --compare.
+--mode picks the outline mode; "all" runs every mode and compares their speed and
+accuracy.
+
+Usage (from backend/):
+    python -m benchmarks.outline_benchmark [--corpus DIR] [--output results.json]
+                                           [--compare previous.json] [--repeat N]
+                                           [--mode fast|balanced|thorough|all]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import fitz
+
+from outline_engine import ENGINE_VERSION
+from outline_engine.rule_engine import SmartRuleEngine
+from outline_engine.shared_utils import MemoryUtils, StageTimer, OutlineMode, OUTLINE_MODES
+from benchmarks.synthetic_corpus import generate_corpus
+
+DEFAULT_CORPUS = os.path.join('storage', 'benchmark_corpus')
+
+
+def normalize(text: str) -> str:
+    return re.sub(r'\s+', ' ', text or '').strip().lower()
+
+
+def score_outline(expected: Dict, actual: Dict) -> Dict:
+    """Precision/recall on (text, page) pairs, level accuracy on the matched headings."""
+    truth = {(normalize(h['text']), h['page']): h['level'] for h in expected['outline']}
+    found = {(normalize(h['text']), h['page']): h['level'] for h in actual['outline']}
+    matched = truth.keys() & found.keys()
+    precision = len(matched) / len(found) if found else 0.0
+    recall = len(matched) / len(truth) if truth else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    levels = sum(1 for key in matched if truth[key] == found[key])
+    return {
+        'precision': round(precision, 4),
+        'recall': round(recall, 4),
+        'f1': round(f1, 4),
+        'level_accuracy': round(levels / len(matched), 4) if matched else 0.0,
+        'title_match': normalize(expected['title']) == normalize(actual['title']),
+        'expected_headings': len(truth),
+        'found_headings': len(found),
+    }
+
+
+def time_stages(engine: SmartRuleEngine, pdf_path: str, mode: Optional[str] = None) -> Dict[str, Dict]:
+    """Per-stage wall/CPU time (ms) and page counts from the engine's own instrumentation."""
+    timer = StageTimer()
+    engine.extract(pdf_path, timer=timer, mode=mode)
+    return timer.as_dict()['stages']
+
+
+def benchmark_document(engine: SmartRuleEngine, pdf_path: str, expected: Dict, repeat: int, mode: Optional[str] = None) -> Dict:
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = engine.extract(pdf_path, mode=mode)
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+
+    # Separate run: tracemalloc slows extraction down, so it is not timed
+    tracemalloc.start()
+    engine.extract(pdf_path, mode=mode)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'pages': page_count,
+        'seconds': round(seconds, 4),
+        'pages_per_sec': round(page_count / seconds, 2) if seconds else None,
+        'stages': time_stages(engine, pdf_path, mode),
+        'python_peak_mb': round(traced_peak / (1024 * 1024), 2),
+        'extraction_path': result.get('extraction_path'),
+        'accuracy': score_outline(expected, result),
+    }
+
+
+def summarize(documents: Dict[str, Dict]) -> Dict:
+    pages = sum(d['pages'] for d in documents.values())
+    seconds = sum(d['seconds'] for d in documents.values())
+    count = len(documents) or 1
+    return {
+        'documents': len(documents),
+        'pages': pages,
+        'seconds': round(seconds, 4),
+        'pages_per_sec': round(pages / seconds, 2) if seconds else None,
+        'mean_f1': round(sum(d['accuracy']['f1'] for d in documents.values()) / count, 4),
+        'mean_level_accuracy': round(sum(d['accuracy']['level_accuracy'] for d in documents.values()) / count, 4),
+        'titles_matched': sum(1 for d in documents.values() if d['accuracy']['title_match']),
+        'peak_rss_mb': MemoryUtils.peak_rss_mb(),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except Exception:
+        return None
+
+
+def load_corpus(folder: str) -> Dict[str, Dict]:
+    truth_path = os.path.join(folder, 'ground_truth.json')
+    if not os.path.exists(truth_path):
+        print(f"Generating synthetic corpus in {folder}")
+        return generate_corpus(folder)
+    with open(truth_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_report(results: Dict, previous: Optional[Dict] = None):
+    print(f"engine {results['engine_version']} @ {results['git_commit']}, {results.get('outline_mode')} mode")
+    columns = [('parse', 'parse'), ('font_analysis', 'fonts'), ('title', 'title'), ('headings', 'heads'), ('find_tables', 'tables')]
+    print("stage wall times in ms (parse and tables are included in fonts/heads); tbl pg: pages find_tables ran on")
+    print(f"{'document':<22}{'pages':>7}{'pages/s':>10}" + ''.join(f"{label:>8}" for _, label in columns)
+          + f"{'tbl pg':>8}{'py MB':>8}{'F1':>7}{'level':>7}")
+    for name, doc in results['documents'].items():
+        stages = doc['stages']
+        acc = doc['accuracy']
+        wall = ''.join(f"{stages.get(stage, {}).get('wall_ms', 0):>8.0f}" for stage, _ in columns)
+        print(f"{name:<22}{doc['pages']:>7}{doc['pages_per_sec']:>10.1f}{wall}"
+              f"{stages.get('find_tables', {}).get('pages', 0):>8}{doc['python_peak_mb']:>8.1f}{acc['f1']:>7.3f}{acc['level_accuracy']:>7.3f}")
+    summary = results['summary']
+    print(f"total: {summary['pages']} pages in {summary['seconds']:.2f}s ({summary['pages_per_sec']} pages/s), "
+          f"mean F1 {summary['mean_f1']}, titles {summary['titles_matched']}/{summary['documents']}, peak RSS {summary['peak_rss_mb']} MB")
+
+    if previous:
+        print(f"\ncompared with {previous.get('engine_version')} @ {previous.get('git_commit')}")
+        print(f"{'document':<22}{'pages/s':>18}{'F1':>18}")
+        for name, doc in results['documents'].items():
+            before = previous.get('documents', {}).get(name)
+            if not before:
+                continue
+            speed = doc['pages_per_sec'] / before['pages_per_sec'] if before.get('pages_per_sec') else 0.0
+            f1_delta = doc['accuracy']['f1'] - before['accuracy']['f1']
+            print(f"{name:<22}{speed:>17.2f}x{f1_delta:>+18.3f}")
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Benchmark the outline engine on a synthetic corpus")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="corpus folder (generated if missing)")
+    parser.add_argument('--output', default=None, help="write results JSON here")
+    parser.add_argument('--compare', default=None, help="previous results JSON to compare with")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per document (best is kept)")
+    parser.add_argument('--mode', default=None, choices=list(OUTLINE_MODES) + ['all'],
+                        help="outline mode (default: Config.DEFAULT_OUTLINE_MODE); 'all' compares every mode")
+    args = parser.parse_args(argv)
+
+    ground_truth = load_corpus(args.corpus)
+    engine = SmartRuleEngine()
+    modes = list(OUTLINE_MODES) if args.mode == 'all' else [OutlineMode.get(args.mode).name]
+    previous = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    runs = {}
+    for mode in modes:
+        documents = {}
+        for filename, expected in ground_truth.items():
+            documents[filename] = benchmark_document(engine, os.path.join(args.corpus, filename), expected, max(1, args.repeat), mode)
+        runs[mode] = {
+            'engine_version': ENGINE_VERSION,
+            'git_commit': git_commit(),
+            'outline_mode': mode,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'documents': documents,
+            'summary': summarize(documents),
+        }
+        print_report(runs[mode], previous if previous and previous.get('outline_mode', 'thorough') == mode else None)
+        print()
+
+    if len(runs) > 1:
+        print(f"{'mode':<10}{'pages/s':>10}{'F1':>8}{'level':>8}{'titles':>8}")
+        for mode, run in runs.items():
+            summary = run['summary']
+            print(f"{mode:<10}{summary['pages_per_sec']:>10.1f}{summary['mean_f1']:>8.3f}{summary['mean_level_accuracy']:>8.3f}"
+                  f"{summary['titles_matched']:>5}/{summary['documents']}")
+    results = runs[modes[0]] if len(runs) == 1 else {'modes': runs}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,105 @@
+"""
+Parallel page parsing benchmark: serial extraction versus extraction with pages parsed
+in the process pool first (PagePrefetcher).
+
+Besides wall time it reports the CPU time of the extracting process and of the pool
+workers (Linux /proc accounting), and pages parsed on each side: in parallel mode the
+parent should parse nothing. ``critical path`` is parent CPU plus worker CPU spread over
+the workers, i.e. the wall time to expect on a machine with that many free cores; on a
+single-core machine the measured parallel wall time is parent plus worker CPU instead.
+
+Usage (from backend/):
+    python -m benchmarks.parallel_parse [--corpus DIR] [--workers 4] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import fitz
+
+from config import Config
+from outline_engine.rule_engine import SmartRuleEngine, page_prefetcher
+from outline_engine.shared_utils import StageTimer
+from benchmarks.outline_benchmark import DEFAULT_CORPUS, load_corpus
+
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def worker_cpu_seconds() -> Optional[float]:
+    """User+system CPU of the live pool workers, or None where /proc is unavailable"""
+    pool = page_prefetcher._process_pool
+    if pool is None:
+        return 0.0
+    total = 0
+    try:
+        for pid in list(pool._processes):
+            with open(f'/proc/{pid}/stat', 'r') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            total += int(fields[11]) + int(fields[12])
+    except OSError:
+        return None
+    return total / _CLOCK_TICKS
+
+
+def run(engine: SmartRuleEngine, pdf_path: str, parallel: bool, repeat: int) -> Dict:
+    Config.ENABLE_PARALLEL = parallel
+    best = None
+    for _ in range(repeat):
+        timer = StageTimer()
+        workers_before = worker_cpu_seconds()
+        cpu, wall = time.process_time(), time.perf_counter()
+        engine.extract(pdf_path, timer=timer)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        workers_after = worker_cpu_seconds()
+        if best is None or wall < best['wall']:
+            stages = timer.as_dict()['stages']
+            best = {
+                'wall': wall,
+                'parent_cpu': cpu,
+                'worker_cpu': None if workers_before is None or workers_after is None else workers_after - workers_before,
+                'parent_pages': stages.get('parse', {}).get('pages', 0),
+                'worker_pages': stages.get('parallel_parse', {}).get('pages', 0),
+            }
+    return best
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Compare serial and pool-parsed outline extraction")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="corpus folder (generated if missing)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per document (fastest is kept)")
+    args = parser.parse_args(argv)
+
+    Config.MAX_WORKERS = args.workers
+    engine = SmartRuleEngine()
+    engine.page_prefetcher = page_prefetcher.PagePrefetcher(workers=args.workers)
+    documents = []
+    for name in load_corpus(args.corpus):
+        with fitz.open(os.path.join(args.corpus, name)) as doc:
+            if len(doc) > Config.PARALLEL_THRESHOLD:
+                documents.append(name)
+    # Warm the pool so process start-up is not charged to the first document
+    if documents:
+        run(engine, os.path.join(args.corpus, documents[0]), True, 1)
+
+    print(f"{args.workers} workers, {os.cpu_count()} CPUs; times in s")
+    print(f"{'document':<22}{'serial':>8}{'parallel':>10}{'parent cpu':>12}{'worker cpu':>12}"
+          f"{'critical path':>15}{'parsed p/w':>12}")
+    for name in documents:
+        pdf_path = os.path.join(args.corpus, name)
+        serial = run(engine, pdf_path, False, args.repeat)
+        parallel = run(engine, pdf_path, True, args.repeat)
+        worker_cpu = parallel['worker_cpu']
+        critical = parallel['parent_cpu'] + worker_cpu / args.workers if worker_cpu is not None else None
+        print(f"{name:<22}{serial['wall']:>8.2f}{parallel['wall']:>10.2f}{parallel['parent_cpu']:>12.2f}"
+              f"{worker_cpu if worker_cpu is not None else float('nan'):>12.2f}"
+              f"{critical if critical is not None else float('nan'):>15.2f}"
+              f"{parallel['parent_pages']:>6}/{parallel['worker_pages']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,164 @@
+"""
+Micro-benchmark: per-block cost of the detection pattern families.
+
+Compares the previous detection code (one re.search/re.match per pattern string,
+relying on the re module cache) with the precompiled PatternRegistry alternations.
+
+Usage (from backend/):
+    python -m benchmarks.pattern_scanner [file.pdf ...]
+"""
+
+import re
+import sys
+import time
+from typing import List
+
+from outline_engine.shared_utils import PatternRegistry, PDFTextUtils
+
+SAMPLE_BLOCKS = [
+    "1. Introduction",
+    "2.3 Related Work",
+    "Chapter 4: Results and Discussion 27",
+    "Table of Contents",
+    "S.No Name Age Relationship",
+    "1. 2. 3. 4.",
+    "Rs.",
+    "12",
+    "Date",
+    "The committee will review every proposal submitted before the deadline.",
+    "Please fill in the form below and submit it to the office.",
+    "January 12, 2024",
+    "Visit www.example.com for more information",
+    "Contact us at info@example.org",
+    "221B Baker Street, London",
+    "Background",
+    "What is the scope of this project?",
+    "Overview of the Digital Library Strategy",
+    "Body text lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor.",
+    "Summary Summary of findings",
+]
+
+
+# Previous implementations, kept verbatim as the "before" baseline
+def legacy_is_table_structure(text: str) -> bool:
+    table_patterns = [
+        r'S\.?No\.?\s+(Name|Description|Item)',
+        r'(Name|Item|Description)\s+(Age|Quantity|Amount)',
+        r'\d+\.\s+\d+\.\s+\d+\.',
+        r'(Name|Age|Relationship)\s+(Name|Age|Relationship)',
+    ]
+    for pattern in table_patterns:
+        if re.search(pattern, text, re.IGNORECASE):
+            return True
+    if re.search(r'S\.?No\.?\s+Name\s+Age\s+Relationship', text, re.IGNORECASE):
+        return True
+    if re.match(r'^\d+\.\s*\d+\.\s*\d+\.\s*\d+', text.strip()):
+        return True
+    return False
+
+
+def legacy_is_table_or_form_content(text: str) -> bool:
+    if re.match(r'^\d+\.?\s*$', text.strip()):
+        return True
+    form_patterns = [
+        r'^\d+\.\s*(Name|Designation|PAY|Whether|Home Town|Amount)',
+        r'^S\.?No\.?\s+(Name|Age|Relationship)',
+        r'^\d+\.\s+\d+\.\s*$',
+        r'^\d+\.\s+\d+\.\s+\d+\.\s*$',
+        r'^\d+\.\s+\d+\.\s+\d+\.\s+\d+',
+        r'^(Date|Signature)',
+        r'^Rs\.\s*$',
+        r'^\d+\s+\d+\s+\d+\s*$',
+        r'^\d+\s*\d+\s*\d+\s*$',
+    ]
+    for pattern in form_patterns:
+        if re.search(pattern, text, re.IGNORECASE):
+            return True
+    if len(text.strip()) <= 2 and text.strip().isdigit():
+        return True
+    if re.match(r'^\d+\.\s*[A-Z]\.?(\s*)?$', text.strip()):
+        return True
+    if re.match(r'^[\d\.\s]{2,10}$', text.strip()) and '.' in text:
+        return True
+    return False
+
+
+def legacy_is_toc_entry(text: str) -> bool:
+    if re.search(r'^(\d+\.|\d+\.\d+\.?|Chapter\s+\d+:?)\s+.+\s+\d+\s*$', text.strip()):
+        return True
+    if re.search(r'\d+\.\d+\s+[^0-9]+\s+\d+\s+\d+\.\d+', text):
+        return True
+    if re.search(r'^.+\s+\d{1,3}\s*$', text.strip()) and len(text.strip()) > 10:
+        return True
+    return False
+
+
+def legacy_is_non_heading(text: str) -> bool:
+    non_heading_patterns = [
+        r'^[A-Z][a-z]+.*[a-z]+\s+(will|are|is|have|has|can|should|must|would|could)\s+.+\.$',
+        r'^(Please|Click|Visit|Fill|Complete|Submit|Download|Upload|Print|Sign)\s+',
+        r'^(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d+,?\s+\d{4}',
+        r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',
+        r'^(Version|Copyright|©|$c$)\s+',
+        r'.*\d+.*\b(Street|St|Avenue|Ave|Drive|Dr|Road|Rd|Lane|Ln|Boulevard|Blvd)\b.*',
+        r'.*@.*\.(com|org|net|edu|gov).*',
+        r'.*(http|www\.|\.com|\.org).*',
+        r'^\d{5,}.*',
+        r'^(.{3,})\s+\1'
+    ]
+    for pattern in non_heading_patterns:
+        if re.match(pattern, text, re.IGNORECASE):
+            return True
+    return False
+
+
+LEGACY_CHECKS = {
+    'table_structure': legacy_is_table_structure,
+    'table_or_form': legacy_is_table_or_form_content,
+    'toc_entry': legacy_is_toc_entry,
+    'non_heading': legacy_is_non_heading,
+}
+
+
+def load_blocks(pdf_paths: List[str]) -> List[str]:
+    if not pdf_paths:
+        return SAMPLE_BLOCKS
+    import fitz
+    blocks = []
+    for path in pdf_paths:
+        doc = fitz.open(path)
+        for page in doc:
+            for block in page.get_text("dict")["blocks"]:
+                if block["type"] == 0:
+                    text = PDFTextUtils.extract_block_text(block)
+                    if text.strip():
+                        blocks.append(text)
+        doc.close()
+    return blocks
+
+
+def time_per_block(func, blocks: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in blocks:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(blocks)) * 1e6
+
+
+def main(argv: List[str]):
+    blocks = load_blocks(argv)
+    repeat = max(1, 20000 // len(blocks))
+    registry = PatternRegistry()
+    print(f"{len(blocks)} blocks x {repeat} rounds")
+    print(f"{'family':<18}{'before (us/block)':>20}{'after (us/block)':>20}{'speedup':>10}")
+    for family in registry.families():
+        legacy = LEGACY_CHECKS[family.name]
+        for text in blocks:
+            assert legacy(text) == family.matches(text), (family.name, text)
+        before = time_per_block(legacy, blocks, repeat)
+        after = time_per_block(family.first_match, blocks, repeat)
+        print(f"{family.name:<18}{before:>20.2f}{after:>20.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
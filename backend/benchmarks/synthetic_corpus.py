@@ -0,0 +1,189 @@
+"""
+Synthetic PDF corpus with known ground-truth outlines, generated offline with PyMuPDF.
+
+Each document is described by a CorpusSpec (page count, heading density, table and
+TOC pages, fonts, running header/footer). generate_corpus() writes the PDFs and a
+ground_truth.json mapping file name -> {"title", "outline"}.
+
+Usage (from backend/):
+    python -m benchmarks.synthetic_corpus OUTPUT_DIR
+"""
+
+import json
+import os
+import random
+import sys
+from typing import Dict, List, NamedTuple
+
+import fitz
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 72
+BOTTOM = PAGE_HEIGHT - 80
+
+# Base-14 font families: (body, bold)
+FONTS = {
+    'sans': ('helv', 'hebo'),
+    'serif': ('tiro', 'tibo'),
+    'mono': ('cour', 'cobo'),
+}
+
+# (font size, spacing after) per heading level
+HEADING_STYLE = {1: (18, 28), 2: (14, 22), 3: (12, 20)}
+BODY_SIZE, BODY_LEADING = 10, 14
+
+WORDS = (
+    "analysis budget policy review network storage schedule quality governance "
+    "evaluation program research delivery service infrastructure security training "
+    "overview strategy procurement community outcome framework standard capacity "
+    "pipeline reporting operations compliance assessment partnership"
+).split()
+
+
+class CorpusSpec(NamedTuple):
+    name: str
+    pages: int
+    headings_per_page: float = 2.0
+    table_every: int = 0         # draw a ruled table on every n-th page (0 = never)
+    toc: bool = False            # page 2 is a table of contents
+    font: str = 'sans'
+    running_header: bool = True  # repeated header and numbered footer on every page
+    seed: int = 0
+
+
+DEFAULT_SPECS = [
+    CorpusSpec('dense_short', pages=5, headings_per_page=5, seed=1),
+    CorpusSpec('report_medium', pages=40, headings_per_page=2, table_every=3, toc=True, seed=2),
+    CorpusSpec('serif_sparse', pages=60, headings_per_page=0.5, font='serif', seed=3),
+    CorpusSpec('mono_tables', pages=30, headings_per_page=1.5, table_every=2, font='mono', seed=4),
+    CorpusSpec('manual_long', pages=250, headings_per_page=1.5, table_every=5, toc=True, seed=5),
+]
+
+
+class _Writer:
+    """Lays out text top to bottom, starting a new page when the current one is full."""
+
+    def __init__(self, doc, spec: CorpusSpec, rng: random.Random):
+        self.doc = doc
+        self.spec = spec
+        self.rng = rng
+        self.body_font, self.bold_font = FONTS[spec.font]
+        self.page = None
+        self.y = 0
+
+    def new_page(self):
+        self.page = self.doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        self.y = MARGIN
+        if self.spec.running_header:
+            self.page.insert_text((MARGIN, 36), "Northwind Holdings - Internal", fontsize=9, fontname=self.bold_font)
+            self.page.insert_text((PAGE_WIDTH / 2, PAGE_HEIGHT - 36), str(len(self.doc)), fontsize=9, fontname=self.body_font)
+
+    @property
+    def page_number(self) -> int:
+        return len(self.doc)
+
+    def ensure_space(self, height: float):
+        if self.page is None or self.y + height > BOTTOM:
+            self.new_page()
+
+    def text(self, text: str, size: float, bold: bool = False, after: float = BODY_LEADING):
+        self.ensure_space(size + after)
+        self.y += size
+        self.page.insert_text((MARGIN, self.y), text, fontsize=size, fontname=self.bold_font if bold else self.body_font)
+        self.y += after - size
+
+    def paragraph(self, lines: int):
+        for _ in range(lines):
+            words = [self.rng.choice(WORDS) for _ in range(self.rng.randint(9, 12))]
+            self.text(' '.join(words).capitalize() + '.', BODY_SIZE)
+        self.y += 8
+
+    def table(self, rows: int = 4, cols: int = 3):
+        height = rows * 20
+        self.ensure_space(height + 20)
+        for r in range(rows):
+            for c in range(cols):
+                rect = fitz.Rect(MARGIN + c * 120, self.y + r * 20, MARGIN + (c + 1) * 120, self.y + (r + 1) * 20)
+                self.page.draw_rect(rect)
+                self.page.insert_text((rect.x0 + 4, rect.y0 + 14), f"{self.rng.choice(WORDS)} {r}{c}", fontsize=9, fontname=self.body_font)
+        self.y += height + 20
+
+
+def _heading_title(rng: random.Random) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))).title()
+
+
+def generate_document(path: str, spec: CorpusSpec) -> Dict:
+    """Write one synthetic PDF and return its ground truth {"title", "outline"}."""
+    rng = random.Random(spec.seed)
+    doc = fitz.open()
+    writer = _Writer(doc, spec, rng)
+    title = f"{_heading_title(rng)} Annual Report"
+    outline: List[Dict] = []
+
+    writer.new_page()
+    writer.text(title, 26, bold=True, after=40)
+    writer.paragraph(4)
+
+    # Number of headings and the section tree they form
+    total_headings = max(1, round(spec.pages * spec.headings_per_page))
+    numbering = [0, 0, 0]
+    headings = []
+    for i in range(total_headings):
+        level = 1 if i == 0 else rng.choices((1, 2, 3), weights=(2, 4, 3))[0]
+        if level > 1 and numbering[level - 2] == 0:
+            level = 1
+        numbering[level - 1] += 1
+        for deeper in range(level, 3):
+            numbering[deeper] = 0
+        number = '.'.join(str(n) for n in numbering[:level])
+        label = f"{number}." if level == 1 else number
+        headings.append((level, f"{label} {_heading_title(rng)}"))
+
+    toc_page = None
+    if spec.toc:
+        writer.new_page()
+        toc_page = writer.page_number
+        writer.text("Table of Contents", 16, bold=True, after=26)
+        for level, text in [h for h in headings if h[0] == 1][:30]:
+            writer.text(f"{text} {rng.randint(3, spec.pages)}", BODY_SIZE + 1)
+        outline.append({'level': 'H1', 'text': 'Table of Contents', 'page': toc_page})
+        writer.new_page()
+
+    # Spread the body over the requested page count
+    body_pages = max(1, spec.pages - writer.page_number + 1)
+    lines_per_heading = max(1, int(body_pages * 48 / len(headings)) - 3)
+    for index, (level, text) in enumerate(headings):
+        size, after = HEADING_STYLE[level]
+        writer.ensure_space(size + after + BODY_LEADING * 2)
+        writer.text(text, size, bold=True, after=after)
+        outline.append({'level': f'H{level}', 'text': text, 'page': writer.page_number})
+        writer.paragraph(min(lines_per_heading, 40))
+        if spec.table_every and writer.page_number % spec.table_every == 0 and index % 2 == 0:
+            writer.table()
+    while writer.page_number < spec.pages:
+        writer.new_page()
+        writer.paragraph(20)
+
+    doc.set_metadata({})
+    doc.save(path)
+    doc.close()
+    return {'title': title, 'outline': outline}
+
+
+def generate_corpus(folder: str, specs: List[CorpusSpec] = None) -> Dict[str, Dict]:
+    os.makedirs(folder, exist_ok=True)
+    ground_truth = {}
+    for spec in specs or DEFAULT_SPECS:
+        filename = f"{spec.name}.pdf"
+        ground_truth[filename] = generate_document(os.path.join(folder, filename), spec)
+    with open(os.path.join(folder, 'ground_truth.json'), 'w', encoding='utf-8') as f:
+        json.dump(ground_truth, f, indent=2, ensure_ascii=False)
+    return ground_truth
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else 'benchmark_corpus'
+    truth = generate_corpus(output)
+    for filename, expected in truth.items():
+        print(f"{filename}: {len(expected['outline'])} headings")
@@ -14,6 +14,9 @@ class Settings(BaseSettings):
     storage_path: str = "./storage"
     upload_folder: str = "storage/pdfs"
     outline_folder: str = "storage/outlines"
+    outline_cache_folder: str = "storage/outline_cache"
+    page_cache_folder: str = "storage/page_cache"
+    reoutline_checkpoint_file: str = "storage/reoutline_checkpoint.json"
     audio_folder: str = "storage/audio"
     upload_path: str = "./storage/uploads"
     outline_path: str = "./storage/outlines"
@@ -49,6 +52,8 @@ class Settings(BaseSettings):
     connection_limit: int = 5  # Max connections to return
     snippet_length: int = 300  # Characters per snippet
     enable_timing_measurements: bool = os.getenv("ENABLE_TIMING_MEASUREMENTS", "true").lower() == "true"
+    document_pool_size: int = int(os.getenv("DOCUMENT_POOL_SIZE", "8"))  # open PDF handles kept for page text access
+    page_text_cache_size: int = int(os.getenv("PAGE_TEXT_CACHE_SIZE", "16"))  # documents whose page text is kept in memory
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     
     # TTS settings
@@ -71,7 +76,8 @@ settings = Settings()
 # Round 1A outline extraction Config (copied from temp-repo, kept separate from runtime Settings)
 class Config:
     # Performance limits
-    MAX_PROCESSING_TIME = 10
+    MAX_PROCESSING_TIME = 10  # seconds before upload saves a partial outline
+    MAX_PROCESSING_PAGES = None  # pages processed during upload (None = no limit)
     MAX_MODEL_SIZE = 200
 
     # Detection thresholds
@@ -81,13 +87,44 @@ class Config:
     H3_SIZE_RATIO = 1.1
 
     # PDF Analysis thresholds
-    MIN_TEXT_EXTRACTION_RATE = 0.5
+    MIN_TEXT_EXTRACTION_RATE = 0.5  # below this share of text pages an outline is flagged "scanned"
     MAX_FONT_VARIETY = 15
-    SCANNED_PAGE_THRESHOLD = 0.3
+    SCANNED_PAGE_THRESHOLD = 0.3  # image-only page: text covers less than this share of the image area
+    SKIP_IMAGE_ONLY_PAGES = True  # don't parse or classify image-only (scanned) pages
+
+    # Outline mode when an upload doesn't pick one: "fast", "balanced" or "thorough" (see OutlineMode)
+    DEFAULT_OUTLINE_MODE = "thorough"
+
+    # Embedded bookmark fast path
+    USE_BOOKMARKS = True
+    BOOKMARK_MIN_ENTRIES = 3
+    BOOKMARK_MAX_LEVEL = 3
+
+    # Reuse per-page results for pages already seen (revised uploads)
+    INCREMENTAL_EXTRACTION = True
+
+    # Running header/footer suppression: same text at the same height on this share of pages
+    RUNNING_TEXT_MIN_PAGE_RATIO = 0.5
+    RUNNING_TEXT_MIN_PAGES = 3
+
+    # Streaming extraction
+    STREAM_FONT_SAMPLE_PAGES = 20
+
+    # Low-memory extraction (text-only page dicts, bounded page window)
+    LOW_MEMORY_PAGE_THRESHOLD = 500  # pages; larger documents use low-memory mode
+    LOW_MEMORY_WINDOW = 16  # parsed pages kept alive at once
+
+    # Save parsed layout features (<outline>.features.npz) at ingest, in the background, for re-classification
+    PERSIST_LAYOUT_FEATURES = True
+    # Save document text (<outline>.txt) and per-heading section spans at ingest
+    PERSIST_SECTION_TEXT = True
 
     # Performance settings
     ENABLE_PARALLEL = True
     PARALLEL_THRESHOLD = 10  # pages
+    PARALLEL_CHUNK_PAGES = 16  # pages parsed per worker task
+    MAX_WORKERS = None  # None = os.cpu_count()
+    BATCH_OUTLINE_WORKERS = None  # processes for batch re-outlining; None = os.cpu_count()
     CACHE_SIZE = 128
     OCR_DPI = 1.5  # Balance quality/speed
 
@@ -14,10 +14,18 @@ class DocumentInfo(BaseModel):
     upload_time: datetime
     has_outline: bool = False
     page_count: Optional[int] = None
+    content_hash: Optional[str] = None  # SHA-256 of the PDF bytes
 
 class DocumentOutline(BaseModel):
     title: str
     outline: List[Dict[str, Any]]
+    extraction_path: Optional[str] = None  # "bookmarks" or "heuristic"
+    complete: bool = True  # False while the remaining pages are still being processed
+    sections: Optional[Dict[str, Any]] = None  # body spans per heading into the document text
+    skipped_pages: Optional[List[int]] = None  # image-only (scanned) pages left out of extraction
+    scanned: bool = False  # mostly image-only pages; the outline is likely incomplete
+    outline_mode: Optional[str] = None  # "fast", "balanced" or "thorough" (see OutlineMode)
+    metadata: Optional[Dict[str, Any]] = None  # e.g. per-stage "timings" when timing measurements are enabled
 
 class DocumentListResponse(BaseModel):
     documents: List[DocumentInfo]
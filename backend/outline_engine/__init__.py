@@ -1 +1,5 @@
 # Outline extraction engine package (Round 1A logic)
+
+# Bump whenever a change alters extracted outlines; cached outlines from other
+# versions are regenerated on next access.
+ENGINE_VERSION = "2.2.0"
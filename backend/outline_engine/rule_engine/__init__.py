@@ -1 +1,2 @@
 from .smart_rule_engine import SmartRuleEngine
+from .section_segmenter import SectionSegmenter
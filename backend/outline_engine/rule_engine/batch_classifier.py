@@ -0,0 +1,93 @@
+# batch_classifier.py
+import re
+import numpy as np
+from typing import List, Dict, Optional
+from .level_classifier import LevelClassifier
+
+# Feature matrix columns
+FONT_SIZE, IS_BOLD, TEXT_LENGTH = 0, 1, 2
+
+# Text rules at the bottom of LevelClassifier._classify_by_font_hierarchy
+_FALLBACK_TEXT_PATTERNS = [
+    re.compile(r'^\d+\.'),
+    re.compile(r'^(Appendix|Chapter|Section|Part)\s+[A-Z0-9]', re.I),
+]
+
+
+class BatchLevelClassifier:
+    """Classifies all text blocks of a page at once.
+
+    A vectorized pre-filter over font size, boldness and length rejects blocks
+    that LevelClassifier can never label; only the survivors go through the
+    full regex cascade, so labels are identical to the per-block path.
+    """
+
+    def __init__(self, heading_patterns, level_classifier: Optional[LevelClassifier] = None):
+        self.heading_patterns = heading_patterns
+        self.level_classifier = level_classifier or LevelClassifier(heading_patterns)
+        self.text_cue = self._compile_text_cue(list(heading_patterns.values()) + _FALLBACK_TEXT_PATTERNS)
+
+    @staticmethod
+    def _compile_text_cue(patterns: List) -> re.Pattern:
+        # One alternation that matches whenever any pattern that can yield a label would match
+        parts = []
+        for pattern in patterns:
+            flags = 'i' if pattern.flags & re.IGNORECASE else ''
+            parts.append(f'(?{flags}:{pattern.pattern})' if flags else f'(?:{pattern.pattern})')
+        return re.compile('|'.join(parts))
+
+    @staticmethod
+    def build_features(texts: List[str], font_sizes: List[float], bold_flags: List[bool]) -> np.ndarray:
+        features = np.empty((len(texts), 3), dtype=np.float64)
+        features[:, FONT_SIZE] = font_sizes
+        features[:, IS_BOLD] = bold_flags
+        features[:, TEXT_LENGTH] = [len(text) for text in texts]
+        return features
+
+    @staticmethod
+    def font_label_mask(features: np.ndarray, font_hierarchy: Dict) -> np.ndarray:
+        """Rows for which the font-size ladder in LevelClassifier returns a label."""
+        h2_threshold = font_hierarchy.get('h2', 12.0)
+        h3_threshold = font_hierarchy.get('h3', 11.0)
+        body_size = font_hierarchy.get('body', 10.0)
+        tolerance = 0.8
+        size = features[:, FONT_SIZE]
+        bold = features[:, IS_BOLD] > 0
+        length = features[:, TEXT_LENGTH]
+        # Branches of the elif ladder, each excluding the ones before it
+        taken = np.zeros(len(features), dtype=bool)
+        fires = np.zeros(len(features), dtype=bool)
+        branches = [
+            (size >= 16.0, 100),
+            (size >= 13.0, 60),
+            ((size >= 12.0) | (np.abs(size - h2_threshold) <= tolerance), 60),
+            ((size >= h3_threshold) | (np.abs(size - h3_threshold) <= tolerance), 50),
+            (bold & (size > body_size * 1.05), 40),
+        ]
+        for condition, max_length in branches:
+            branch = condition & ~taken
+            fires |= branch & (length < max_length)
+            taken |= branch
+        return fires
+
+    def candidate_mask(self, texts: List[str], features: np.ndarray, font_hierarchy: Dict) -> np.ndarray:
+        length = features[:, TEXT_LENGTH]
+        mask = (length >= 3) & (length <= 150)
+        font_fires = self.font_label_mask(features, font_hierarchy)
+        # Only blocks the font ladder rejects need the text cue
+        for i in np.flatnonzero(mask & ~font_fires):
+            if not self.text_cue.search(texts[i]):
+                mask[i] = False
+        return mask
+
+    def candidate_indices(self, texts: List[str], font_sizes: List[float], bold_flags: List[bool], font_hierarchy: Dict) -> np.ndarray:
+        if not texts:
+            return np.zeros(0, dtype=np.intp)
+        features = self.build_features(texts, font_sizes, bold_flags)
+        return np.flatnonzero(self.candidate_mask(texts, features, font_hierarchy))
+
+    def classify(self, texts: List[str], font_sizes: List[float], bold_flags: List[bool], font_hierarchy: Dict, page_num: int = 1) -> List[Optional[str]]:
+        levels: List[Optional[str]] = [None] * len(texts)
+        for i in self.candidate_indices(texts, font_sizes, bold_flags, font_hierarchy):
+            levels[i] = self.level_classifier.determine_heading_level_generic(texts[i], font_sizes[i], bold_flags[i], font_hierarchy, page_num)
+        return levels
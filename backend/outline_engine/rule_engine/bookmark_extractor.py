@@ -0,0 +1,50 @@
+# bookmark_extractor.py
+from typing import List, Dict, Optional
+from config import Config
+from ..shared_utils import DocumentAnalysisUtils
+
+
+class BookmarkExtractor:
+    """Builds the outline directly from a PDF's embedded bookmark tree when it looks trustworthy."""
+
+    @staticmethod
+    def read_toc(doc) -> List:
+        try:
+            return doc.get_toc(simple=True)
+        except Exception:
+            return []
+
+    def extract_outline(self, doc) -> Optional[List[Dict]]:
+        return self.extract_outline_from_toc(self.read_toc(doc), len(doc))
+
+    def extract_outline_from_toc(self, toc: List, page_count: int) -> Optional[List[Dict]]:
+        if not self.is_trustworthy(toc, page_count):
+            return None
+        headings = []
+        for level, text, page in toc:
+            if level > Config.BOOKMARK_MAX_LEVEL:
+                continue
+            headings.append({'level': f'H{level}', 'text': ' '.join(text.split()), 'page': page})
+        return DocumentAnalysisUtils.validate_hierarchy(headings)
+
+    def is_trustworthy(self, toc: List, page_count: int) -> bool:
+        if len(toc) < Config.BOOKMARK_MIN_ENTRIES:
+            return False
+        last_level = 0
+        for level, text, page in toc:
+            if not text or not text.strip():
+                return False
+            if page < 1 or page > page_count:
+                return False
+            if level < 1 or level > last_level + 1:
+                return False
+            last_level = level
+        return True
+
+    def extract_title(self, doc) -> Optional[str]:
+        return self.normalize_title((doc.metadata or {}).get('title'))
+
+    @staticmethod
+    def normalize_title(title: Optional[str]) -> Optional[str]:
+        title = ' '.join((title or '').split())
+        return title or None
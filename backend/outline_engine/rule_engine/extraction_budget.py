@@ -0,0 +1,32 @@
+# extraction_budget.py
+import time
+from typing import Iterator, Optional
+
+
+class ExtractionBudget:
+    """Time and page limits for one extraction; page iteration stops once either is spent."""
+
+    def __init__(self, time_budget: Optional[float] = None, max_pages: Optional[int] = None):
+        self.deadline = time.monotonic() + time_budget if time_budget else None
+        self.max_pages = max_pages
+        self.exhausted = False
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline; None without a time budget"""
+        return None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+
+    def page_limit(self, page_count: int) -> int:
+        return min(page_count, self.max_pages) if self.max_pages else page_count
+
+    def pages(self, page_count: int) -> Iterator[int]:
+        limit = self.page_limit(page_count)
+        for page_num in range(limit):
+            if self.expired():
+                self.exhausted = True
+                return
+            yield page_num
+        if limit < page_count:
+            self.exhausted = True
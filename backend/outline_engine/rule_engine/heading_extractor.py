@@ -1,53 +1,74 @@
 # heading_extractor.py (copied)
 import re
-from typing import List, Dict
+from typing import FrozenSet, Iterable, Iterator, List, Dict, Tuple
 from ..shared_utils import (
     PDFTextUtils, DocumentAnalysisUtils, TableDetectionUtils,
-    TOCDetectionUtils, GeometricUtils
+    TOCDetectionUtils, PatternRegistry, RunningTextDetector, StageTimer
 )
 from .level_classifier import LevelClassifier
+from .batch_classifier import BatchLevelClassifier
 
 class HeadingExtractor:
-    def __init__(self, heading_patterns):
+    def __init__(self, heading_patterns, pattern_registry: PatternRegistry = None):
         self.heading_patterns = heading_patterns
-        self.level_classifier = LevelClassifier(heading_patterns)
+        self.level_classifier = LevelClassifier(heading_patterns, pattern_registry)
+        self.batch_classifier = BatchLevelClassifier(heading_patterns, self.level_classifier)
 
-    def extract_headings(self, doc, font_hierarchy: Dict, title: str = None) -> List[Dict]:
+    def extract_headings(self, layout, font_hierarchy: Dict, title: str = None, running_text: FrozenSet[int] = frozenset()) -> List[Dict]:
+        # Pages were parsed in worker processes up front when the document is large enough (see PagePrefetcher)
         headings = []
-        doc_type = DocumentAnalysisUtils.detect_document_type(doc)
-        for page_num, page in enumerate(doc):
-            page_headings = self._extract_page_headings(page, page_num + 1, font_hierarchy, title, doc_type)
+        for page_num, page_headings in self.iter_page_headings(layout, font_hierarchy, title, running_text=running_text):
             headings.extend(page_headings)
-        headings = DocumentAnalysisUtils.validate_hierarchy(headings)
-        return headings
+        return DocumentAnalysisUtils.validate_hierarchy(headings)
+
+    def iter_page_headings(self, layout, font_hierarchy: Dict, title: str = None, doc_type: str = None, pages: Iterable[int] = None,
+                           running_text: FrozenSet[int] = frozenset()) -> Iterator[Tuple[int, List[Dict]]]:
+        # Raw per-page headings in page order, before validate_hierarchy
+        if doc_type is None:
+            doc_type = DocumentAnalysisUtils.detect_document_type(layout)
+        for page_num in (range(len(layout)) if pages is None else pages):
+            yield page_num + 1, self._extract_page_headings(layout[page_num], page_num + 1, font_hierarchy, title, doc_type, running_text)
 
-    def _extract_page_headings(self, page, page_num: int, font_hierarchy: Dict, title: str = None, doc_type: str = 'general') -> List[Dict]:
-        blocks = page.get_text("dict")["blocks"]
-        if TOCDetectionUtils.is_table_of_contents_page(page, blocks):
-            return TOCDetectionUtils.extract_toc_heading_only(blocks, page_num)
-        return self._extract_generic_headings(blocks, page_num, font_hierarchy, title)
+    def _extract_page_headings(self, page_layout, page_num: int, font_hierarchy: Dict, title: str = None, doc_type: str = 'general',
+                               running_text: FrozenSet[int] = frozenset()) -> List[Dict]:
+        blocks = page_layout.blocks
+        if page_layout.mode.toc_detection:
+            with StageTimer.measure(page_layout.timer, 'toc_detection', pages=1):
+                is_toc_page = TOCDetectionUtils.is_table_of_contents_page(page_layout.text, blocks)
+            if is_toc_page:
+                return TOCDetectionUtils.extract_toc_heading_only(blocks, page_num)
+        return self._extract_generic_headings(page_layout, page_num, font_hierarchy, title, running_text)
 
-    def _extract_generic_headings(self, blocks: List[Dict], page_num: int, font_hierarchy: Dict, title: str = None) -> List[Dict]:
+    def _extract_generic_headings(self, page_layout, page_num: int, font_hierarchy: Dict, title: str = None,
+                                  running_text: FrozenSet[int] = frozenset()) -> List[Dict]:
         headings = []
-        table_areas = TableDetectionUtils.detect_tables(None, blocks) if blocks else []
-        for block in blocks:
+        text_blocks = []
+        texts = []
+        for block in page_layout.blocks:
             if block["type"] != 0:
                 continue
             text = PDFTextUtils.extract_block_text(block).strip()
             if not text:
                 continue
-            if GeometricUtils.is_block_in_table(block, table_areas):
-                continue
+            text_blocks.append(block)
+            texts.append(text)
+        font_sizes = [PDFTextUtils.get_block_font_size(block) for block in text_blocks]
+        bold_flags = [PDFTextUtils.is_block_bold(block) for block in text_blocks]
+        # Body text is rejected in bulk; only candidates reach the per-block checks
+        for i in self.batch_classifier.candidate_indices(texts, font_sizes, bold_flags, font_hierarchy):
+            block, text = text_blocks[i], texts[i]
             if TableDetectionUtils.is_table_or_form_content(text):
                 continue
             if TOCDetectionUtils.is_toc_entry(text):
                 continue
             if title and text.strip().lower() == title.strip().lower():
                 continue
-            font_size = PDFTextUtils.get_block_font_size(block)
-            is_bold = PDFTextUtils.is_block_bold(block)
-            level = self.level_classifier.determine_heading_level_generic(text, font_size, is_bold, font_hierarchy, page_num)
-            if level:
+            # Running headers/footers repeat across pages at the same position
+            if running_text and RunningTextDetector.block_key(block, page_layout.height, text) in running_text:
+                continue
+            level = self.level_classifier.determine_heading_level_generic(text, font_sizes[i], bold_flags[i], font_hierarchy, page_num)
+            # Table check last so find_tables only runs on pages with real heading candidates
+            if level and not page_layout.is_block_in_table(block):
                 headings.append({'level': level,'text': text,'page': page_num})
         return headings
 
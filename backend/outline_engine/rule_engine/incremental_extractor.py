@@ -0,0 +1,139 @@
+# incremental_extractor.py
+import hashlib
+import json
+from typing import Dict, FrozenSet, List, Optional
+from .. import ENGINE_VERSION
+from ..shared_utils import DocumentAnalysisUtils, SpanTable, StageTimer
+from .extraction_budget import ExtractionBudget
+
+# Heading results kept per page for this many document contexts
+MAX_CONTEXTS_PER_PAGE = 4
+
+
+class IncrementalExtractor:
+    """Heuristic extraction that reuses per-page results for pages seen before.
+
+    Each page is keyed by a hash of its content stream (with the Form XObjects it draws),
+    size, rotation and fonts. The page cache (any object with ``get(page_hash)`` /
+    ``put(page_hash, entry)``) holds:
+
+    - ``features``: the page's span rows and block keys (SpanTable.page_features), so
+      font statistics and running-text detection cover the whole document without
+      re-parsing unchanged pages;
+    - ``headings``: raw page headings per document context (font hierarchy, title,
+      document type, running text). They are reused only when the context matches.
+
+    Only new or changed pages are parsed and classified; the result is identical to a
+    full extraction. Pages are hashed when first visited, so a budget bounds hashing too.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    @staticmethod
+    def page_hash(page) -> str:
+        digest = hashlib.sha256()
+        rect = page.rect
+        digest.update(f"{rect.x0},{rect.y0},{rect.x1},{rect.y1},{page.rotation}".encode())
+        # Font descriptors without xrefs, which change when a revision is re-saved
+        for font in sorted(tuple(str(field) for field in font[1:]) for font in page.get_fonts()):
+            digest.update('|'.join(font).encode('utf-8', 'replace'))
+        digest.update(page.read_contents() or b'')
+        # Form XObjects the page draws, nested ones included: a page whose contents only
+        # invoke one ("q /fzFrm0 Do Q", as show_pdf_page writes) keeps its text there
+        doc = page.parent
+        for xref, name, _, bbox in page.get_xobjects():
+            digest.update(f"{name}|{tuple(bbox)}|{doc.xref_get_key(xref, 'Matrix')}".encode())
+            digest.update(doc.xref_stream(xref) or b'')
+        return digest.hexdigest()
+
+    @staticmethod
+    def context_key(font_hierarchy: Dict, title: str, doc_type: str, running_text: FrozenSet[int], mode: str) -> str:
+        context = [ENGINE_VERSION, font_hierarchy, title, doc_type, sorted(running_text), mode]
+        return hashlib.sha256(json.dumps(context, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def extract(self, layout, page_cache, budget: Optional[ExtractionBudget] = None) -> Dict:
+        engine = self.engine
+        timer = layout.timer
+        page_count = len(layout)
+        # Image-only pages are cached apart from the same page parsed as text
+        image_only = layout.image_only_pages or frozenset()
+        # Pages are hashed on first use, so the budget also bounds hashing
+        hashes: List[Optional[str]] = [None] * page_count
+        entries: List[Optional[Dict]] = [None] * page_count
+        dirty = set()
+
+        def pages():
+            return budget.pages(page_count) if budget else range(page_count)
+
+        def lookup(page_num: int) -> Optional[Dict]:
+            if hashes[page_num] is None:
+                with StageTimer.measure(timer, 'page_hashes', pages=1):
+                    hashes[page_num] = self.page_hash(layout.doc[page_num]) + ('-image-only' if page_num in image_only else '')
+                    entries[page_num] = page_cache.get(hashes[page_num])
+            return entries[page_num]
+
+        def page_features(page_num: int) -> Dict:
+            if lookup(page_num) is None:
+                entries[page_num] = {'features': SpanTable.page_features(layout[page_num]), 'headings': {}}
+                dirty.add(page_num)
+            return entries[page_num]['features']
+
+        prefetch = engine.page_prefetcher.enabled_for(layout, budget.page_limit(page_count) if budget else page_count)
+        if prefetch:
+            # New pages are parsed in the process pool before font analysis needs their features
+            engine.page_prefetcher.prefetch(layout, (page_num for page_num in pages() if lookup(page_num) is None), budget)
+
+        font_pages = layout.mode.font_pages(budget.page_limit(page_count) if budget else page_count)
+        with StageTimer.measure(timer, 'font_analysis') as stage:
+            table = SpanTable.from_page_features((page_num, page_features(page_num)) for page_num in (pages() if font_pages is None else font_pages))
+            font_hierarchy = engine.font_analyzer.analyze_span_table(table)
+            running_text = engine.running_text_detector.detect(table)
+            stage['pages'] = table.page_count
+        with StageTimer.measure(timer, 'title'):
+            title = engine.title_extractor.extract_title(layout, font_hierarchy)
+        doc_type = DocumentAnalysisUtils.detect_document_type(layout)
+        context = self.context_key(font_hierarchy, title, doc_type, running_text, layout.mode.name)
+        if prefetch:
+            # Known pages whose headings were cached under another context are classified again
+            engine.page_prefetcher.prefetch(layout, (page_num for page_num in pages()
+                                                     if context not in (lookup(page_num) or {}).get('headings', {})), budget)
+
+        headings = []
+        pages_processed = reused = 0
+        with StageTimer.measure(timer, 'headings') as stage:
+            for page_num in pages():
+                if lookup(page_num) is None:
+                    page_features(page_num)
+                entry = entries[page_num]
+                cached = entry['headings'].get(context)
+                if cached is None:
+                    page_headings = engine.heading_extractor._extract_page_headings(
+                        layout[page_num], page_num + 1, font_hierarchy, title, doc_type, running_text)
+                    # Page numbers are stored relative to the page so moved pages can be reused
+                    cached = [dict(heading, page=heading['page'] - (page_num + 1)) for heading in page_headings]
+                    entry['headings'] = dict(list(entry['headings'].items())[-(MAX_CONTEXTS_PER_PAGE - 1):])
+                    entry['headings'][context] = cached
+                    dirty.add(page_num)
+                else:
+                    reused += 1
+                headings.extend(dict(heading, page=heading['page'] + page_num + 1) for heading in cached)
+                pages_processed = page_num + 1
+            stage['pages'] = pages_processed - reused
+
+        with StageTimer.measure(timer, 'page_cache_write', pages=len(dirty)):
+            for page_num in dirty:
+                page_cache.put(hashes[page_num], entries[page_num])
+
+        complete = not (budget and budget.exhausted)
+        result = {
+            "title": title,
+            "outline": DocumentAnalysisUtils.validate_hierarchy(headings),
+            "extraction_path": "heuristic",
+            "complete": complete,
+            "pages_reused": reused,
+        }
+        if not complete:
+            result["pages_processed"] = pages_processed
+            result["page_count"] = page_count
+        return result
@@ -1,10 +1,12 @@
 # level_classifier.py (copied)
 import re
 from typing import Dict, Optional
+from ..shared_utils import PatternRegistry
 
 class LevelClassifier:
-    def __init__(self, heading_patterns):
+    def __init__(self, heading_patterns, pattern_registry: PatternRegistry = None):
         self.heading_patterns = heading_patterns
+        self.pattern_registry = pattern_registry or PatternRegistry.default()
 
     def determine_heading_level_generic(self, text: str, font_size: float, is_bold: bool, font_hierarchy: Dict, page_num: int = 1) -> Optional[str]:
         if not self._is_potential_heading(text, page_num):
@@ -28,22 +30,7 @@ class LevelClassifier:
     def _is_potential_heading(self, text: str, page_num: int) -> bool:
         if len(text) > 150 or len(text) < 3:
             return False
-        non_heading_patterns = [
-            r'^[A-Z][a-z]+.*[a-z]+\s+(will|are|is|have|has|can|should|must|would|could)\s+.+\.$',
-            r'^(Please|Click|Visit|Fill|Complete|Submit|Download|Upload|Print|Sign)\s+',
-            r'^(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d+,?\s+\d{4}',
-            r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',
-            r'^(Version|Copyright|©|$c$)\s+',
-            r'.*\d+.*\b(Street|St|Avenue|Ave|Drive|Dr|Road|Rd|Lane|Ln|Boulevard|Blvd)\b.*',
-            r'.*@.*\.(com|org|net|edu|gov).*',
-            r'.*(http|www\.|\.com|\.org).*',
-            r'^\d{5,}.*',
-            r'^(.{3,})\s+\1'
-        ]
-        for pattern in non_heading_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return False
-        return True
+        return not self.pattern_registry.non_heading.matches(text)
 
     def _classify_by_font_hierarchy(self, text: str, font_size: float, is_bold: bool, font_hierarchy: Dict) -> Optional[str]:
         title_threshold = font_hierarchy.get('title', 16.0)
@@ -0,0 +1,101 @@
+# page_prefetcher.py
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import fitz
+from config import Config
+from ..shared_utils import PageLayout, StageTimer
+from .extraction_budget import ExtractionBudget
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=Config.MAX_WORKERS or os.cpu_count())
+    return _process_pool
+
+
+def _parse_pages(pdf_path: str, pages: List[int], text_flags: Optional[int] = None) -> List[Tuple[List[Dict], str]]:
+    # Runs in a worker process with its own fitz handle
+    doc = fitz.open(pdf_path)
+    try:
+        parsed = []
+        for page_num in pages:
+            page = doc[page_num]
+            raw = page.get_text("dict") if text_flags is None else page.get_text("dict", flags=text_flags)
+            parsed.append((PageLayout.compact_blocks(raw["blocks"]), page.get_text()))
+        return parsed
+    finally:
+        doc.close()
+
+
+class PagePrefetcher:
+    """Parses pages in worker processes before the serial stages run.
+
+    Each worker sends back its pages' text blocks (only the fields the engine reads) and
+    page text. They are stored on the DocumentLayout, so font analysis, title, headings,
+    sections and feature saving all reuse them and no page is parsed twice. Pages are
+    pulled from the iterable one chunk at a time as workers free up, so a budget's page
+    generator (ExtractionBudget.pages) stops the hand-out once it is spent; with the
+    budget passed as well, chunks still queued at the deadline are cancelled instead of
+    waited for.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_pages: Optional[int] = None):
+        self.workers = workers or Config.MAX_WORKERS or os.cpu_count() or 1
+        self.chunk_pages = chunk_pages or Config.PARALLEL_CHUNK_PAGES
+
+    def enabled_for(self, layout, page_count: int) -> bool:
+        # A windowed (low-memory) layout would drop prefetched pages again; stored layouts have no PDF path.
+        # With one worker the pool only adds pickling overhead.
+        return bool(Config.ENABLE_PARALLEL and self.workers > 1 and layout.path and layout.window is None
+                    and page_count > Config.PARALLEL_THRESHOLD)
+
+    def prefetch(self, layout, pages: Iterable[int], budget: Optional[ExtractionBudget] = None) -> int:
+        """Parse ``pages`` (skipping image-only and already parsed ones) in the process pool and
+        store them on ``layout``; returns the number of pages parsed. On a pool failure the
+        remaining pages are left to be parsed serially on first access."""
+        chunks = self._chunks(layout, pages)
+        parsed = 0
+        with StageTimer.measure(layout.timer, 'parallel_parse') as stage:
+            try:
+                pool = _get_process_pool()
+                # Two chunks per worker in flight, so no worker waits while results are stored
+                pending = deque((chunk, pool.submit(_parse_pages, layout.path, chunk, layout.text_flags))
+                                for chunk in islice(chunks, 2 * self.workers))
+                while pending:
+                    chunk, future = pending.popleft()
+                    try:
+                        results = future.result(timeout=budget.remaining() if budget else None)
+                    except TimeoutError:
+                        future.cancel()
+                        for _, queued in pending:
+                            queued.cancel()
+                        budget.exhausted = True
+                        break
+                    for page_num, (blocks, text) in zip(chunk, results):
+                        layout.preload(page_num, blocks, text)
+                    parsed += len(chunk)
+                    for chunk in islice(chunks, 1):
+                        pending.append((chunk, pool.submit(_parse_pages, layout.path, chunk, layout.text_flags)))
+            except Exception as e:
+                print(f"Parallel page parsing failed, parsing serially: {e}")
+            stage['pages'] = parsed
+        return parsed
+
+    def _chunks(self, layout, pages: Iterable[int]) -> Iterator[List[int]]:
+        image_only = layout.image_only_pages or frozenset()
+        chunk = []
+        for page_num in pages:
+            if page_num in image_only or layout.is_parsed(page_num):
+                continue
+            chunk.append(page_num)
+            if len(chunk) == self.chunk_pages:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
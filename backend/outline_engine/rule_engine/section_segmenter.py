@@ -0,0 +1,109 @@
+# section_segmenter.py
+import os
+import re
+import tempfile
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+
+class SectionSegmenter:
+    """Locates each outline heading in the document text and derives the span of its body.
+
+    The document text is the concatenation of ``page.get_text()`` for every page.
+    Sections are stored column-wise, parallel to the outline:
+
+    - ``page_offsets``: character offset of each page in the text (plus the total length)
+    - ``heading_start``: offset of the heading itself (-1 when it could not be located)
+    - ``start`` / ``end``: body span, from the end of the heading to the next heading
+    - ``start_page`` / ``end_page``: 1-based pages containing the body span
+    """
+
+    def segment(self, outline: List[Dict], page_texts: List[str]) -> Dict:
+        page_offsets = [0]
+        for text in page_texts:
+            page_offsets.append(page_offsets[-1] + len(text))
+        total = page_offsets[-1]
+        heading_starts, body_starts = [], []
+        cursor = 0
+        for heading in outline:
+            match = self._locate(heading, page_texts, page_offsets, cursor)
+            if match is None:
+                heading_starts.append(-1)
+                body_start = max(cursor, self._page_start(heading, page_offsets))
+            else:
+                heading_starts.append(match[0])
+                body_start = match[1]
+            body_starts.append(body_start)
+            cursor = max(cursor, body_start)
+        # Each body runs to the next located heading; searches start at the cursor,
+        # so that heading never precedes the body
+        ends = [total] * len(body_starts)
+        next_start = total
+        for i in range(len(body_starts) - 1, -1, -1):
+            ends[i] = next_start
+            if heading_starts[i] >= 0:
+                next_start = heading_starts[i]
+        return {
+            'page_offsets': page_offsets,
+            'heading_start': heading_starts,
+            'start': body_starts,
+            'end': ends,
+            'start_page': [self._page_of(start, page_offsets) for start in body_starts],
+            'end_page': [self._page_of(max(start, end - 1), page_offsets) for start, end in zip(body_starts, ends)],
+        }
+
+    def _locate(self, heading: Dict, page_texts: List[str], page_offsets: List[int], cursor: int) -> Optional[tuple]:
+        words = heading.get('text', '').split()
+        if not words or not page_texts:
+            return None
+        # Block text joins lines and spans with single spaces; page text keeps line
+        # breaks and may have no space at all at a span boundary
+        pattern = re.compile(r'\s*'.join(re.escape(word) for word in words), re.IGNORECASE)
+        page_index = min(max(heading.get('page', 1) - 1, 0), len(page_texts) - 1)
+        # Stated page first, then its neighbours (TOC headings are recorded one page early)
+        for index in (page_index, page_index + 1, page_index - 1):
+            if not 0 <= index < len(page_texts):
+                continue
+            page_start = page_offsets[index]
+            local_cursor = max(0, cursor - page_start)
+            if local_cursor > len(page_texts[index]):
+                continue
+            match = pattern.search(page_texts[index], local_cursor)
+            if match:
+                return page_start + match.start(), page_start + match.end()
+        return None
+
+    @staticmethod
+    def _page_start(heading: Dict, page_offsets: List[int]) -> int:
+        page_index = min(max(heading.get('page', 1) - 1, 0), len(page_offsets) - 1)
+        return page_offsets[page_index]
+
+    @staticmethod
+    def _page_of(offset: int, page_offsets: List[int]) -> int:
+        return max(1, min(bisect_right(page_offsets, offset), len(page_offsets) - 1))
+
+    @staticmethod
+    def section_text(sections: Dict, text: str, index: int) -> str:
+        """Body text of the ``index``-th outline heading."""
+        return text[sections['start'][index]:sections['end'][index]]
+
+    @staticmethod
+    def write_text(page_texts: List[str], path: str) -> None:
+        """Write the document text blob atomically."""
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=folder, suffix=".txt.tmp")
+        try:
+            # newline='' keeps '\r' and '\n' as-is so offsets stay valid on read-back
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(''.join(page_texts))
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def read_text(path: str) -> str:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
@@ -1,22 +1,266 @@
 # smart_rule_engine.py (copied & adapted)
 import fitz
-from typing import Dict
+from typing import Dict, Iterator, Optional
 from config import Config
-from ..shared_utils import PatternMatchingUtils, FontHierarchyAnalyzer
+from .. import ENGINE_VERSION
+from ..shared_utils import (
+    PatternMatchingUtils, PatternRegistry, FontHierarchyAnalyzer, DocumentLayout,
+    DocumentAnalysisUtils, LayoutFeatureStore, SpanTable, RunningTextDetector, StageTimer,
+    ScannedPageDetector, OutlineMode, OUTLINE_MODES
+)
 from .title_extractor import TitleExtractor
 from .heading_extractor import HeadingExtractor
+from .bookmark_extractor import BookmarkExtractor
+from .extraction_budget import ExtractionBudget
+from .section_segmenter import SectionSegmenter
+from .incremental_extractor import IncrementalExtractor
+from .page_prefetcher import PagePrefetcher
 
 class SmartRuleEngine:
     def __init__(self):
         self.heading_patterns = PatternMatchingUtils.compile_common_patterns()
+        self.pattern_registry = PatternRegistry.default()
         self.font_analyzer = FontHierarchyAnalyzer()
+        self.running_text_detector = RunningTextDetector(Config.RUNNING_TEXT_MIN_PAGE_RATIO, Config.RUNNING_TEXT_MIN_PAGES)
+        self.scanned_page_detector = ScannedPageDetector(Config.SCANNED_PAGE_THRESHOLD)
         self.title_extractor = TitleExtractor()
-        self.heading_extractor = HeadingExtractor(self.heading_patterns)
+        self.heading_extractor = HeadingExtractor(self.heading_patterns, self.pattern_registry)
+        self.bookmark_extractor = BookmarkExtractor()
+        self.section_segmenter = SectionSegmenter()
+        self.incremental_extractor = IncrementalExtractor(self)
+        self.page_prefetcher = PagePrefetcher()
 
-    def extract(self, pdf_path: str) -> Dict:
+    def extract(self, pdf_path: str, time_budget: Optional[float] = None, max_pages: Optional[int] = None,
+                low_memory: Optional[bool] = None, feature_path: Optional[str] = None, text_path: Optional[str] = None,
+                page_cache=None, timer: Optional[StageTimer] = None, mode: Optional[str] = None) -> Dict:
+        """Extract title and outline.
+
+        With a time or page budget, extraction (scanned-page pre-pass and page hashing
+        included) stops once the budget is spent and the result is marked
+        ``complete: False`` with the number of pages processed.
+        ``low_memory`` (default: documents over Config.LOW_MEMORY_PAGE_THRESHOLD pages)
+        parses text-only page dicts in a bounded window and reports ``peak_memory_mb``,
+        the growth of process RSS from the start of the extraction to its peak.
+        With ``feature_path``, a complete heuristic extraction also persists the parsed
+        layout so ``extract_from_features`` can re-classify without the PDF (outlines
+        taken from bookmarks have nothing to re-classify).
+        With ``text_path``, a complete extraction writes the document text there and
+        adds ``sections`` (body spans of each heading, see SectionSegmenter).
+        With ``page_cache``, only pages not seen before are parsed and classified
+        (see IncrementalExtractor); ``pages_reused`` counts the others.
+        Image-only (scanned) pages are found in a cheap pre-pass and not parsed or
+        classified; their 1-based numbers are listed in ``skipped_pages``.
+        With ``timer``, wall/CPU time and page counts of each stage are recorded on it.
+        With Config.ENABLE_PARALLEL, pages of larger documents are parsed in worker
+        processes before the serial stages run (see PagePrefetcher).
+        ``mode`` ("fast", "balanced", "thorough"; default Config.DEFAULT_OUTLINE_MODE)
+        picks the heuristic stages that run (see OutlineMode) and is reported as
+        ``outline_mode``.
+        """
+        mode = OutlineMode.get(mode)
+        with StageTimer.measure(timer, 'open'):
+            doc = fitz.open(pdf_path)
+        try:
+            layout = self._open_layout(doc, low_memory, timer, mode)
+            with StageTimer.measure(timer, 'read_toc'):
+                toc = self.bookmark_extractor.read_toc(doc)
+                metadata_title = (doc.metadata or {}).get('title')
+            result = self._extract_layout(layout, toc, metadata_title, time_budget, max_pages, page_cache)
+            result["outline_mode"] = mode.name
+            if feature_path and result["complete"] and result["extraction_path"] != "bookmarks":
+                try:
+                    with StageTimer.measure(timer, 'save_features', pages=len(layout)):
+                        LayoutFeatureStore.save(layout, feature_path, toc, metadata_title, ENGINE_VERSION)
+                except Exception as e:
+                    print(f"⚠️ Could not save layout features to {feature_path}: {e}")
+            if text_path and result["complete"]:
+                with StageTimer.measure(timer, 'sections', pages=len(layout)):
+                    self._add_sections(result, layout, text_path)
+        finally:
+            doc.close()
+        if layout.window is not None:
+            layout.rss.sample()
+            result["peak_memory_mb"] = layout.rss.growth_mb
+        return result
+
+    def extract_from_features(self, feature_path: str, pdf_path: Optional[str] = None, text_path: Optional[str] = None) -> Dict:
+        """Re-run classification on a layout saved by ``extract(feature_path=...)`` or
+        ``write_layout_features``.
+
+        Uses the current Config and classifier settings; no PDF parsing is done.
+        """
+        layout = LayoutFeatureStore.load(feature_path, pdf_path)
+        try:
+            result = self._extract_layout(layout, layout.meta['toc'], layout.meta['metadata_title'])
+            if text_path:
+                self._add_sections(result, layout, text_path)
+            return result
+        finally:
+            layout.close()
+
+    def write_layout_features(self, pdf_path: str, feature_path: str, timer: Optional[StageTimer] = None) -> None:
+        """Parse every page and save the layout for ``extract_from_features``, without extracting an outline."""
         doc = fitz.open(pdf_path)
-        font_hierarchy = self.font_analyzer.analyze(doc)
-        title = self.title_extractor.extract_title(doc, font_hierarchy)
-        headings = self.heading_extractor.extract_headings(doc, font_hierarchy, title)
-        doc.close()
-        return {"title": title, "outline": headings}
+        try:
+            layout = self._open_layout(doc, None, timer)
+            self._detect_image_only_pages(layout)
+            if self.page_prefetcher.enabled_for(layout, len(layout)):
+                self.page_prefetcher.prefetch(layout, range(len(layout)))
+            with StageTimer.measure(timer, 'save_features', pages=len(layout)):
+                LayoutFeatureStore.save(layout, feature_path, self.bookmark_extractor.read_toc(doc),
+                                        (doc.metadata or {}).get('title'), ENGINE_VERSION)
+        finally:
+            doc.close()
+
+    def _add_sections(self, result: Dict, layout, text_path: str) -> None:
+        page_texts = [layout[page_num].text for page_num in range(len(layout))]
+        try:
+            SectionSegmenter.write_text(page_texts, text_path)
+        except Exception as e:
+            print(f"⚠️ Could not save document text to {text_path}: {e}")
+            return
+        result["sections"] = self.section_segmenter.segment(result["outline"], page_texts)
+
+    def write_document_text(self, pdf_path: str, text_path: str) -> None:
+        """Write the text blob that ``sections`` offsets refer to, without extracting an outline."""
+        doc = fitz.open(pdf_path)
+        try:
+            SectionSegmenter.write_text([page.get_text() for page in doc], text_path)
+        finally:
+            doc.close()
+
+    def _extract_layout(self, layout, toc, metadata_title: Optional[str], time_budget: Optional[float] = None, max_pages: Optional[int] = None,
+                        page_cache=None) -> Dict:
+        timer = layout.timer
+        with StageTimer.measure(timer, 'bookmarks'):
+            bookmarks = self.bookmark_extractor.extract_outline_from_toc(toc, len(layout)) if Config.USE_BOOKMARKS else None
+        if bookmarks is not None:
+            with StageTimer.measure(timer, 'title'):
+                title = self.bookmark_extractor.normalize_title(metadata_title) or self._extract_title_from_first_pages(layout)
+            return {"title": title, "outline": bookmarks, "extraction_path": "bookmarks", "complete": True}
+        budget = ExtractionBudget(time_budget, max_pages) if time_budget or max_pages else None
+        self._detect_image_only_pages(layout, budget)
+        if page_cache is not None:
+            result = self.incremental_extractor.extract(layout, page_cache, budget)
+        else:
+            if self.page_prefetcher.enabled_for(layout, budget.page_limit(len(layout)) if budget else len(layout)):
+                self.page_prefetcher.prefetch(layout, budget.pages(len(layout)) if budget else range(len(layout)), budget)
+            result = self._extract_budgeted(layout, budget) if budget else self._extract_unbudgeted(layout)
+        if layout.image_only_pages:
+            result["skipped_pages"] = [page_num + 1 for page_num in sorted(layout.image_only_pages)]
+            # Mostly scanned: too few pages with extractable text for a reliable outline
+            if result["complete"] and len(layout) - len(layout.image_only_pages) < Config.MIN_TEXT_EXTRACTION_RATE * len(layout):
+                result["scanned"] = True
+        return result
+
+    def _extract_unbudgeted(self, layout) -> Dict:
+        timer = layout.timer
+        font_pages = layout.mode.font_pages(len(layout))
+        with StageTimer.measure(timer, 'font_analysis', pages=len(layout) if font_pages is None else len(font_pages)):
+            font_hierarchy, running_text = self._analyze_fonts(layout, font_pages)
+        with StageTimer.measure(timer, 'title'):
+            title = self.title_extractor.extract_title(layout, font_hierarchy)
+        with StageTimer.measure(timer, 'headings', pages=len(layout)):
+            headings = self.heading_extractor.extract_headings(layout, font_hierarchy, title, running_text)
+        return {"title": title, "outline": headings, "extraction_path": "heuristic", "complete": True}
+
+    def _detect_image_only_pages(self, layout, budget: Optional[ExtractionBudget] = None) -> None:
+        # Stored layouts already carry the pages found when their features were saved
+        if layout.image_only_pages is not None:
+            return
+        if not Config.SKIP_IMAGE_ONLY_PAGES:
+            layout.image_only_pages = frozenset()
+            return
+        # Only pages the budget lets through are checked, and checking is charged to it
+        image_only = []
+        with StageTimer.measure(layout.timer, 'scanned_pages') as stage:
+            stage['pages'] = 0
+            for page_num in (budget.pages(len(layout)) if budget else range(len(layout))):
+                stage['pages'] += 1
+                if self.scanned_page_detector.is_image_only(layout.doc[page_num]):
+                    image_only.append(page_num)
+        layout.image_only_pages = frozenset(image_only)
+
+    def _open_layout(self, doc, low_memory: Optional[bool], timer: Optional[StageTimer] = None,
+                     mode: OutlineMode = OUTLINE_MODES['thorough']) -> DocumentLayout:
+        if low_memory is None:
+            low_memory = len(doc) > Config.LOW_MEMORY_PAGE_THRESHOLD
+        if low_memory:
+            return DocumentLayout.lean(doc, Config.LOW_MEMORY_WINDOW, timer, mode)
+        return DocumentLayout(doc, timer=timer, mode=mode)
+
+    def _extract_budgeted(self, layout, budget: ExtractionBudget) -> Dict:
+        # Page loops check the budget between pages (the prefetcher may have parsed them already)
+        timer = layout.timer
+        # A sampling mode takes its font sample from the pages the budget allows
+        font_pages = layout.mode.font_pages(budget.page_limit(len(layout)))
+        with StageTimer.measure(timer, 'font_analysis'):
+            font_hierarchy, running_text = self._analyze_fonts(layout, budget.pages(len(layout)) if font_pages is None else font_pages)
+        with StageTimer.measure(timer, 'title'):
+            title = self.title_extractor.extract_title(layout, font_hierarchy)
+        headings = []
+        pages_processed = 0
+        with StageTimer.measure(timer, 'headings') as stage:
+            for page_num, page_headings in self.heading_extractor.iter_page_headings(layout, font_hierarchy, title, pages=budget.pages(len(layout)),
+                                                                                     running_text=running_text):
+                headings.extend(page_headings)
+                pages_processed = page_num
+            stage['pages'] = pages_processed
+        result = {
+            "title": title,
+            "outline": DocumentAnalysisUtils.validate_hierarchy(headings),
+            "extraction_path": "heuristic",
+            "complete": not budget.exhausted,
+        }
+        if budget.exhausted:
+            result["pages_processed"] = pages_processed
+            result["page_count"] = len(layout)
+        return result
+
+    def extract_stream(self, pdf_path: str, mode: Optional[str] = None) -> Iterator[Dict]:
+        """Yield outline events while extraction runs.
+
+        Emits one ``title`` event, one ``heading`` event per heading in page order and
+        a closing ``done`` event carrying the outline after validate_hierarchy, whose
+        levels replace the provisional ones. ``mode`` is applied as in ``extract``. Font
+        statistics come from the mode's page sample, or (thorough) from the first
+        Config.STREAM_FONT_SAMPLE_PAGES pages so the first headings arrive without a full
+        pass over the document; levels may then differ from a full extraction.
+        """
+        mode = OutlineMode.get(mode)
+        doc = fitz.open(pdf_path)
+        try:
+            layout = self._open_layout(doc, None, mode=mode)
+            bookmarks = self.bookmark_extractor.extract_outline(doc) if Config.USE_BOOKMARKS else None
+            if bookmarks is not None:
+                title = self.bookmark_extractor.extract_title(doc) or self._extract_title_from_first_pages(layout)
+                yield {"event": "title", "title": title}
+                for heading in bookmarks:
+                    yield {"event": "heading", **heading}
+                yield {"event": "done", "title": title, "outline": bookmarks, "extraction_path": "bookmarks", "outline_mode": mode.name}
+                return
+            self._detect_image_only_pages(layout)
+            sample_pages = mode.font_pages(len(layout)) or range(min(Config.STREAM_FONT_SAMPLE_PAGES, len(layout)))
+            font_hierarchy, running_text = self._analyze_fonts(layout, sample_pages)
+            title = self.title_extractor.extract_title(layout, font_hierarchy)
+            yield {"event": "title", "title": title}
+            headings = []
+            for page_num, page_headings in self.heading_extractor.iter_page_headings(layout, font_hierarchy, title, running_text=running_text):
+                for heading in page_headings:
+                    yield {"event": "heading", **heading}
+                headings.extend(page_headings)
+            outline = DocumentAnalysisUtils.validate_hierarchy(headings)
+            yield {"event": "done", "title": title, "outline": outline, "extraction_path": "heuristic", "outline_mode": mode.name}
+        finally:
+            doc.close()
+
+    def _analyze_fonts(self, layout, pages=None):
+        # One pass over the pages feeds both the font hierarchy and running header/footer detection
+        table = SpanTable.from_layout(layout, pages)
+        return self.font_analyzer.analyze_span_table(table), self.running_text_detector.detect(table)
+
+    def _extract_title_from_first_pages(self, layout) -> str:
+        # Title extraction only looks at the first pages, so font stats from those are enough
+        first_pages = range(min(3, len(layout)))
+        font_hierarchy = self.font_analyzer.analyze(layout, first_pages)
+        return self.title_extractor.extract_title(layout, font_hierarchy)
@@ -1,17 +1,16 @@
 # title_extractor.py (copied)
 import re
 from typing import Dict
-from ..shared_utils import PDFTextUtils, TableDetectionUtils, GeometricUtils
+from ..shared_utils import PDFTextUtils, TableDetectionUtils
 
 class TitleExtractor:
-    def extract_title(self, doc, font_hierarchy: Dict) -> str:
+    def extract_title(self, layout, font_hierarchy: Dict) -> str:
         title_candidates = []
-        for page_num in range(min(3, len(doc))):
-            page = doc[page_num]
-            blocks = page.get_text("dict")["blocks"]
-            table_areas = TableDetectionUtils.detect_tables(page, blocks)
+        for page_num in range(min(3, len(layout))):
+            page_layout = layout[page_num]
+            blocks = page_layout.blocks
             if page_num == 0:
-                title_parts = self._extract_multi_block_title(blocks, table_areas, font_hierarchy)
+                title_parts = self._extract_multi_block_title(page_layout, font_hierarchy)
                 if title_parts:
                     return title_parts
             for block in blocks:
@@ -19,8 +18,6 @@ class TitleExtractor:
                     text = PDFTextUtils.extract_block_text(block).strip()
                     if not text or len(text) > 300:
                         continue
-                    if GeometricUtils.is_block_in_table(block, table_areas):
-                        continue
                     if TableDetectionUtils.is_table_or_form_content(text):
                         continue
                     font_size = PDFTextUtils.get_block_font_size(block)
@@ -44,43 +41,39 @@ class TitleExtractor:
                     elif len(text) > 100:
                         score -= 1
                     bbox = block['bbox']
-                    page_height = page.rect.height
+                    page_height = page_layout.height
                     if bbox[1] < page_height * 0.4:
                         score += 1
                     if re.match(r'^(RFP|Request|Proposal|Report|Plan|Strategy)', text, re.IGNORECASE):
                         score += 2
-                    if score >= 3:
+                    # Table check last so find_tables only runs for real candidates
+                    if score >= 3 and not page_layout.is_block_in_table(block):
                         title_candidates.append({'text': text,'score': score,'page': page_num,'font_size': font_size})
         if title_candidates:
             title_candidates.sort(key=lambda x: (-x['score'], x['page'], -x['font_size']))
             return title_candidates[0]['text']
-        if len(doc) > 0:
-            page = doc[0]
-            blocks = page.get_text("dict")["blocks"]
-            table_areas = TableDetectionUtils.detect_tables(page, blocks)
-            for block in blocks:
+        if len(layout) > 0:
+            page_layout = layout[0]
+            for block in page_layout.blocks:
                 if block["type"] == 0:
-                    if GeometricUtils.is_block_in_table(block, table_areas):
-                        continue
                     text = PDFTextUtils.extract_block_text(block).strip()
                     if (text and 10 <= len(text) <= 200 and not TableDetectionUtils.is_table_or_form_content(text)):
-                        return text
+                        if not page_layout.is_block_in_table(block):
+                            return text
         return "Untitled Document"
 
-    def _extract_multi_block_title(self, blocks, table_areas, font_hierarchy: Dict) -> str:
+    def _extract_multi_block_title(self, page_layout, font_hierarchy: Dict) -> str:
         title_blocks = []
-        for i, block in enumerate(blocks):
+        for i, block in enumerate(page_layout.blocks):
             if block["type"] == 0:
                 text = PDFTextUtils.extract_block_text(block).strip()
                 if not text or len(text) < 5:
                     continue
-                if GeometricUtils.is_block_in_table(block, table_areas):
-                    continue
                 if TableDetectionUtils.is_table_or_form_content(text):
                     continue
                 font_size = PDFTextUtils.get_block_font_size(block)
                 body_size = font_hierarchy.get('body', 10.0)
-                if font_size >= body_size * 1.5:
+                if font_size >= body_size * 1.5 and not page_layout.is_block_in_table(block):
                     bbox = block['bbox']
                     title_blocks.append({'text': text,'font_size': font_size,'bbox': bbox,'y_pos': bbox[1]})
         if not title_blocks:
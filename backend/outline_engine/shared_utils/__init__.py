@@ -6,6 +6,15 @@ from .toc_detection import TOCDetectionUtils
 from .text_normalization import TextNormalizationUtils
 from .font_hierarchy import FontHierarchyAnalyzer
 from .pattern_matching import PatternMatchingUtils
+from .stage_timer import StageTimer
+from .page_layout import PageLayout, DocumentLayout
+from .span_table import SpanTable
+from .pattern_registry import PatternRegistry, PatternFamily, PatternRule
+from .memory import MemoryUtils, RssSampler
+from .feature_store import LayoutFeatureStore, StoredDocumentLayout
+from .running_text import RunningTextDetector
+from .scanned_pages import ScannedPageDetector
+from .outline_mode import OutlineMode, OUTLINE_MODES
 
 __all__ = [
     'PDFTextUtils',
@@ -15,5 +24,20 @@ __all__ = [
     'TOCDetectionUtils',
     'TextNormalizationUtils',
     'FontHierarchyAnalyzer',
-    'PatternMatchingUtils'
+    'PatternMatchingUtils',
+    'PageLayout',
+    'DocumentLayout',
+    'SpanTable',
+    'PatternRegistry',
+    'PatternFamily',
+    'PatternRule',
+    'MemoryUtils',
+    'RssSampler',
+    'LayoutFeatureStore',
+    'StoredDocumentLayout',
+    'RunningTextDetector',
+    'StageTimer',
+    'ScannedPageDetector',
+    'OutlineMode',
+    'OUTLINE_MODES'
 ]
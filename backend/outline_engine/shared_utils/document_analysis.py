@@ -48,8 +48,8 @@ class DocumentAnalysisUtils:
         return validated
 
     @staticmethod
-    def detect_document_type(doc) -> str:
-        structure_analysis = DocumentAnalysisUtils._analyze_document_structure(doc)
+    def detect_document_type(layout) -> str:
+        structure_analysis = DocumentAnalysisUtils._analyze_document_structure(layout)
         if structure_analysis['is_invitation_like']:
             return 'invitation'
         elif structure_analysis['is_academic_like']:
@@ -62,13 +62,13 @@ class DocumentAnalysisUtils:
             return 'general'
 
     @staticmethod
-    def _analyze_document_structure(doc) -> Dict:
+    def _analyze_document_structure(layout) -> Dict:
         analysis = {
             'is_invitation_like': False,
             'is_academic_like': False,
             'is_form_like': False,
             'is_report_like': False,
-            'page_count': len(doc),
+            'page_count': len(layout),
             'avg_blocks_per_page': 0,
             'has_numbered_sections': False,
             'has_many_short_lines': False,
@@ -80,10 +80,10 @@ class DocumentAnalysisUtils:
         centered_blocks = 0
         numbered_sections = 0
         font_sizes = set()
-        sample_pages = min(3, len(doc))
+        sample_pages = min(3, len(layout))
         for page_num in range(sample_pages):
-            page = doc[page_num]
-            blocks = page.get_text("dict")["blocks"]
+            page_layout = layout[page_num]
+            blocks = page_layout.blocks
             total_blocks += len([b for b in blocks if b["type"] == 0])
             for block in blocks:
                 if block["type"] != 0:
@@ -92,7 +92,7 @@ class DocumentAnalysisUtils:
                 if not text.strip():
                     continue
                 bbox = block['bbox']
-                page_width = page.rect.width
+                page_width = page_layout.width
                 block_center = (bbox[0] + bbox[2]) / 2
                 page_center = page_width / 2
                 if abs(block_center - page_center) < page_width * 0.15:
@@ -0,0 +1,214 @@
+# feature_store.py
+import json
+import os
+import tempfile
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from .page_layout import PageLayout
+from .outline_mode import OUTLINE_MODES
+
+# Bump when the array layout below changes; older files are rejected on load
+FEATURE_VERSION = 1
+
+SPAN_FEATURE_DTYPE = np.dtype([
+    ('size', 'f8'),
+    ('flags', 'i4'),
+    ('font', 'i4'),
+])
+
+BBOX_DTYPE = np.dtype([('x0', 'f8'), ('y0', 'f8'), ('x1', 'f8'), ('y1', 'f8')])
+
+
+class StoredPageLayout(PageLayout):
+    """PageLayout rebuilt from a feature file. The PDF page is only opened if a stage
+    needs layout tables that were not stored (and a page loader is available)."""
+
+    def __init__(self, page_num: int, width: float, height: float, blocks: List[Dict], text: str,
+                 ruling_envelope: Optional[List[float]], layout_table_areas: Optional[List[Dict]],
+                 page_loader: Optional[Callable] = None):
+        self.page_num = page_num
+        self.text_flags = None
+        self.timer = None
+        self.image_only = False
+        self.mode = OUTLINE_MODES['thorough']
+        self.width = width
+        self.height = height
+        self._blocks = blocks
+        self._text = text
+        self._text_table_areas = None
+        self._layout_table_areas = layout_table_areas
+        self._ruling_envelope = ruling_envelope
+        self._page_loader = page_loader
+
+    @property
+    def page(self):
+        return self._page_loader(self.page_num) if self._page_loader else None
+
+
+class StoredDocumentLayout:
+    """DocumentLayout stand-in backed by a loaded feature file."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict, pdf_path: Optional[str] = None):
+        self.path = None  # no worker processes: classification runs in-process
+        self.window = None
+        self.text_flags = None
+        self.timer = None
+        self.mode = OUTLINE_MODES['thorough']
+        self.image_only_pages = frozenset(meta.get('image_only_pages', []))
+        self.meta = meta
+        self.pdf_path = pdf_path
+        self._arrays = arrays
+        self._fonts = [str(font) for font in arrays['fonts']]
+        self._span_text = bytes(arrays['span_text']).decode('utf-8')
+        self._page_text = bytes(arrays['page_text']).decode('utf-8')
+        self._pages: Dict[int, StoredPageLayout] = {}
+        self._doc = None
+
+    def __len__(self) -> int:
+        return len(self._arrays['page_size'])
+
+    def __getitem__(self, page_num: int) -> StoredPageLayout:
+        layout = self._pages.get(page_num)
+        if layout is None:
+            layout = self._build_page(page_num)
+            self._pages[page_num] = layout
+        return layout
+
+    def __iter__(self):
+        for page_num in range(len(self)):
+            yield self[page_num]
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def _load_page(self, page_num: int):
+        if not self.pdf_path or not os.path.exists(self.pdf_path):
+            return None
+        if self._doc is None:
+            import fitz
+            self._doc = fitz.open(self.pdf_path)
+        return self._doc[page_num]
+
+    def _build_page(self, page_num: int) -> StoredPageLayout:
+        a = self._arrays
+        blocks = []
+        for b in range(a['page_blocks'][page_num], a['page_blocks'][page_num + 1]):
+            lines = []
+            for l in range(a['block_lines'][b], a['block_lines'][b + 1]):
+                spans = []
+                for s in range(a['line_spans'][l], a['line_spans'][l + 1]):
+                    span = a['spans'][s]
+                    spans.append({
+                        'size': float(span['size']),
+                        'flags': int(span['flags']),
+                        'font': self._fonts[span['font']],
+                        'text': self._span_text[a['span_text_offsets'][s]:a['span_text_offsets'][s + 1]],
+                    })
+                lines.append({'spans': spans})
+            blocks.append({'type': 0, 'bbox': tuple(float(v) for v in a['block_bbox'][b]), 'lines': lines})
+        text = self._page_text[a['page_text_offsets'][page_num]:a['page_text_offsets'][page_num + 1]]
+        envelope = a['ruling_envelope'][page_num]
+        envelope = None if np.isnan(envelope['x0']) else [float(v) for v in envelope]
+        layout_tables = None
+        if a['tables_detected'][page_num]:
+            rows = a['table_bbox'][a['table_page'] == page_num]
+            layout_tables = [{'bbox': tuple(float(v) for v in row), 'type': 'detected_table', 'confidence': 0.9} for row in rows]
+        width, height = (float(v) for v in a['page_size'][page_num])
+        return StoredPageLayout(page_num, width, height, blocks, text, envelope, layout_tables, self._load_page)
+
+
+class LayoutFeatureStore:
+    """Persists the parsed text layout of a document so outlines can be re-classified
+    without re-parsing the PDF.
+
+    One ``.npz`` holds text blocks (bboxes), their lines and spans (size, flags,
+    interned font), span and page text as UTF-8 blobs with character offsets, page
+    sizes, ruling-line envelopes and the layout tables found during extraction.
+    """
+
+    @staticmethod
+    def save(layout, path: str, toc: Optional[List] = None, metadata_title: Optional[str] = None, engine_version: Optional[str] = None) -> None:
+        font_ids: Dict[str, int] = {}
+        spans, span_texts, block_bbox = [], [], []
+        page_blocks, block_lines, line_spans, span_text_offsets = [0], [0], [0], [0]
+        page_texts, page_text_offsets = [], [0]
+        page_size, envelopes, tables_detected, table_page, table_bbox = [], [], [], [], []
+        for page_num in range(len(layout)):
+            page_layout = layout[page_num]
+            for block in page_layout.blocks:
+                if block["type"] != 0:
+                    continue
+                for line in block.get("lines", []):
+                    for span in line.get("spans", []):
+                        font = span.get("font", "")
+                        font_id = font_ids.get(font)
+                        if font_id is None:
+                            font_id = font_ids[font] = len(font_ids)
+                        text = span.get("text", "")
+                        spans.append((span.get("size", 10), span.get("flags", 0), font_id))
+                        span_texts.append(text)
+                        span_text_offsets.append(span_text_offsets[-1] + len(text))
+                    line_spans.append(len(spans))
+                block_lines.append(len(line_spans) - 1)
+                block_bbox.append(tuple(block['bbox']))
+            page_blocks.append(len(block_bbox))
+            page_texts.append(page_layout.text)
+            page_text_offsets.append(page_text_offsets[-1] + len(page_layout.text))
+            page_size.append((page_layout.width, page_layout.height))
+            envelope = page_layout.ruling_envelope
+            envelopes.append(tuple(envelope) if envelope is not None else (np.nan,) * 4)
+            tables_detected.append(page_layout.layout_tables_detected)
+            if page_layout.layout_tables_detected:
+                for table in page_layout.layout_table_areas:
+                    table_page.append(page_num)
+                    table_bbox.append(tuple(table['bbox']))
+        meta = {
+            'feature_version': FEATURE_VERSION,
+            'engine_version': engine_version,
+            'toc': toc or [],
+            'metadata_title': metadata_title,
+            'image_only_pages': sorted(layout.image_only_pages or []),
+        }
+        arrays = {
+            'meta': np.array(json.dumps(meta)),
+            'fonts': np.array(list(font_ids), dtype=str),
+            'spans': np.array(spans, dtype=SPAN_FEATURE_DTYPE),
+            'span_text': np.frombuffer(''.join(span_texts).encode('utf-8'), dtype=np.uint8),
+            'span_text_offsets': np.array(span_text_offsets, dtype=np.int64),
+            'line_spans': np.array(line_spans, dtype=np.int64),
+            'block_lines': np.array(block_lines, dtype=np.int64),
+            'block_bbox': np.array(block_bbox, dtype=np.float64).reshape(-1, 4),
+            'page_blocks': np.array(page_blocks, dtype=np.int64),
+            'page_text': np.frombuffer(''.join(page_texts).encode('utf-8'), dtype=np.uint8),
+            'page_text_offsets': np.array(page_text_offsets, dtype=np.int64),
+            'page_size': np.array(page_size, dtype=np.float64).reshape(-1, 2),
+            'ruling_envelope': np.array(envelopes, dtype=BBOX_DTYPE),
+            'tables_detected': np.array(tables_detected, dtype=bool),
+            'table_page': np.array(table_page, dtype=np.int32),
+            'table_bbox': np.array(table_bbox, dtype=np.float64).reshape(-1, 4),
+        }
+        # Write to a temp file in the target folder, then rename into place
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=folder, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def load(path: str, pdf_path: Optional[str] = None) -> StoredDocumentLayout:
+        """Load a feature file. ``pdf_path`` is only opened for layout tables that were
+        never detected during the original extraction."""
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+        meta = json.loads(str(arrays.pop('meta')))
+        if meta.get('feature_version') != FEATURE_VERSION:
+            raise ValueError(f"Unsupported feature file version: {meta.get('feature_version')}")
+        return StoredDocumentLayout(arrays, meta, pdf_path)
@@ -1,54 +1,34 @@
 # font_hierarchy.py (copied)
-from collections import defaultdict
-from typing import Dict
-from .pdf_text import PDFTextUtils
+import numpy as np
+from typing import Dict, Iterable, Optional
+from .span_table import SpanTable
 
 class FontHierarchyAnalyzer:
-    def analyze(self, doc) -> Dict:
-        font_stats = defaultdict(lambda: {'count': 0,'total_chars': 0,'pages': set(),'is_bold': False,'sample_texts': []})
-        for page_num, page in enumerate(doc):
-            self._analyze_page_fonts(page, page_num, font_stats)
-        return self._determine_hierarchy(font_stats)
+    def analyze(self, layout, pages: Optional[Iterable[int]] = None) -> Dict:
+        return self.analyze_span_table(SpanTable.from_layout(layout, pages))
 
-    def _analyze_page_fonts(self, page, page_num: int, font_stats: Dict):
-        blocks = page.get_text("dict")["blocks"]
-        for block in blocks:
-            if block["type"] == 0:
-                text = PDFTextUtils.extract_block_text(block)
-                if len(text.strip()) > 3:
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            font_key = (span.get("size", 10), span.get("font", ""))
-                            font_stats[font_key]['count'] += 1
-                            font_stats[font_key]['total_chars'] += len(span.get("text", ""))
-                            font_stats[font_key]['pages'].add(page_num)
-                            if span.get("flags", 0) & 2**4:
-                                font_stats[font_key]['is_bold'] = True
-                            if len(font_stats[font_key]['sample_texts']) < 3:
-                                font_stats[font_key]['sample_texts'].append(text[:50])
+    def analyze_span_table(self, table: SpanTable) -> Dict:
+        return self._determine_hierarchy(table)
 
-    def _determine_hierarchy(self, font_stats: Dict) -> Dict:
-        sorted_fonts = sorted(font_stats.items(), key=lambda x: x[0][0], reverse=True)
-        if not sorted_fonts:
+    def _determine_hierarchy(self, table: SpanTable) -> Dict:
+        if not len(table):
             return {'title': 16.0,'h1': 14.0,'h2': 12.0,'h3': 11.0,'body': 10.0}
-        body_font = max(font_stats.items(), key=lambda x: x[1]['total_chars'])
-        body_size = body_font[0][0]
+        stats = table.font_stats()
+        # Body font: most characters, first-seen font wins ties
+        body_size = float(stats['size'][np.argmax(stats['total_chars'])])
         hierarchy = {'title': None,'h1': None,'h2': None,'h3': None,'body': body_size}
-        significant_fonts = [(font, stats) for font, stats in sorted_fonts if stats['count'] >= 1 and font[0] > body_size * 1.1]
-        if significant_fonts:
-            title_candidates = [f for f in significant_fonts if (0 in f[1]['pages'] or 1 in f[1]['pages']) and f[0][0] >= body_size * 1.5]
-            if title_candidates:
-                hierarchy['title'] = title_candidates[0][0][0]
-            remaining = [f for f in significant_fonts if f[0][0] != hierarchy['title']]
-            h1_candidates = [f for f in remaining if f[0][0] >= max(15.0, body_size * 1.4)]
-            if h1_candidates:
-                hierarchy['h1'] = h1_candidates[0][0][0]
-            h2_candidates = [f for f in remaining if f[0][0] != hierarchy['h1'] and f[0][0] >= max(12.0, body_size * 1.2)]
-            if h2_candidates:
-                hierarchy['h2'] = h2_candidates[0][0][0]
-            h3_candidates = [f for f in remaining if (f[0][0] != hierarchy['h1'] and f[0][0] != hierarchy['h2'] and f[0][0] >= max(11.0, body_size * 1.1))]
-            if h3_candidates:
-                hierarchy['h3'] = h3_candidates[0][0][0]
+        sizes = np.unique(stats['size'])
+        significant = sizes[sizes > body_size * 1.1]
+        if significant.size:
+            early_sizes = np.unique(table.spans['size'][table.spans['page'] <= 1])
+            title_candidates = significant[np.isin(significant, early_sizes) & (significant >= body_size * 1.5)]
+            hierarchy['title'] = self._largest(title_candidates)
+            remaining = significant[significant != hierarchy['title']] if hierarchy['title'] is not None else significant
+            hierarchy['h1'] = self._largest(remaining[remaining >= max(15.0, body_size * 1.4)])
+            remaining = self._exclude(remaining, hierarchy['h1'])
+            hierarchy['h2'] = self._largest(remaining[remaining >= max(12.0, body_size * 1.2)])
+            remaining = self._exclude(remaining, hierarchy['h2'])
+            hierarchy['h3'] = self._largest(remaining[remaining >= max(11.0, body_size * 1.1)])
         if hierarchy['title'] is None:
             hierarchy['title'] = body_size * 1.5
         if hierarchy['h1'] is None:
@@ -58,3 +38,11 @@ class FontHierarchyAnalyzer:
         if hierarchy['h3'] is None:
             hierarchy['h3'] = body_size * 1.1
         return hierarchy
+
+    @staticmethod
+    def _largest(sizes: np.ndarray) -> Optional[float]:
+        return float(sizes.max()) if sizes.size else None
+
+    @staticmethod
+    def _exclude(sizes: np.ndarray, size: Optional[float]) -> np.ndarray:
+        return sizes if size is None else sizes[sizes != size]
@@ -0,0 +1,53 @@
+# memory.py
+import os
+import sys
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class MemoryUtils:
+    @staticmethod
+    def peak_rss_mb() -> Optional[float]:
+        """Peak resident set size of this process in MB, or None where unsupported."""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes elsewhere
+        divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        return round(peak / divisor, 1)
+
+    @staticmethod
+    def current_rss_mb() -> Optional[float]:
+        """Current resident set size of this process in MB (Linux /proc), or None where unsupported."""
+        try:
+            with open('/proc/self/statm', 'rb') as f:
+                resident_pages = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            return None
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+class RssSampler:
+    """Highest RSS seen across samples, relative to the RSS when the sampler was created.
+
+    Sampling reads /proc/self/statm, so it is cheap enough to do once per parsed page.
+    RSS is process-wide: other work running in the process at the same time is included.
+    """
+
+    def __init__(self):
+        self.start = MemoryUtils.current_rss_mb()
+        self.peak = self.start
+
+    def sample(self) -> None:
+        rss = MemoryUtils.current_rss_mb()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+
+    @property
+    def growth_mb(self) -> Optional[float]:
+        """Peak minus starting RSS in MB, or None where RSS can't be read"""
+        return None if self.start is None else round(self.peak - self.start, 1)
@@ -0,0 +1,45 @@
+# outline_mode.py
+from typing import List, NamedTuple, Optional
+
+
+class OutlineMode(NamedTuple):
+    """Which heuristic stages an extraction runs; bookmarks are used in every mode.
+
+    ``layout_tables``: page.find_tables() for heading candidates over ruling lines
+    (text-based table heuristics always run).
+    ``toc_detection``: table-of-contents pages are recognised and reduced to their heading.
+    ``font_sample_pages``: font statistics come from at most this many pages spread over
+    the document (None: every page).
+    """
+    name: str
+    layout_tables: bool = True
+    toc_detection: bool = True
+    font_sample_pages: Optional[int] = None
+
+    @classmethod
+    def get(cls, name: Optional[str] = None) -> 'OutlineMode':
+        """Mode by name; None gives Config.DEFAULT_OUTLINE_MODE. Raises ValueError for unknown names."""
+        if isinstance(name, OutlineMode):
+            return name
+        if name is None:
+            from config import Config
+            name = Config.DEFAULT_OUTLINE_MODE
+        mode = OUTLINE_MODES.get(name)
+        if mode is None:
+            raise ValueError(f"Unknown outline mode {name!r} (expected one of {', '.join(OUTLINE_MODES)})")
+        return mode
+
+    def font_pages(self, page_count: int) -> Optional[List[int]]:
+        """Pages for font statistics: None for all, else the first two (title sizes) plus an even spread"""
+        if self.font_sample_pages is None or page_count <= self.font_sample_pages:
+            return None
+        step = page_count / self.font_sample_pages
+        return sorted({0, 1} | {int(i * step) for i in range(self.font_sample_pages)})
+
+
+OUTLINE_MODES = {
+    # Bookmarks, else font-size ranking over sampled pages; for bulk/archival imports
+    'fast': OutlineMode('fast', layout_tables=False, toc_detection=False, font_sample_pages=20),
+    'balanced': OutlineMode('balanced', layout_tables=False, font_sample_pages=60),
+    'thorough': OutlineMode('thorough'),
+}
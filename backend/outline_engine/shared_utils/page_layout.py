@@ -0,0 +1,175 @@
+# page_layout.py
+from collections import OrderedDict
+from typing import FrozenSet, List, Dict, Optional
+import fitz
+from .table_detection import TableDetectionUtils
+from .geometric import GeometricUtils
+from .stage_timer import StageTimer
+from .outline_mode import OutlineMode, OUTLINE_MODES
+from .memory import RssSampler
+
+
+_UNSET = object()
+
+# get_text("dict") flags without image blocks; every stage skips them anyway
+LEAN_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+class PageLayout:
+    """Parsed view of a single page, built on first access and reused by every stage.
+
+    An ``image_only`` (scanned) page is never parsed: it has no blocks, text or tables.
+    ``mode`` decides which stages run on the page (see OutlineMode).
+    """
+
+    def __init__(self, page, page_num: int, text_flags: Optional[int] = None, timer: Optional[StageTimer] = None,
+                 image_only: bool = False, mode: OutlineMode = OUTLINE_MODES['thorough']):
+        self.page = page
+        self.page_num = page_num
+        self.text_flags = text_flags
+        self.timer = timer
+        self.image_only = image_only
+        self.mode = mode
+        self.width = page.rect.width
+        self.height = page.rect.height
+        self._blocks: Optional[List[Dict]] = None
+        self._text: Optional[str] = None
+        self._text_table_areas: Optional[List[Dict]] = None
+        self._layout_table_areas: Optional[List[Dict]] = None
+        self._ruling_envelope = _UNSET
+
+    @property
+    def blocks(self) -> List[Dict]:
+        if self._blocks is None and self.image_only:
+            self._blocks = []
+        if self._blocks is None:
+            with StageTimer.measure(self.timer, 'parse', pages=1):
+                if self.text_flags is None:
+                    self._blocks = self.page.get_text("dict")["blocks"]
+                else:
+                    self._blocks = self.page.get_text("dict", flags=self.text_flags)["blocks"]
+        return self._blocks
+
+    @staticmethod
+    def compact_blocks(blocks: List[Dict]) -> List[Dict]:
+        """Text blocks with only the fields the engine reads (block bbox; span size, flags, font, text)"""
+        return [
+            {'type': 0, 'bbox': block['bbox'], 'lines': [
+                {'spans': [{'size': span.get('size', 10), 'flags': span.get('flags', 0), 'font': span.get('font', ''),
+                            'text': span.get('text', '')} for span in line.get('spans', [])]}
+                for line in block.get('lines', [])]}
+            for block in blocks if block['type'] == 0
+        ]
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = '' if self.image_only else self.page.get_text()
+        return self._text
+
+    @property
+    def text_table_areas(self) -> List[Dict]:
+        # Text heuristics only (no page.find_tables)
+        if self._text_table_areas is None:
+            self._text_table_areas = TableDetectionUtils.detect_text_tables(self.blocks)
+        return self._text_table_areas
+
+    @property
+    def layout_table_areas(self) -> List[Dict]:
+        # PyMuPDF layout tables, detected at most once per page
+        if self._layout_table_areas is None and self.image_only:
+            self._layout_table_areas = []
+        if self._layout_table_areas is None:
+            with StageTimer.measure(self.timer, 'find_tables', pages=1):
+                self._layout_table_areas = TableDetectionUtils.detect_layout_tables(self.page)
+        return self._layout_table_areas
+
+    @property
+    def ruling_envelope(self) -> Optional[List[float]]:
+        if self._ruling_envelope is _UNSET:
+            self._ruling_envelope = None if self.image_only else TableDetectionUtils.ruling_envelope(self.page)
+        return self._ruling_envelope
+
+    @property
+    def layout_tables_detected(self) -> bool:
+        return self._layout_table_areas is not None
+
+    @property
+    def table_areas(self) -> List[Dict]:
+        return self.text_table_areas + self.layout_table_areas
+
+    def is_block_in_table(self, block: Dict) -> bool:
+        # Cheap text tables first; layout tables are only detected for blocks that
+        # overlap the page's ruling lines
+        if GeometricUtils.is_block_in_table(block, self.text_table_areas):
+            return True
+        if not self.mode.layout_tables:
+            return False
+        envelope = self.ruling_envelope
+        if envelope is None or not GeometricUtils.bboxes_overlap(block['bbox'], envelope):
+            return False
+        return GeometricUtils.is_block_in_table(block, self.layout_table_areas)
+
+
+class DocumentLayout:
+    """Per-document cache of PageLayout objects so each page is parsed once per extraction.
+
+    With ``window`` set, only the most recently used ``window`` pages are kept; older
+    pages (and their block dicts) are released and re-parsed if visited again. Each pass
+    over the document (font analysis, headings, saved features) then parses every page
+    once more, trading CPU for bounded memory. ``rss`` samples the process RSS as pages
+    are loaded, giving the extraction's peak memory growth.
+    With ``timer`` set, page parsing and table detection are recorded as stages.
+    ``image_only_pages`` (0-based, see ScannedPageDetector) are left unparsed; None
+    until detection has run.
+    ``mode`` (an OutlineMode) is the speed/fidelity trade-off of this extraction.
+    """
+
+    def __init__(self, doc, window: Optional[int] = None, text_flags: Optional[int] = None, timer: Optional[StageTimer] = None,
+                 image_only_pages: Optional[FrozenSet[int]] = None, mode: OutlineMode = OUTLINE_MODES['thorough']):
+        self.doc = doc
+        self.path = doc.name or None
+        self.window = window
+        self.text_flags = text_flags
+        self.timer = timer
+        self.image_only_pages = image_only_pages
+        self.mode = mode
+        self._pages: Dict[int, PageLayout] = OrderedDict()
+        self.rss = RssSampler() if window is not None else None
+
+    @classmethod
+    def lean(cls, doc, window: int, timer: Optional[StageTimer] = None, mode: OutlineMode = OUTLINE_MODES['thorough']) -> 'DocumentLayout':
+        """Bounded-memory layout: text-only page dicts, at most ``window`` pages alive."""
+        return cls(doc, window=window, text_flags=LEAN_TEXT_FLAGS, timer=timer, mode=mode)
+
+    def __len__(self) -> int:
+        return len(self.doc)
+
+    def __getitem__(self, page_num: int) -> PageLayout:
+        layout = self._pages.get(page_num)
+        if layout is None:
+            layout = PageLayout(self.doc[page_num], page_num, self.text_flags, self.timer,
+                                image_only=bool(self.image_only_pages) and page_num in self.image_only_pages, mode=self.mode)
+            self._pages[page_num] = layout
+            if self.window is not None:
+                # Earlier pages in the window are parsed by now, so this is near the peak
+                self.rss.sample()
+                if len(self._pages) > self.window:
+                    self._pages.popitem(last=False)
+        elif self.window is not None:
+            self._pages.move_to_end(page_num)
+        return layout
+
+    def __iter__(self):
+        for page_num in range(len(self)):
+            yield self[page_num]
+
+    def is_parsed(self, page_num: int) -> bool:
+        page_layout = self._pages.get(page_num)
+        return page_layout is not None and page_layout._blocks is not None
+
+    def preload(self, page_num: int, blocks: List[Dict], text: str) -> None:
+        """Store a page parsed elsewhere (see PagePrefetcher); stages then skip parsing it"""
+        page_layout = self[page_num]
+        page_layout._blocks = blocks
+        page_layout._text = text
@@ -0,0 +1,126 @@
+# pattern_registry.py
+import re
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+RAW, STRIPPED = 'raw', 'stripped'
+
+
+class PatternRule(NamedTuple):
+    name: str
+    pattern: str
+    flags: int = 0
+    target: str = RAW       # RAW: scan text as given, STRIPPED: scan text.strip()
+    anchored: bool = False  # True for re.match semantics, False for re.search
+
+
+class PatternFamily:
+    """A family of detection rules compiled into one named-group alternation per input variant.
+
+    ``first_match`` returns the name of the rule that fired (or None). Rules
+    anchored at the start of the text are combined into a single ``match``
+    call so the engine tries them at position 0 only; the rest share one
+    ``search``. ``search_hint`` is an optional character class that the first
+    character of every unanchored rule satisfies; it lets ``search`` skip
+    positions without trying each alternative.
+    """
+
+    def __init__(self, name: str, rules: List[PatternRule], checks: List[Tuple[str, Callable[[str], bool]]] = None, search_hint: str = None):
+        self.name = name
+        self.rules = rules
+        self.checks = checks or []
+        self._scanners: List[Tuple[str, Callable]] = []
+        for target in (STRIPPED, RAW):
+            for anchored in (True, False):
+                parts = [self._rule_source(rule) for rule in rules
+                         if rule.target == target and self._is_anchored(rule) == anchored]
+                if not parts:
+                    continue
+                source = '|'.join(parts)
+                if search_hint and not anchored:
+                    source = f'(?={search_hint})(?:{source})'
+                scanner = re.compile(source)
+                self._scanners.append((target, scanner.match if anchored else scanner.search))
+
+    @staticmethod
+    def _is_anchored(rule: PatternRule) -> bool:
+        # Without re.MULTILINE a leading '^' behaves like re.match
+        return rule.anchored or rule.pattern.startswith('^')
+
+    @staticmethod
+    def _rule_source(rule: PatternRule) -> str:
+        source = f'(?i:{rule.pattern})' if rule.flags & re.IGNORECASE else rule.pattern
+        return f'(?P<{rule.name}>{source})'
+
+    def first_match(self, text: str) -> Optional[str]:
+        stripped = text.strip()
+        for target, scan in self._scanners:
+            match = scan(stripped if target == STRIPPED else text)
+            if match:
+                return match.lastgroup
+        for name, check in self.checks:
+            if check(stripped):
+                return name
+        return None
+
+    def matches(self, text: str) -> bool:
+        return self.first_match(text) is not None
+
+
+class PatternRegistry:
+    """Detection pattern families shared by the table, TOC and heading stages."""
+
+    _default: Optional['PatternRegistry'] = None
+
+    def __init__(self):
+        self.table_structure = PatternFamily('table_structure', [
+            PatternRule('sno_header', r'S\.?No\.?\s+(?:Name|Description|Item)', re.I),
+            PatternRule('item_quantity_columns', r'(?:Name|Item|Description)\s+(?:Age|Quantity|Amount)', re.I),
+            PatternRule('numbered_cells', r'\d+\.\s+\d+\.\s+\d+\.', re.I),
+            PatternRule('person_columns', r'(?:Name|Age|Relationship)\s+(?:Name|Age|Relationship)', re.I),
+            PatternRule('family_header', r'S\.?No\.?\s+Name\s+Age\s+Relationship', re.I),
+            PatternRule('numbered_row', r'^\d+\.\s*\d+\.\s*\d+\.\s*\d+', target=STRIPPED, anchored=True),
+        ], search_hint=r'(?i:[snidar\d])')
+        self.table_or_form = PatternFamily('table_or_form', [
+            PatternRule('bare_number', r'^\d+\.?\s*$', target=STRIPPED, anchored=True),
+            PatternRule('form_field', r'^\d+\.\s*(?:Name|Designation|PAY|Whether|Home Town|Amount)', re.I),
+            PatternRule('sno_field', r'^S\.?No\.?\s+(?:Name|Age|Relationship)', re.I),
+            PatternRule('two_numbers', r'^\d+\.\s+\d+\.\s*$', re.I),
+            PatternRule('three_numbers', r'^\d+\.\s+\d+\.\s+\d+\.\s*$', re.I),
+            PatternRule('number_sequence', r'^\d+\.\s+\d+\.\s+\d+\.\s+\d+', re.I),
+            PatternRule('date_signature', r'^(?:Date|Signature)', re.I),
+            PatternRule('currency_label', r'^Rs\.\s*$', re.I),
+            PatternRule('spaced_digits', r'^\d+\s+\d+\s+\d+\s*$', re.I),
+            PatternRule('packed_digits', r'^\d+\s*\d+\s*\d+\s*$', re.I),
+            PatternRule('lettered_item', r'^\d+\.\s*[A-Z]\.?(\s*)?$', target=STRIPPED, anchored=True),
+            PatternRule('dotted_numerals', r'^(?=[\s\S]*\.)[\d\.\s]{2,10}$', target=STRIPPED, anchored=True),
+        ], checks=[
+            ('short_digits', lambda stripped: len(stripped) <= 2 and stripped.isdigit()),
+        ])
+        self.toc_entry = PatternFamily('toc_entry', [
+            PatternRule('numbered_entry', r'^(?:\d+\.|\d+\.\d+\.?|Chapter\s+\d+:?)\s+.+\s+\d+\s*$', target=STRIPPED),
+            PatternRule('dotted_row', r'\d+\.\d+\s+[^0-9]+\s+\d+\s+\d+\.\d+'),
+            PatternRule('page_suffix', r'^(?=[\s\S]{11}).+\s+\d{1,3}\s*$', target=STRIPPED),
+        ], search_hint=r'\d')
+        self.non_heading = PatternFamily('non_heading', [
+            # Rewritten with lazy / first-occurrence scans; each matches exactly the same texts as the
+            # original greedy '.*' form but without the quadratic backtracking
+            PatternRule('sentence', r'[a-z]{2}[^\n]*?[a-z]\s+(?:will|are|is|have|has|can|should|must|would|could)\s+.+\.$', re.I, anchored=True),
+            PatternRule('instruction', r'^(?:Please|Click|Visit|Fill|Complete|Submit|Download|Upload|Print|Sign)\s+', re.I, anchored=True),
+            PatternRule('long_date', r'^(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d+,?\s+\d{4}', re.I, anchored=True),
+            PatternRule('short_date', r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', re.I, anchored=True),
+            PatternRule('legal_notice', r'^(?:Version|Copyright|©|$c$)\s+', re.I, anchored=True),
+            PatternRule('street_address', r'[^\d\n]*\d[^\n]*?\b(?:Street|St|Avenue|Ave|Drive|Dr|Road|Rd|Lane|Ln|Boulevard|Blvd)\b', re.I, anchored=True),
+            PatternRule('email', r'[^@\n]*@[^\n]*?\.(?:com|org|net|edu|gov)', re.I, anchored=True),
+            PatternRule('url', r'[^\n]*?(?:http|www\.|\.com|\.org)', re.I, anchored=True),
+            PatternRule('long_number', r'^\d{5,}.*', re.I, anchored=True),
+            PatternRule('repeated_phrase', r'^(?P<repeated_text>.{3,})\s+(?P=repeated_text)', re.I, anchored=True),
+        ])
+
+    @classmethod
+    def default(cls) -> 'PatternRegistry':
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def families(self) -> List[PatternFamily]:
+        return [self.table_structure, self.table_or_form, self.toc_entry, self.non_heading]
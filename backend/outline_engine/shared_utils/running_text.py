@@ -0,0 +1,48 @@
+# running_text.py
+import re
+import zlib
+import numpy as np
+from typing import Dict, FrozenSet
+from .pdf_text import PDFTextUtils
+
+# Page numbers and folios vary from page to page; drop them before hashing.
+# Roman folios must be well-formed numerals, so words such as "civil" or "mild" are kept.
+_FOLIO_TOKEN = re.compile(r'^(?:\d+|(?=[ivxlcdm])m{0,3}(?:cm|cd|d?c{0,3})(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3}))$')
+
+# Vertical position buckets per page height
+Y_BANDS = 100
+
+
+class RunningTextDetector:
+    """Finds running headers and footers: blocks whose normalized text repeats at the
+    same vertical position on a large share of the document's pages.
+
+    Block keys are collected by SpanTable during the font statistics pass; repeats
+    are counted here with one np.unique over (page, key) pairs.
+    """
+
+    def __init__(self, min_page_ratio: float = 0.5, min_pages: int = 3):
+        self.min_page_ratio = min_page_ratio
+        self.min_pages = min_pages
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return ' '.join(token for token in text.lower().split() if not _FOLIO_TOKEN.match(token))
+
+    @staticmethod
+    def block_key(block: Dict, page_height: float, text: str = None) -> int:
+        """Stable (process-independent) key of normalized text and vertical band."""
+        if text is None:
+            text = PDFTextUtils.extract_block_text(block).strip()
+        text_hash = zlib.crc32(RunningTextDetector.normalize(text).encode('utf-8'))
+        band = int(round(block['bbox'][1] / page_height * Y_BANDS)) if page_height else 0
+        return (text_hash << 8) | (band & 0xFF)
+
+    def detect(self, table) -> FrozenSet[int]:
+        keys = table.block_keys
+        if table.page_count < self.min_pages or not len(keys):
+            return frozenset()
+        page_key = np.unique(keys)  # one row per (page, key)
+        unique_keys, counts = np.unique(page_key['key'], return_counts=True)
+        threshold = max(self.min_pages, self.min_page_ratio * table.page_count)
+        return frozenset(int(key) for key in unique_keys[counts >= threshold])
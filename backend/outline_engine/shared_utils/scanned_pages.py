@@ -0,0 +1,51 @@
+# scanned_pages.py
+from typing import Iterable, List, Optional, Tuple
+import fitz
+
+# Block tuples with image blocks (type 1) carry bboxes only, no image data
+_COVERAGE_FLAGS = fitz.TEXT_PRESERVE_IMAGES
+
+# Pages with at least this much text (e.g. a sparse OCR layer) are always parsed
+MIN_TEXT_CHARS = 100
+
+
+class ScannedPageDetector:
+    """Pre-pass that finds image-only (scanned) pages before any page dict is parsed.
+
+    Pages without image resources are never inspected further. For the others, one
+    ``get_text("blocks")`` call gives text and image block bboxes; a page is image-only
+    when its text covers less than ``text_ratio`` of the area its images cover and
+    amounts to fewer than MIN_TEXT_CHARS characters (a scanned page with a stamped
+    Bates number or page label still qualifies, a page with an OCR text layer does not).
+    """
+
+    def __init__(self, text_ratio: float = 0.3):
+        self.text_ratio = text_ratio
+
+    @staticmethod
+    def coverage(page) -> Tuple[float, float, int]:
+        """(text coverage, image coverage, text characters); coverages are fractions
+        of the page area, capped at 1"""
+        page_area = page.rect.get_area() or 1.0
+        text_area = image_area = 0.0
+        chars = 0
+        for block in page.get_text("blocks", flags=_COVERAGE_FLAGS):
+            area = (fitz.Rect(block[:4]) & page.rect).get_area()
+            if block[6] == 1:
+                image_area += area
+            else:
+                text = block[4].strip()
+                if text:
+                    text_area += area
+                    chars += len(text)
+        return min(text_area / page_area, 1.0), min(image_area / page_area, 1.0), chars
+
+    def is_image_only(self, page) -> bool:
+        if not page.get_images():
+            return False
+        text_coverage, image_coverage, chars = self.coverage(page)
+        return image_coverage > 0 and chars < MIN_TEXT_CHARS and text_coverage < self.text_ratio * image_coverage
+
+    def image_only_pages(self, doc, pages: Optional[Iterable[int]] = None) -> List[int]:
+        """0-based numbers of the image-only pages"""
+        return [page_num for page_num in (range(len(doc)) if pages is None else pages) if self.is_image_only(doc[page_num])]
@@ -0,0 +1,122 @@
+# span_table.py
+import numpy as np
+from numpy.lib.recfunctions import repack_fields
+from typing import Dict, Iterable, List, Optional, Tuple
+from .pdf_text import PDFTextUtils
+from .running_text import RunningTextDetector
+
+SPAN_DTYPE = np.dtype([
+    ('size', 'f8'),
+    ('flags', 'i4'),
+    ('font', 'i4'),
+    ('page', 'i4'),
+    ('chars', 'i4'),
+])
+
+BLOCK_KEY_DTYPE = np.dtype([
+    ('page', 'i4'),
+    ('key', 'i8'),
+])
+
+BOLD_FLAG = 2**4
+
+
+class SpanTable:
+    """Columnar table of text spans (one row per span) with interned font names.
+
+    ``block_keys`` holds one running-text key per text block (see RunningTextDetector)
+    and ``page_count`` the number of pages scanned.
+    """
+
+    def __init__(self, spans: np.ndarray, fonts: List[str], block_keys: Optional[np.ndarray] = None, page_count: int = 0):
+        self.spans = spans
+        self.fonts = fonts
+        self.block_keys = block_keys if block_keys is not None else np.zeros(0, dtype=BLOCK_KEY_DTYPE)
+        self.page_count = page_count
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    @classmethod
+    def from_layout(cls, layout, pages: Optional[Iterable[int]] = None) -> 'SpanTable':
+        font_ids: Dict[str, int] = {}
+        rows, block_rows = [], []
+        page_count = 0
+        for page_num in (range(len(layout)) if pages is None else pages):
+            page_layout = layout[page_num]
+            cls._collect_page_spans(page_layout.blocks, page_num, page_layout.height, font_ids, rows, block_rows)
+            page_count += 1
+        return cls(np.array(rows, dtype=SPAN_DTYPE), list(font_ids), np.array(block_rows, dtype=BLOCK_KEY_DTYPE), page_count)
+
+    @staticmethod
+    def page_features(page_layout) -> Dict:
+        """One page's span rows and block keys in a document-independent form
+        (font names instead of ids, no page number), e.g. for caching."""
+        font_ids: Dict[str, int] = {}
+        rows, block_rows = [], []
+        SpanTable._collect_page_spans(page_layout.blocks, 0, page_layout.height, font_ids, rows, block_rows)
+        return {
+            'fonts': list(font_ids),
+            'spans': [[size, flags, font, chars] for size, flags, font, _, chars in rows],
+            'block_keys': [key for _, key in block_rows],
+        }
+
+    @classmethod
+    def from_page_features(cls, pages: Iterable[Tuple[int, Dict]]) -> 'SpanTable':
+        """Build the table from ``(page_num, page_features)`` pairs in page order;
+        equivalent to from_layout over the same pages."""
+        font_ids: Dict[str, int] = {}
+        rows, block_rows = [], []
+        page_count = 0
+        for page_num, features in pages:
+            local_ids = []
+            for font in features['fonts']:
+                font_id = font_ids.get(font)
+                if font_id is None:
+                    font_id = font_ids[font] = len(font_ids)
+                local_ids.append(font_id)
+            rows.extend((size, flags, local_ids[font], page_num, chars) for size, flags, font, chars in features['spans'])
+            block_rows.extend((page_num, key) for key in features['block_keys'])
+            page_count += 1
+        return cls(np.array(rows, dtype=SPAN_DTYPE), list(font_ids), np.array(block_rows, dtype=BLOCK_KEY_DTYPE), page_count)
+
+    @staticmethod
+    def _collect_page_spans(blocks: List[Dict], page_num: int, page_height: float, font_ids: Dict[str, int], rows: List[tuple], block_rows: List[tuple]):
+        # Only spans of blocks with meaningful text contribute to font statistics
+        for block in blocks:
+            if block["type"] != 0:
+                continue
+            text = PDFTextUtils.extract_block_text(block).strip()
+            if len(text) <= 3:
+                continue
+            block_rows.append((page_num, RunningTextDetector.block_key(block, page_height, text)))
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    font = span.get("font", "")
+                    font_id = font_ids.get(font)
+                    if font_id is None:
+                        font_id = font_ids[font] = len(font_ids)
+                    rows.append((span.get("size", 10), span.get("flags", 0), font_id, page_num, len(span.get("text", ""))))
+
+    def bold_mask(self) -> np.ndarray:
+        return (self.spans['flags'] & BOLD_FLAG) != 0
+
+    def font_stats(self) -> np.ndarray:
+        """Per-(size, font) statistics, ordered by first appearance in the document."""
+        stats_dtype = np.dtype([
+            ('size', 'f8'), ('font', 'i4'), ('count', 'i8'),
+            ('total_chars', 'i8'), ('is_bold', '?'),
+        ])
+        if not len(self.spans):
+            return np.zeros(0, dtype=stats_dtype)
+        keys = repack_fields(self.spans[['size', 'font']])
+        unique_keys, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        n_keys = len(unique_keys)
+        stats = np.zeros(n_keys, dtype=stats_dtype)
+        stats['size'] = unique_keys['size']
+        stats['font'] = unique_keys['font']
+        stats['count'] = np.bincount(inverse, minlength=n_keys)
+        stats['total_chars'] = np.bincount(inverse, weights=self.spans['chars'], minlength=n_keys)
+        stats['is_bold'] = np.bincount(inverse, weights=self.bold_mask(), minlength=n_keys) > 0
+        return stats[np.argsort(first_index, kind='stable')]
@@ -0,0 +1,61 @@
+# stage_timer.py
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+
+class StageTimer:
+    """Accumulates wall time, CPU time, calls and pages per named extraction stage.
+
+    CPU time is that of the calling thread, so concurrent requests don't inflate it;
+    work done in worker processes (``parallel_parse``) only shows as wall time.
+    Stages may nest: ``parse``, ``find_tables`` and ``toc_detection`` are counted
+    inside whichever top-level stage triggered them.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict] = {}
+        self._started = time.perf_counter()
+        self._started_cpu = time.thread_time()
+
+    @contextmanager
+    def stage(self, name: str, pages: Optional[int] = None):
+        # The yielded dict's 'pages' may be set inside the block when only known at the end
+        record = {'pages': pages}
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            self.add(name, time.perf_counter() - wall, time.thread_time() - cpu, record['pages'])
+
+    def add(self, name: str, wall: float, cpu: float, pages: Optional[int] = None) -> None:
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {'wall': 0.0, 'cpu': 0.0, 'calls': 0, 'pages': 0}
+        entry['wall'] += wall
+        entry['cpu'] += cpu
+        entry['calls'] += 1
+        entry['pages'] += pages or 0
+
+    def as_dict(self) -> Dict:
+        """JSON-ready breakdown, times in milliseconds."""
+        return {
+            'total': {
+                'wall_ms': round((time.perf_counter() - self._started) * 1000, 2),
+                'cpu_ms': round((time.thread_time() - self._started_cpu) * 1000, 2),
+            },
+            'stages': {
+                name: {
+                    'wall_ms': round(entry['wall'] * 1000, 2),
+                    'cpu_ms': round(entry['cpu'] * 1000, 2),
+                    'calls': entry['calls'],
+                    'pages': entry['pages'],
+                }
+                for name, entry in self.stages.items()
+            },
+        }
+
+    @staticmethod
+    def measure(timer: Optional['StageTimer'], name: str, pages: Optional[int] = None):
+        """``timer.stage(...)``, or a no-op context when timing is off."""
+        return timer.stage(name, pages) if timer is not None else nullcontext({'pages': pages})
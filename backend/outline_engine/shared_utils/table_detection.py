@@ -2,53 +2,23 @@
 import re
 from typing import List, Dict, Optional
 from .pdf_text import PDFTextUtils
+from .pattern_registry import PatternRegistry
 
 class TableDetectionUtils:
     @staticmethod
     def is_table_structure(text: str) -> bool:
-        table_patterns = [
-            r'S\.?No\.?\s+(Name|Description|Item)',
-            r'(Name|Item|Description)\s+(Age|Quantity|Amount)',
-            r'\d+\.\s+\d+\.\s+\d+\.',
-            r'(Name|Age|Relationship)\s+(Name|Age|Relationship)',
-        ]
-        for pattern in table_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        if re.search(r'S\.?No\.?\s+Name\s+Age\s+Relationship', text, re.IGNORECASE):
-            return True
-        if re.match(r'^\d+\.\s*\d+\.\s*\d+\.\s*\d+', text.strip()):
-            return True
-        return False
+        return PatternRegistry.default().table_structure.matches(text)
 
     @staticmethod
     def is_table_or_form_content(text: str) -> bool:
-        if re.match(r'^\d+\.?\s*$', text.strip()):
-            return True
-        form_patterns = [
-            r'^\d+\.\s*(Name|Designation|PAY|Whether|Home Town|Amount)',
-            r'^S\.?No\.?\s+(Name|Age|Relationship)',
-            r'^\d+\.\s+\d+\.\s*$',
-            r'^\d+\.\s+\d+\.\s+\d+\.\s*$',
-            r'^\d+\.\s+\d+\.\s+\d+\.\s+\d+',
-            r'^(Date|Signature)',
-            r'^Rs\.\s*$',
-            r'^\d+\s+\d+\s+\d+\s*$',
-            r'^\d+\s*\d+\s*\d+\s*$',
-        ]
-        for pattern in form_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        if len(text.strip()) <= 2 and text.strip().isdigit():
-            return True
-        if re.match(r'^\d+\.\s*[A-Z]\.?(\s*)?$', text.strip()):
-            return True
-        if re.match(r'^[\d\.\s]{2,10}$', text.strip()) and '.' in text:
-            return True
-        return False
+        return PatternRegistry.default().table_or_form.matches(text)
 
     @staticmethod
     def detect_tables(page, blocks: List[Dict]) -> List[Dict]:
+        return TableDetectionUtils.detect_text_tables(blocks) + TableDetectionUtils.detect_layout_tables(page)
+
+    @staticmethod
+    def detect_text_tables(blocks: List[Dict]) -> List[Dict]:
         table_areas = []
         for block in blocks:
             if block["type"] != 0:
@@ -56,15 +26,53 @@ class TableDetectionUtils:
             text = PDFTextUtils.extract_block_text(block).strip()
             if TableDetectionUtils.is_table_structure(text):
                 table_areas.append({'bbox': block['bbox'], 'type': 'text_table', 'confidence': 0.8})
+        form_area = TableDetectionUtils.detect_form_structure(blocks)
+        if form_area:
+            table_areas.append(form_area)
+        return table_areas
+
+    @staticmethod
+    def ruling_envelope(page) -> Optional[List[float]]:
+        # page.find_tables() builds cells from vector ruling lines; without at least two
+        # horizontal and two vertical edges there is nothing it could find.
+        if page is None:
+            return None
+        horizontal, vertical = [], []
+        try:
+            drawings = page.get_drawings()
+        except Exception:
+            return None
+        for path in drawings:
+            for item in path.get("items", []):
+                if item[0] == "l":
+                    p1, p2 = item[1], item[2]
+                    edge = [min(p1.x, p2.x), min(p1.y, p2.y), max(p1.x, p2.x), max(p1.y, p2.y)]
+                    if abs(p1.y - p2.y) < 1:
+                        horizontal.append(edge)
+                    elif abs(p1.x - p2.x) < 1:
+                        vertical.append(edge)
+                elif item[0] in ("re", "qu"):
+                    rect = item[1] if item[0] == "re" else item[1].rect
+                    edge = [rect.x0, rect.y0, rect.x1, rect.y1]
+                    horizontal.extend([edge, edge])
+                    vertical.extend([edge, edge])
+        if len(horizontal) < 2 or len(vertical) < 2:
+            return None
+        edges = horizontal + vertical
+        return [min(e[0] for e in edges), min(e[1] for e in edges), max(e[2] for e in edges), max(e[3] for e in edges)]
+
+    @staticmethod
+    def detect_layout_tables(page) -> List[Dict]:
+        # page.find_tables() is one of the most expensive calls in the pipeline
+        table_areas = []
+        if page is None:
+            return table_areas
         try:
             layout_tables = page.find_tables()
             for table in layout_tables:
                 table_areas.append({'bbox': table.bbox, 'type': 'detected_table', 'confidence': 0.9})
         except:
             pass
-        form_area = TableDetectionUtils.detect_form_structure(blocks)
-        if form_area:
-            table_areas.append(form_area)
         return table_areas
 
     @staticmethod
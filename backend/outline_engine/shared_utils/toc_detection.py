@@ -2,11 +2,12 @@
 import re
 from typing import List, Dict
 from .pdf_text import PDFTextUtils
+from .pattern_registry import PatternRegistry
 
 class TOCDetectionUtils:
     @staticmethod
-    def is_table_of_contents_page(page, blocks: List[Dict]) -> bool:
-        page_text = page.get_text().upper()
+    def is_table_of_contents_page(page_text: str, blocks: List[Dict]) -> bool:
+        page_text = page_text.upper()
         if "TABLE OF CONTENTS" in page_text:
             return True
         toc_indicators = 0
@@ -20,13 +21,7 @@ class TOCDetectionUtils:
 
     @staticmethod
     def is_toc_entry(text: str) -> bool:
-        if re.search(r'^(\d+\.|\d+\.\d+\.?|Chapter\s+\d+:?)\s+.+\s+\d+\s*$', text.strip()):
-            return True
-        if re.search(r'\d+\.\d+\s+[^0-9]+\s+\d+\s+\d+\.\d+', text):
-            return True
-        if re.search(r'^.+\s+\d{1,3}\s*$', text.strip()) and len(text.strip()) > 10:
-            return True
-        return False
+        return PatternRegistry.default().toc_entry.matches(text)
 
     @staticmethod
     def extract_toc_heading_only(blocks: List[Dict], page_num: int) -> List[Dict]:
@@ -0,0 +1,33 @@
+"""
+Regenerate outlines for every PDF in storage/pdfs, e.g. after an outline engine upgrade.
+
+Usage (from backend/):
+    python reoutline.py [--workers N] [--force] [--restart]
+"""
+
+import argparse
+import sys
+from typing import List
+
+from services.documents import BatchOutliner
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Batch re-outline the PDF library")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: Config.BATCH_OUTLINE_WORKERS or CPU count)")
+    parser.add_argument('--force', action='store_true', help="re-outline documents whose outline is already current (in their saved mode)")
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint from an earlier interrupted run")
+    args = parser.parse_args(argv)
+
+    outliner = BatchOutliner(workers=args.workers)
+    if args.restart:
+        outliner.reset()
+    try:
+        stats = outliner.run(force=args.force)
+    except KeyboardInterrupt:
+        return 130
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,8 +3,9 @@ Connection analyzer module for analyzing document connections and generating tem
 """
 
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
 from services.document_service import document_service
+from services.documents.outline_index import HeadingRecord
 
 
 class ConnectionAnalyzer:
@@ -22,13 +23,13 @@ class ConnectionAnalyzer:
         
         # Analyze each document's outline for relevant connections
         for doc in all_documents:
-            outline = document_service.get_document_outline(doc.id)
-            if not outline or not outline.get('outline'):
+            outline = document_service.get_indexed_outline(doc.id)
+            if not outline or not outline.headings:
                 continue
             
             # Find matching sections in this document's outline
             relevant_sections = self.find_relevant_outline_sections(
-                text_words, outline['outline'], doc.filename
+                text_words, outline.headings, doc.filename
             )
             
             # Convert relevant sections to connection templates
@@ -54,12 +55,14 @@ class ConnectionAnalyzer:
         
         return templates[:5]  # Limit to top 5 connections
     
-    def find_relevant_outline_sections(self, key_concepts: List[str], outline: List[Dict], doc_filename: str) -> List[Dict]:
+    def find_relevant_outline_sections(self, key_concepts: List[str], outline: Sequence[HeadingRecord], doc_filename: str) -> List[Dict]:
         """Find outline sections that match the key concepts"""
         relevant_sections = []
+        # Same for every section
+        concept_words = set(' '.join(key_concepts).split())
         
         for section in outline:
-            heading = section.get('text', section.get('heading', '')).lower()
+            heading = section.text.lower()
             
             # Calculate relevance score based on concept matching
             relevance_score = 0
@@ -75,16 +78,15 @@ class ConnectionAnalyzer:
             
             # Also check for semantic similarity (basic word overlap)
             heading_words = set(heading.split())
-            concept_words = set(' '.join(key_concepts).split())
             overlap = len(heading_words.intersection(concept_words))
             relevance_score += overlap * 0.5
             
             # If section has some relevance, add it
             if relevance_score > 0:
                 section_info = {
-                    'heading': section.get('text', section.get('heading', 'Section')),
-                    'page': section.get('page', 1),
-                    'level': section.get('level', 'H1'),
+                    'heading': section.text or 'Section',
+                    'page': section.page,
+                    'level': section.level,
                     'relevance_score': self.score_to_strength(relevance_score),
                     'matched_concepts': matched_concepts,
                     'document': doc_filename
@@ -16,13 +16,14 @@ class ContextBuilder:
             documents = document_service.get_all_documents()
             
             for doc in documents:
-                outline = document_service.get_document_outline(doc.id)
+                outline = document_service.get_indexed_outline(doc.id)
                 if outline:
+                    # "outline" holds the shared HeadingRecords; only formatted below, never returned
                     formatted_outline = {
                         "pdf_name": doc.filename,
                         "document_id": doc.id,
-                        "outline": outline.get('outline', []),
-                        "summary": outline.get('summary', outline.get('title', 'No summary available'))
+                        "outline": outline.headings,
+                        "summary": outline.description
                     }
                     outlines.append(formatted_outline)
             
@@ -42,24 +43,9 @@ class ContextBuilder:
                 outline_items = outline.get('outline', [])
                 if outline_items:
                     context_parts.append("Structure:")
-                    for i, item in enumerate(outline_items):
-                        if i >= 8:  # Limit to conserve tokens
-                            break
-                        level = item.get('level', 'H1')
-                        heading = item.get('text', item.get('heading', 'Unknown'))
-                        page = item.get('page', 'N/A')
-                        try:
-                            if isinstance(level, str):
-                                if level.lower().startswith('h'):
-                                    level_num = int(level[1:]) if level[1:].isdigit() else 1
-                                else:
-                                    level_num = 1
-                            else:
-                                level_num = int(level) if level else 1
-                            indent = "  " * max(0, level_num - 1)
-                        except (ValueError, TypeError):
-                            indent = ""
-                        context_parts.append(f"{indent}- {heading} (p.{page})")
+                    for heading in outline_items[:8]:  # Limit to conserve tokens
+                        indent = "  " * max(0, heading.level_number - 1)
+                        context_parts.append(f"{indent}- {heading.text or 'Unknown'} (p.{heading.page})")
             
             return "\n".join(context_parts)
             
@@ -1,9 +1,10 @@
 import json
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from config import settings
 from utils import get_llm_client
 from services.document_service import document_service
+from services.documents.outline_index import HeadingRecord
 from models import DocumentConnection, ConnectionResponse
 
 # Import modular components
@@ -164,7 +165,7 @@ Return JSON array with 3-5 connection objects from DIFFERENT PDFs:"""
         """Extract key concepts and important words from text"""
         return self.utils.extract_key_concepts(text)
     
-    def _find_relevant_outline_sections(self, key_concepts: List[str], outline: List[Dict], doc_filename: str) -> List[Dict]:
+    def _find_relevant_outline_sections(self, key_concepts: List[str], outline: Sequence[HeadingRecord], doc_filename: str) -> List[Dict]:
         """Find outline sections that match the key concepts"""
         return self.connection_analyzer.find_relevant_outline_sections(key_concepts, outline, doc_filename)
     
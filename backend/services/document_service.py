@@ -1,7 +1,7 @@
 import os
 import json
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 from pathlib import Path
 import aiofiles
@@ -9,6 +9,7 @@ from fastapi import UploadFile
 from config import settings
 from utils import extract_pdf_info, generate_pdf_outline
 from models import DocumentInfo
+from outline_engine import ENGINE_VERSION
 
 # Import modular components
 from .documents.index_manager import IndexManager
@@ -19,19 +20,20 @@ from .documents.utils import DocumentUtils
 
 
 class DocumentService:
+    DB_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "storage", "documents.db")
+    # Former JSON index; its IDs are imported into DB_FILE once
     INDEX_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "storage", "documents_index.json")
 
     def __init__(self):
         # Initialize modular components
-        self.index_manager = IndexManager(self.INDEX_FILE)
-        self.file_handler = FileHandler()
+        self.index_manager = IndexManager(self.DB_FILE, self.INDEX_FILE)
+        self.file_handler = FileHandler(self.index_manager)
         self.document_operations = DocumentOperations()
         self.outline_manager = OutlineManager()
         self.utils = DocumentUtils()
         
         # Initialize data structures
         self.documents: Dict[str, DocumentInfo] = {}
-        self._id_filename_map: Dict[str, str] = {}
         
         # Load data
         self._rebuild_index_from_files()  # Always rebuild from actual files
@@ -40,16 +42,10 @@ class DocumentService:
     def _rebuild_index_from_files(self):
         """Rebuild index completely from actual files on disk, ignoring any existing index"""
         self.index_manager.rebuild_index_from_files()
-        self._id_filename_map = self.index_manager.get_id_filename_map()
 
-    def _save_index(self):
-        """Save index with validation and atomic write"""
-        self.index_manager._id_filename_map = self._id_filename_map
-        self.index_manager.save_index()
-        
     def _load_existing_documents(self):
-        """Load existing documents from storage using index mapping"""
-        self.document_operations.load_existing_documents(self._id_filename_map)
+        """Load existing documents from storage using the index rows"""
+        self.document_operations.load_existing_documents(self.index_manager.get_records())
         self.documents = self.document_operations.get_documents_dict()
     
     @staticmethod
@@ -65,8 +61,9 @@ class DocumentService:
         """Check if document is duplicate based on exact filename matching"""
         return self.file_handler.check_duplicate_document(filename, self.documents)
 
-    async def upload_document(self, file: UploadFile) -> DocumentInfo:
-        """Upload a new document keeping original filename and outline base"""
+    async def upload_document(self, file: UploadFile, outline_mode: Optional[str] = None) -> DocumentInfo:
+        """Upload a new document keeping original filename and outline base.
+        outline_mode ("fast", "balanced", "thorough") defaults to Config.DEFAULT_OUTLINE_MODE."""
         doc_info = await self.file_handler.upload_document(file, self.documents)
         
         # If it's a duplicate, return the existing document
@@ -74,38 +71,27 @@ class DocumentService:
             return doc_info
         
         # Generate outline for new document
-        doc_info = self.outline_manager.generate_and_save_outline(doc_info)
+        doc_info = self.outline_manager.generate_and_save_outline(doc_info, outline_mode)
         
         # Add to index and runtime
-        self._id_filename_map[doc_info.id] = doc_info.filename
-        self._save_index()
+        self.index_manager.add_document_to_index(doc_info, ENGINE_VERSION if doc_info.has_outline else None)
         self.documents[doc_info.id] = doc_info
         
         # Refresh search / connection indexes (best-effort)
-        try:
-            from services.search_service import search_service  # local import
-            from services.connection_service import connection_service  # local import
-            search_service._build_search_index()
-            if hasattr(connection_service, 'heading_metadata'):
-                delattr(connection_service, 'heading_metadata')
-            if hasattr(connection_service, 'document_vectors'):
-                connection_service.document_vectors = {}
-            print(f"🔄 Refreshed search indexes")
-        except Exception as e:
-            print(f"⚠️ Index refresh warning: {e}")
+        self.utils.refresh_search_indexes()
 
         return doc_info
     
-    async def bulk_upload_documents(self, files: List[UploadFile]) -> List[DocumentInfo]:
-        """Upload multiple documents with duplicate checking"""
+    async def bulk_upload_documents(self, files: List[UploadFile], outline_mode: Optional[str] = None) -> List[DocumentInfo]:
+        """Upload multiple documents with duplicate checking, all outlined in the same mode"""
         documents = []
         print(f"📦 Bulk upload started: {len(files)} files")
-        print(f"📊 Index state before bulk upload: {len(self._id_filename_map)} entries")
+        print(f"📊 Index state before bulk upload: {self.index_manager.count()} entries")
         
         for i, file in enumerate(files, 1):
             print(f"📄 Processing file {i}/{len(files)}: {file.filename}")
             try:
-                doc = await self.upload_document(file)
+                doc = await self.upload_document(file, outline_mode)
                 documents.append(doc)
                 print(f"✅ File {i} completed: {doc.filename}")
             except Exception as e:
@@ -113,7 +99,7 @@ class DocumentService:
                 # Continue with other files instead of failing entire batch
                 continue
         
-        print(f"📊 Index state after bulk upload: {len(self._id_filename_map)} entries")
+        print(f"📊 Index state after bulk upload: {self.index_manager.count()} entries")
         
         # After bulk upload ensure index built once (local import to avoid circular)
         try:
@@ -131,9 +117,7 @@ class DocumentService:
         doc = self.document_operations.get_document(doc_id)
         if doc is None:
             # Clean up from index if document was removed
-            if doc_id in self._id_filename_map:
-                del self._id_filename_map[doc_id]
-                self._save_index()
+            self.index_manager.remove_document_from_index(doc_id)
         else:
             # Update local documents dict
             self.documents = self.document_operations.get_documents_dict()
@@ -141,21 +125,16 @@ class DocumentService:
     
     def get_all_documents(self) -> List[DocumentInfo]:
         """Get all documents with automatic cleanup of missing files"""
+        known_ids = set(self.document_operations.get_documents_dict())
         documents = self.document_operations.get_all_documents()
         
         # Update local state
         self.documents = self.document_operations.get_documents_dict()
         
-        # Sync index with cleaned documents
-        current_ids = set(self.documents.keys())
-        index_ids = set(self._id_filename_map.keys())
-        
-        # Remove stale entries from index
-        stale_index_ids = index_ids - current_ids
+        # Remove entries cleaned up above from the index
+        stale_index_ids = known_ids - set(self.documents)
         if stale_index_ids:
-            for doc_id in stale_index_ids:
-                del self._id_filename_map[doc_id]
-            self._save_index()
+            self.index_manager.remove_documents_from_index(stale_index_ids)
         
         return documents
 
@@ -175,9 +154,9 @@ class DocumentService:
         
         # Remove from index
         self.index_manager.remove_document_from_index(doc_id)
-        self._id_filename_map = self.index_manager.get_id_filename_map()
         
         # Remove from runtime
+        self.outline_manager.outline_index.evict(doc_id)
         self.document_operations.remove_document(doc_id)
         self.documents = self.document_operations.get_documents_dict()
         
@@ -189,7 +168,6 @@ class DocumentService:
         
         # Sync index manager
         self.index_manager.sync_with_filesystem()
-        self._id_filename_map = self.index_manager.get_id_filename_map()
         
         # Reload documents
         self._load_existing_documents()
@@ -201,5 +179,31 @@ class DocumentService:
         doc = self.get_document(doc_id)
         return self.outline_manager.get_document_outline(doc)
 
+    def get_indexed_outline(self, doc_id: str):
+        """Outline as shared heading records, for library-wide consumers (search, context builders)"""
+        doc = self.get_document(doc_id)
+        return self.outline_manager.get_indexed_outline(doc)
+
+    def stream_document_outline(self, doc_id: str) -> Optional[Iterator[Dict[str, Any]]]:
+        """Stream outline events for a document (saved outline when complete, else extracted live)"""
+        doc = self.get_document(doc_id)
+        return self.outline_manager.stream_document_outline(doc)
+
+    def get_section_text(self, doc_id: str, heading_index: int) -> Optional[str]:
+        """Body text under one outline heading, sliced from the stored document text"""
+        doc = self.get_document(doc_id)
+        return self.outline_manager.get_section_text(doc, heading_index)
+
+    def reclassify_document_outlines(self) -> int:
+        """Re-classify every outline from its layout features (see OutlineManager.reclassify_outline);
+        returns how many were updated"""
+        updated = 0
+        for doc in list(self.documents.values()):
+            if self.outline_manager.reclassify_outline(doc) is not None:
+                self.index_manager.update_document_in_index(doc, ENGINE_VERSION)
+                updated += 1
+        print(f"✅ Re-classified {updated}/{len(self.documents)} outlines")
+        return updated
+
 # Create singleton instance
 document_service = DocumentService()
\ No newline at end of file
@@ -4,15 +4,28 @@ This module provides modular components for document storage, indexing, and mana
 """
 
 from .index_manager import IndexManager
-from .file_handler import FileHandler
+from .metadata_store import DocumentMetadataStore
+from .file_handler import FileHandler, UploadTooLargeError
 from .document_operations import DocumentOperations
 from .outline_manager import OutlineManager
+from .outline_cache import OutlineCache
+from .page_cache import PageResultCache
+from .batch_outliner import BatchOutliner
+from .outline_index import OutlineIndex, IndexedOutline, HeadingRecord
 from .utils import DocumentUtils
 
 __all__ = [
     'IndexManager',
+    'DocumentMetadataStore',
     'FileHandler',
+    'UploadTooLargeError',
     'DocumentOperations',
     'OutlineManager',
+    'OutlineCache',
+    'PageResultCache',
+    'BatchOutliner',
+    'OutlineIndex',
+    'IndexedOutline',
+    'HeadingRecord',
     'DocumentUtils'
 ]
@@ -0,0 +1,164 @@
+"""
+Batch re-outline module: regenerates outlines for the whole PDF library across a process pool.
+"""
+
+import os
+import json
+import signal
+import time
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+from config import settings, Config
+from models import DocumentInfo
+from outline_engine import ENGINE_VERSION
+
+# Per-process OutlineManager, created by the pool initializer
+_worker_manager = None
+
+
+def _init_worker():
+    global _worker_manager
+    # Ctrl+C is handled by the parent, which checkpoints and cancels pending work
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Documents are the unit of parallelism; no nested page-range pools inside workers
+    Config.ENABLE_PARALLEL = False
+    from .outline_manager import OutlineManager
+    _worker_manager = OutlineManager()
+
+
+def _reoutline_document(filepath: str, force: bool) -> Dict[str, Any]:
+    """Runs in a worker process; returns the document's status, page count and time taken"""
+    start = time.perf_counter()
+    filename = os.path.basename(filepath)
+    doc_info = DocumentInfo(id=filename, filename=filename, filepath=filepath, upload_time=datetime.now())
+    try:
+        # Keep the mode the document was uploaded with (e.g. fast) instead of upgrading it
+        mode = _worker_manager.saved_outline_mode(doc_info)
+        if not force and _worker_manager.is_outline_current(doc_info, mode):
+            return {"status": "skipped", "content_hash": doc_info.content_hash, "pages": 0, "seconds": 0.0}
+        outline = _worker_manager.regenerate_outline(doc_info, mode)
+        if outline is None:
+            return {"status": "failed", "error": "extraction failed", "pages": 0, "seconds": time.perf_counter() - start}
+        import fitz
+        with fitz.open(filepath) as doc:
+            pages = len(doc)
+        return {"status": "done", "content_hash": doc_info.content_hash, "pages": pages, "seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {"status": "failed", "error": str(e), "pages": 0, "seconds": time.perf_counter() - start}
+
+
+class BatchOutliner:
+    """Regenerates outlines for every PDF in the upload folder, e.g. after an engine upgrade.
+
+    Documents whose cached outline already matches the engine version are skipped;
+    ``force`` re-outlines them anyway. Each document keeps its saved outline mode.
+    Finished documents are recorded in a checkpoint file (keyed by file name, size and
+    mtime) so an interrupted run, forced or not, resumes where it stopped. A forced run
+    only resumes from a forced run's checkpoint; the checkpoint is removed once a run
+    completes.
+    """
+
+    CHECKPOINT_INTERVAL = 2.0  # seconds between checkpoint writes
+
+    def __init__(self, upload_folder: str = None, checkpoint_file: str = None, workers: Optional[int] = None):
+        self.upload_folder = upload_folder or settings.upload_folder
+        self.checkpoint_file = checkpoint_file or settings.reoutline_checkpoint_file
+        self.workers = workers or Config.BATCH_OUTLINE_WORKERS or os.cpu_count() or 1
+        self._done: Dict[str, Dict[str, Any]] = {}
+        self._force = False
+
+    def run(self, force: bool = False, resume: bool = True) -> Dict[str, Any]:
+        """Re-outline the library and return counts and throughput"""
+        self._force = force
+        if resume:
+            self._load_checkpoint()
+        pdf_paths = sorted(str(path) for path in Path(self.upload_folder).glob("*.pdf"))
+        pending = [path for path in pdf_paths if not self._checkpointed(path)]
+        stats = {"documents": len(pdf_paths), "done": 0, "skipped": len(pdf_paths) - len(pending), "failed": 0, "pages": 0}
+        print(f"📚 {len(pdf_paths)} PDFs, {len(pending)} to check with {self.workers} workers (engine {ENGINE_VERSION})")
+
+        start = time.perf_counter()
+        last_checkpoint = start
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        try:
+            futures = {pool.submit(_reoutline_document, path, force): path for path in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                result = future.result()
+                stats[result["status"]] += 1
+                stats["pages"] += result["pages"]
+                if result["status"] == "failed":
+                    print(f"❌ {os.path.basename(path)}: {result.get('error')}")
+                else:
+                    if result["status"] == "done":
+                        print(f"✅ {os.path.basename(path)}: {result['pages']} pages in {result['seconds']:.2f}s")
+                    self._mark_done(path, result["content_hash"])
+                if time.perf_counter() - last_checkpoint >= self.CHECKPOINT_INTERVAL:
+                    self._save_checkpoint()
+                    last_checkpoint = time.perf_counter()
+        except BaseException as e:
+            self._save_checkpoint()
+            if isinstance(e, KeyboardInterrupt):
+                print("⏹️ Interrupted; progress saved, re-run to resume")
+                pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            pool.shutdown(wait=True)
+        # Completed: nothing to resume
+        self.reset()
+
+        elapsed = time.perf_counter() - start
+        stats["seconds"] = round(elapsed, 2)
+        stats["documents_per_sec"] = round(stats["done"] / elapsed, 2) if elapsed else None
+        stats["pages_per_sec"] = round(stats["pages"] / elapsed, 2) if elapsed else None
+        print(f"📊 {stats['done']} re-outlined, {stats['skipped']} up to date, {stats['failed']} failed in {stats['seconds']}s "
+              f"({stats['documents_per_sec']} docs/s, {stats['pages_per_sec']} pages/s)")
+        return stats
+
+    def _checkpointed(self, path: str) -> bool:
+        entry = self._done.get(os.path.basename(path))
+        if entry is None:
+            return False
+        stat = os.stat(path)
+        return entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime
+
+    def _mark_done(self, path: str, content_hash: Optional[str]):
+        stat = os.stat(path)
+        self._done[os.path.basename(path)] = {"size": stat.st_size, "mtime": stat.st_mtime, "content_hash": content_hash}
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_file):
+            return
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read checkpoint {self.checkpoint_file}: {e}")
+            return
+        # A checkpoint from another engine version says nothing about current outlines, and
+        # one from an unforced run lists documents a forced run has still to redo
+        if checkpoint.get("engine_version") == ENGINE_VERSION and (checkpoint.get("force", False) or not self._force):
+            self._done = checkpoint.get("done", {})
+            print(f"↩️ Resuming: {len(self._done)} documents already done")
+
+    def _save_checkpoint(self):
+        folder = os.path.dirname(self.checkpoint_file) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"engine_version": ENGINE_VERSION, "force": self._force, "done": self._done}, f, indent=2)
+            os.replace(temp_path, self.checkpoint_file)
+        except Exception as e:
+            print(f"⚠️ Could not save checkpoint {self.checkpoint_file}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def reset(self):
+        """Forget checkpointed progress"""
+        self._done = {}
+        if os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
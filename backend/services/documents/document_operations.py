@@ -3,7 +3,7 @@ Document operations module for CRUD operations and document management.
 """
 
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from models import DocumentInfo
 from config import settings
@@ -15,29 +15,33 @@ class DocumentOperations:
     def __init__(self):
         self.documents: Dict[str, DocumentInfo] = {}
     
-    def load_existing_documents(self, id_filename_map: Dict[str, str]):
-        """Load existing documents from storage using index mapping"""
+    def load_existing_documents(self, records: List[Dict[str, Any]]):
+        """Load existing documents from storage using the index rows (see DocumentMetadataStore)"""
         self.documents.clear()
         
         if not os.path.exists(settings.upload_folder):
             return
             
-        for doc_id, filename in id_filename_map.items():
+        for record in records:
+            filename = record['filename']
             pdf_path = os.path.join(settings.upload_folder, filename)
             if not os.path.exists(pdf_path):
                 continue
                 
             base_name = os.path.splitext(filename)[0]
             outline_path = os.path.join(settings.outline_folder, f"{base_name}.json")
+            has_outline = os.path.exists(outline_path)
+            upload_time = record.get('upload_time')
             
-            self.documents[doc_id] = DocumentInfo(
-                id=doc_id,
+            self.documents[record['id']] = DocumentInfo(
+                id=record['id'],
                 filename=filename,
                 filepath=pdf_path,
-                outline_path=outline_path if os.path.exists(outline_path) else None,
-                upload_time=datetime.fromtimestamp(os.path.getctime(pdf_path)),
-                has_outline=os.path.exists(outline_path),
-                page_count=None
+                outline_path=outline_path if has_outline else None,
+                upload_time=datetime.fromisoformat(upload_time) if upload_time else datetime.fromtimestamp(os.path.getctime(pdf_path)),
+                has_outline=has_outline,
+                page_count=record.get('page_count'),
+                content_hash=record.get('content_hash')
             )
     
     def get_document(self, doc_id: str) -> Optional[DocumentInfo]:
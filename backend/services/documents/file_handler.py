@@ -4,23 +4,41 @@ File handler module for document upload and storage operations.
 
 import os
 import uuid
-from typing import List, Optional
+import hashlib
+import tempfile
+from typing import List, Optional, Tuple
 from datetime import datetime
 import aiofiles
 from fastapi import UploadFile
 from config import settings
 from models import DocumentInfo
+from .outline_manager import OutlineManager
+
+
+class UploadTooLargeError(ValueError):
+    """An upload exceeded settings.max_file_size; nothing was stored."""
 
 
 class FileHandler:
     """Handles file upload, storage, and validation operations."""
     
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # bytes read from the request per step
+    
+    def __init__(self, index_manager=None):
+        # With the index (an IndexManager), duplicate checks are indexed lookups instead of scans
+        self.index_manager = index_manager
+    
     def check_duplicate_document(self, filename: str, existing_documents: dict) -> Optional[DocumentInfo]:
         """Check if document is duplicate based on exact filename matching.
         Returns existing document if exact duplicate found, preventing new upload.
         Allows numbered variants like file01_1.pdf, file01_2.pdf but blocks exact duplicates.
         """
-        for doc in existing_documents.values():
+        if self.index_manager is not None:
+            record = self.index_manager.find_by_filename(filename)
+            candidates = [existing_documents[record['id']]] if record and record['id'] in existing_documents else []
+        else:
+            candidates = existing_documents.values()
+        for doc in candidates:
             if doc.filename == filename:
                 print(f"🚫 DUPLICATE BLOCKED: {filename} already exists")
                 print(f"   Exact filename '{filename}' already exists in the system")
@@ -33,20 +51,45 @@ class FileHandler:
         print(f"✅ NEW FILE ALLOWED: {filename}")
         return None
     
-    async def save_uploaded_file(self, file: UploadFile, filename: str) -> str:
-        """Save uploaded file to storage and return filepath"""
+    async def save_uploaded_file(self, file: UploadFile, filename: str) -> Tuple[str, str]:
+        """Stream an upload into storage and return (filepath, SHA-256 of the bytes).
+
+        The body is copied in UPLOAD_CHUNK_SIZE chunks to a temp file in the upload folder,
+        hashed and size-checked as it goes, and renamed into place once complete. An upload
+        over settings.max_file_size raises UploadTooLargeError as soon as the limit is
+        passed; the temp file is removed and nothing is stored.
+        """
         # Ensure storage directories exist
         os.makedirs(settings.upload_folder, exist_ok=True)
         
         filepath = os.path.join(settings.upload_folder, filename)
+        digest = hashlib.sha256()
+        size = 0
         
-        # Save uploaded file
-        async with aiofiles.open(filepath, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # Not *.pdf, so an unfinished upload is never picked up by an index rebuild
+        fd, temp_path = tempfile.mkstemp(dir=settings.upload_folder, suffix=".part")
+        os.close(fd)
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                while True:
+                    chunk = await file.read(self.UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > settings.max_file_size:
+                        from .utils import DocumentUtils
+                        raise UploadTooLargeError(
+                            f"File size must be less than {DocumentUtils.format_size(settings.max_file_size)}")
+                    digest.update(chunk)
+                    await f.write(chunk)
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
         
-        print(f"💾 Saved PDF: {filepath}")
-        return filepath
+        print(f"💾 Saved PDF: {filepath} ({size} bytes)")
+        return filepath, digest.hexdigest()
     
     async def upload_document(self, file: UploadFile, existing_documents: dict) -> DocumentInfo:
         """Upload a new document keeping original filename and outline base.
@@ -73,7 +116,7 @@ class FileHandler:
         print(f"📄 Processing new document upload: {original_name}")
         
         doc_id = str(uuid.uuid4())
-        filepath = await self.save_uploaded_file(file, original_name)
+        filepath, content_hash = await self.save_uploaded_file(file, original_name)
         
         # Extract PDF info
         from utils import extract_pdf_info
@@ -86,7 +129,8 @@ class FileHandler:
             outline_path=None,  # Will be set by outline manager
             upload_time=datetime.now(),
             has_outline=False,  # Will be updated by outline manager
-            page_count=pdf_info.get("page_count")
+            page_count=pdf_info.get("page_count"),
+            content_hash=content_hash
         )
         
         print(f"✅ Document upload completed: {original_name}")
@@ -114,13 +158,22 @@ class FileHandler:
     def delete_document_files(self, doc_info: DocumentInfo) -> bool:
         """Delete document files from storage"""
         try:
+            # Close pooled handles first (an open file can't be removed on Windows)
+            from utils import get_document_pool, get_page_text_cache
+            get_document_pool().evict(doc_info.filepath)
+            get_page_text_cache().evict(doc_info.filepath)
+            
             # Delete PDF file
             if os.path.exists(doc_info.filepath):
                 os.remove(doc_info.filepath)
             
-            # Delete outline file
+            # Delete outline file with its layout features and text blob
             if doc_info.outline_path and os.path.exists(doc_info.outline_path):
                 os.remove(doc_info.outline_path)
+            if doc_info.outline_path:
+                for side_path in (OutlineManager.feature_path(doc_info.outline_path), OutlineManager.text_path(doc_info.outline_path)):
+                    if os.path.exists(side_path):
+                        os.remove(side_path)
             
             return True
         except Exception as e:
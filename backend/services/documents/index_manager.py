@@ -5,129 +5,143 @@ Index manager module for handling document index operations.
 import os
 import json
 import uuid
-from typing import Dict
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional
 from pathlib import Path
 from config import settings
+from models import DocumentInfo
+from .metadata_store import DocumentMetadataStore
 
 
 class IndexManager:
-    """Handles document index management and file system synchronization."""
-    
-    def __init__(self, index_file: str):
-        self.INDEX_FILE = index_file
-        self._id_filename_map: Dict[str, str] = {}
-    
+    """Handles the document index (a DocumentMetadataStore) and file system synchronization.
+
+    Adds and removes touch one row each; only rebuild/sync scan the upload folder.
+    """
+
+    def __init__(self, db_file: str, legacy_index_file: Optional[str] = None):
+        self.DB_FILE = db_file
+        self.LEGACY_INDEX_FILE = legacy_index_file
+        self.store = DocumentMetadataStore(db_file)
+
     def rebuild_index_from_files(self):
-        """Rebuild index completely from actual files on disk, ignoring any existing index"""
+        """Reconcile the index with the PDF files on disk, keeping the IDs of known files"""
         print("🔄 Rebuilding index from actual files...")
-        
-        # Clear any existing data
-        self._id_filename_map.clear()
-        
+
         # Scan actual PDF files
         if not os.path.exists(settings.upload_folder):
             print("📁 Upload folder doesn't exist, starting with empty index")
-            self.save_index()
+            self.store.remove_many(self.store.id_filename_map())
             return
-        
-        actual_files = []
-        for file_path in Path(settings.upload_folder).glob("*.pdf"):
-            actual_files.append(file_path.name)
-        
+
+        actual_files = [file_path.name for file_path in Path(settings.upload_folder).glob("*.pdf")]
         print(f"📁 Found {len(actual_files)} actual PDF files")
-        
-        # Try to load existing index to preserve IDs for existing files
-        existing_index = {}
-        if os.path.exists(self.INDEX_FILE):
-            try:
-                with open(self.INDEX_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if isinstance(data, dict):
-                    existing_index = data
-                elif isinstance(data, list):
-                    for entry in data:
-                        if isinstance(entry, dict) and 'id' in entry and 'filename' in entry:
-                            existing_index[entry['id']] = entry['filename']
-            except Exception as e:
-                print(f"⚠️ Could not read existing index: {e}")
-        
-        # Build clean index - one entry per actual file
-        file_to_id = {}
-        for doc_id, filename in existing_index.items():
-            if filename in actual_files and filename not in file_to_id:
-                file_to_id[filename] = doc_id
-                self._id_filename_map[doc_id] = filename
-        
-        # Generate new IDs for files that don't have them
-        for filename in actual_files:
-            if filename not in file_to_id:
-                new_id = str(uuid.uuid4())
-                self._id_filename_map[new_id] = filename
-                print(f"🆕 Generated new ID for {filename}: {new_id[:8]}...")
-        
-        print(f"✅ Rebuilt clean index with {len(self._id_filename_map)} entries")
-        
-        # Save the clean index
-        self.save_index()
-    
-    def save_index(self):
-        """Save index with validation and atomic write"""
+
+        with self.store.transaction():
+            known = {record['filename']: record for record in self.store.all()}
+            if not known:
+                known = self._import_legacy_index()
+
+            # Drop entries whose file is gone
+            on_disk = set(actual_files)
+            stale_ids = [record['id'] for filename, record in known.items() if filename not in on_disk]
+            if stale_ids:
+                print(f"🧹 Removing {len(stale_ids)} entries without a PDF file")
+                self.store.remove_many(stale_ids)
+
+            # Generate new IDs for files that don't have them
+            new_records = []
+            for filename in actual_files:
+                if filename not in known:
+                    new_id = str(uuid.uuid4())
+                    pdf_path = os.path.join(settings.upload_folder, filename)
+                    new_records.append({
+                        'id': new_id,
+                        'filename': filename,
+                        'upload_time': datetime.fromtimestamp(os.path.getctime(pdf_path)).isoformat(),
+                    })
+                    print(f"🆕 Generated new ID for {filename}: {new_id[:8]}...")
+            self.store.upsert_many(new_records)
+
+        print(f"✅ Rebuilt clean index with {self.store.count()} entries")
+
+    def _import_legacy_index(self) -> Dict[str, Dict[str, Any]]:
+        """IDs from the old documents_index.json, written into the store; filename -> record"""
+        if not self.LEGACY_INDEX_FILE or not os.path.exists(self.LEGACY_INDEX_FILE):
+            return {}
         try:
-            # Validate entries before saving
-            valid_entries = {}
-            cleaned_count = 0
-            
-            for doc_id, filename in self._id_filename_map.items():
-                pdf_path = os.path.join(settings.upload_folder, filename)
-                if os.path.exists(pdf_path):
-                    valid_entries[doc_id] = filename
-                else:
-                    cleaned_count += 1
-                    print(f"🗑️ Skipping invalid entry during save: {doc_id[:8]}... -> {filename}")
-            
-            if cleaned_count > 0:
-                print(f"🧹 Cleaned {cleaned_count} invalid entries during save")
-                self._id_filename_map = valid_entries
-            
-            # Atomic write
-            os.makedirs(os.path.dirname(self.INDEX_FILE), exist_ok=True)
-            temp_file = self.INDEX_FILE + ".tmp"
-            
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self._id_filename_map, f, indent=2)
-            
-            # Atomic rename
-            if os.path.exists(self.INDEX_FILE):
-                os.replace(temp_file, self.INDEX_FILE)
-            else:
-                os.rename(temp_file, self.INDEX_FILE)
-                
-            print(f"💾 Saved clean index with {len(self._id_filename_map)} entries")
-            
+            with open(self.LEGACY_INDEX_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         except Exception as e:
-            print(f"Failed to save index: {e}")
-            # Clean up temp file if it exists
-            temp_file = self.INDEX_FILE + ".tmp"
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-    
+            print(f"⚠️ Could not read existing index: {e}")
+            return {}
+
+        entries = []
+        if isinstance(data, dict):
+            entries = list(data.items())
+        elif isinstance(data, list):
+            entries = [(entry['id'], entry['filename']) for entry in data
+                       if isinstance(entry, dict) and 'id' in entry and 'filename' in entry]
+
+        # One entry per file; the first ID seen wins
+        records = {}
+        for doc_id, filename in entries:
+            if filename not in records:
+                records[filename] = {'id': doc_id, 'filename': filename}
+        self.store.upsert_many(records.values())
+        print(f"📥 Imported {len(records)} entries from {self.LEGACY_INDEX_FILE}")
+        # Imported once; an emptied library later must not bring the old IDs back
+        os.replace(self.LEGACY_INDEX_FILE, self.LEGACY_INDEX_FILE + ".migrated")
+        return records
+
+    @staticmethod
+    def _record(doc_info: DocumentInfo, engine_version: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'id': doc_info.id,
+            'filename': doc_info.filename,
+            'content_hash': doc_info.content_hash,
+            'page_count': doc_info.page_count,
+            'outline_path': doc_info.outline_path,
+            'upload_time': doc_info.upload_time.isoformat() if doc_info.upload_time else None,
+            'engine_version': engine_version,
+        }
+
     def get_id_filename_map(self) -> Dict[str, str]:
         """Get the current ID to filename mapping"""
-        return self._id_filename_map.copy()
-    
-    def add_document_to_index(self, doc_id: str, filename: str):
-        """Add a document to the index"""
-        self._id_filename_map[doc_id] = filename
-        self.save_index()
-    
-    def remove_document_from_index(self, doc_id: str):
+        return self.store.id_filename_map()
+
+    def get_records(self) -> List[Dict[str, Any]]:
+        """All index rows (see DocumentMetadataStore)"""
+        return self.store.all()
+
+    def count(self) -> int:
+        return self.store.count()
+
+    def find_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Index row of the document stored under ``filename``"""
+        return self.store.get_by_filename(filename)
+
+    def add_document_to_index(self, doc_info: DocumentInfo, engine_version: Optional[str] = None):
+        """Add (or replace) a document in the index"""
+        self.store.upsert(self._record(doc_info, engine_version))
+
+    def update_document_in_index(self, doc_info: DocumentInfo, engine_version: Optional[str] = None):
+        """Refresh a document's outline path (and outline engine version, when given)"""
+        fields = {'outline_path': doc_info.outline_path, 'content_hash': doc_info.content_hash}
+        if engine_version is not None:
+            fields['engine_version'] = engine_version
+        self.store.update(doc_info.id, **fields)
+
+    def remove_document_from_index(self, doc_id: str) -> bool:
         """Remove a document from the index"""
-        if doc_id in self._id_filename_map:
-            del self._id_filename_map[doc_id]
-            self.save_index()
-    
+        return self.store.remove(doc_id)
+
+    def remove_documents_from_index(self, doc_ids: Iterable[str]) -> int:
+        """Remove several documents in one transaction"""
+        return self.store.remove_many(doc_ids)
+
     def sync_with_filesystem(self):
         """Manually sync the document index with actual files on disk"""
         print("🔄 Syncing document index with filesystem...")
         self.rebuild_index_from_files()
-        print(f"✅ Sync completed. Active documents: {len(self._id_filename_map)}")
+        print(f"✅ Sync completed. Active documents: {self.store.count()}")
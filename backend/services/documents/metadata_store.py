@@ -0,0 +1,128 @@
+"""
+Document metadata store module: SQLite (WAL) table of uploaded documents.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+COLUMNS = ('id', 'filename', 'content_hash', 'page_count', 'outline_path', 'upload_time', 'engine_version')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL UNIQUE,
+    content_hash TEXT,
+    page_count INTEGER,
+    outline_path TEXT,
+    upload_time TEXT,
+    engine_version TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_content_hash ON documents (content_hash);
+CREATE INDEX IF NOT EXISTS documents_upload_time ON documents (upload_time);
+CREATE INDEX IF NOT EXISTS documents_engine_version ON documents (engine_version);
+"""
+
+
+class DocumentMetadataStore:
+    """One row per document (id, filename, content hash, page count, outline path, upload
+    time as ISO text, engine version of its outline).
+
+    The database runs in WAL mode, so readers never block on a writer and see the last
+    committed state. Each thread gets its own connection; every write is one transaction,
+    and ``transaction()`` groups several writes into one.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        # executescript() manages its own transaction
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit; transactions are opened explicitly in transaction()
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Writes inside the block commit together or not at all; nested blocks join the outer one"""
+        conn = self._connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.depth = 0
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        self.upsert_many([record])
+
+    def upsert_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Insert or replace rows; columns missing from a record are stored as NULL"""
+        rows = [tuple(record.get(column) for column in COLUMNS) for record in records]
+        with self.transaction() as conn:
+            conn.executemany(f"INSERT OR REPLACE INTO documents ({', '.join(COLUMNS)}) "
+                             f"VALUES ({', '.join('?' for _ in COLUMNS)})", rows)
+
+    def update(self, doc_id: str, **fields) -> None:
+        fields = {column: value for column, value in fields.items() if column in COLUMNS and column != 'id'}
+        if not fields:
+            return
+        with self.transaction() as conn:
+            conn.execute(f"UPDATE documents SET {', '.join(f'{column} = ?' for column in fields)} WHERE id = ?",
+                         (*fields.values(), doc_id))
+
+    def remove(self, doc_id: str) -> bool:
+        return self.remove_many([doc_id]) > 0
+
+    def remove_many(self, doc_ids: Iterable[str]) -> int:
+        with self.transaction() as conn:
+            return conn.executemany("DELETE FROM documents WHERE id = ?", [(doc_id,) for doc_id in doc_ids]).rowcount
+
+    def get_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT * FROM documents WHERE filename = ?", (filename,)).fetchone()
+        return dict(row) if row else None
+
+    def find_by_content_hash(self, content_hash: str) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._connection().execute("SELECT * FROM documents WHERE content_hash = ?", (content_hash,))]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Every row, oldest upload first"""
+        return [dict(row) for row in self._connection().execute("SELECT * FROM documents ORDER BY upload_time, filename")]
+
+    def id_filename_map(self) -> Dict[str, str]:
+        return {row['id']: row['filename'] for row in self._connection().execute("SELECT id, filename FROM documents")}
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
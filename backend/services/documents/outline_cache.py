@@ -0,0 +1,84 @@
+"""
+Outline cache module keyed by PDF content hash and outline engine version.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Any, List, Optional
+from config import settings, Config
+from outline_engine import ENGINE_VERSION
+from outline_engine.shared_utils import OUTLINE_MODES
+
+
+class OutlineCache:
+    """Stores generated outlines by SHA-256 of the PDF bytes so identical files are never re-extracted.
+
+    Entries are kept per outline mode; a request is also served from a more thorough
+    mode's entry, never from a faster one.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_folder: str = None, engine_version: str = ENGINE_VERSION):
+        self.cache_folder = cache_folder or settings.outline_cache_folder
+        self.engine_version = engine_version
+
+    @classmethod
+    def compute_file_hash(cls, filepath: str) -> str:
+        """SHA-256 of a file, read in chunks"""
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_path(self, content_hash: str, mode: str = 'thorough') -> str:
+        suffix = "" if mode == 'thorough' else f".{mode}"
+        return os.path.join(self.cache_folder, f"{content_hash}{suffix}.json")
+
+    @staticmethod
+    def _usable_modes(mode: Optional[str]) -> List[str]:
+        # OUTLINE_MODES runs from fastest to most thorough
+        names = list(OUTLINE_MODES)
+        mode = mode or Config.DEFAULT_OUTLINE_MODE
+        return names[names.index(mode):] if mode in names else [mode]
+
+    def get(self, content_hash: str, mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached outline for ``mode`` (default Config.DEFAULT_OUTLINE_MODE) or a more
+        thorough one, or None on a miss or entries from another engine version"""
+        for usable_mode in self._usable_modes(mode):
+            outline = self._read(self._entry_path(content_hash, usable_mode), content_hash)
+            if outline is not None:
+                return outline
+        return None
+
+    def _read(self, entry_path: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read cached outline {content_hash[:12]}: {e}")
+            return None
+        if entry.get('engine_version') != self.engine_version:
+            # Stale entry: overwritten by the next put()
+            return None
+        return entry.get('outline')
+
+    def put(self, content_hash: str, outline: Dict[str, Any]) -> None:
+        """Store an outline atomically, under the mode it was extracted with"""
+        os.makedirs(self.cache_folder, exist_ok=True)
+        entry_path = self._entry_path(content_hash, outline.get('outline_mode', 'thorough'))
+        # Unique temp name: concurrent puts of the same hash must not share a half-written file
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'engine_version': self.engine_version, 'outline': outline}, f, ensure_ascii=False)
+            os.replace(temp_path, entry_path)
+        except Exception as e:
+            print(f"⚠️ Could not cache outline {content_hash[:12]}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
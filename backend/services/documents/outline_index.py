@@ -0,0 +1,116 @@
+"""
+Outline index module: compact in-memory outlines for the whole library.
+"""
+
+import os
+import sys
+import json
+import threading
+from typing import Dict, Any, Optional, Tuple
+from models import DocumentInfo
+
+
+class HeadingRecord:
+    """One outline heading. Slotted, with interned level and document id strings, so a
+    library of outlines costs one small object per heading instead of a dict."""
+
+    __slots__ = ('level', 'text', 'page', 'doc_id')
+
+    def __init__(self, level: str, text: str, page: int, doc_id: str):
+        self.level = level
+        self.text = text
+        self.page = page
+        self.doc_id = doc_id
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any], doc_id: str) -> 'HeadingRecord':
+        return cls(sys.intern(str(item.get('level', 'H1'))), item.get('text', item.get('heading', '')),
+                   item.get('page', 1), doc_id)
+
+    @property
+    def level_number(self) -> int:
+        """1 for 'H1', 2 for 'H2', ...; 1 when the level is not of that form"""
+        return self.parse_level(self.level)
+
+    @staticmethod
+    def parse_level(level: Any) -> int:
+        """Level number of an outline item's 'level' ('H2' or 2 -> 2; 1 when unparsable)"""
+        level = str(level)
+        level = level[1:] if level[:1] in ('H', 'h') else level
+        return int(level) if level.isdigit() else 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'level': self.level, 'text': self.text, 'page': self.page}
+
+    def __repr__(self) -> str:
+        return f"HeadingRecord({self.level!r}, {self.text!r}, {self.page!r}, {self.doc_id!r})"
+
+
+class IndexedOutline:
+    """Title, summary and heading records of one document's outline"""
+
+    __slots__ = ('doc_id', 'title', 'summary', 'headings')
+
+    def __init__(self, doc_id: str, title: Optional[str], summary: Optional[str], headings: Tuple[HeadingRecord, ...]):
+        self.doc_id = doc_id
+        self.title = title
+        self.summary = summary
+        self.headings = headings
+
+    @classmethod
+    def from_outline(cls, doc_id: str, outline: Dict[str, Any]) -> 'IndexedOutline':
+        doc_id = sys.intern(doc_id)
+        headings = tuple(HeadingRecord.from_item(item, doc_id) for item in outline.get('outline', []))
+        return cls(doc_id, outline.get('title'), outline.get('summary'), headings)
+
+    @property
+    def description(self) -> str:
+        """Summary, falling back to the title"""
+        if self.summary is not None:
+            return self.summary
+        return self.title if self.title is not None else 'No summary available'
+
+
+class OutlineIndex:
+    """Library-wide store of IndexedOutline, read from the outline JSON files on first use.
+
+    Entries are keyed by document id and remember the outline file's mtime, so an outline
+    rewritten by a completion or re-outline run is re-read on the next lookup.
+    """
+
+    def __init__(self):
+        self._outlines: Dict[str, Tuple[int, IndexedOutline]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, doc_info: Optional[DocumentInfo]) -> Optional[IndexedOutline]:
+        if not doc_info or not doc_info.outline_path:
+            return None
+        try:
+            mtime = os.stat(doc_info.outline_path).st_mtime_ns
+        except OSError:
+            self.evict(doc_info.id)
+            return None
+
+        with self._lock:
+            entry = self._outlines.get(doc_info.id)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        try:
+            with open(doc_info.outline_path, 'r', encoding='utf-8') as f:
+                indexed = IndexedOutline.from_outline(doc_info.id, json.load(f))
+        except Exception as e:
+            print(f"Failed to index outline for {doc_info.id}: {e}")
+            return None
+        with self._lock:
+            self._outlines[indexed.doc_id] = (mtime, indexed)
+        return indexed
+
+    def evict(self, doc_id: str) -> None:
+        with self._lock:
+            self._outlines.pop(doc_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"documents": len(self._outlines),
+                    "headings": sum(len(entry[1].headings) for entry in self._outlines.values())}
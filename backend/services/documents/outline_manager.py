@@ -4,44 +4,293 @@ Outline manager module for PDF outline generation and management.
 
 import os
 import json
-from typing import Dict, Any, Optional
-from config import settings
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterator
+from config import settings, Config
 from models import DocumentInfo
+from .outline_cache import OutlineCache
+from .page_cache import PageResultCache
+from .outline_index import OutlineIndex, IndexedOutline
+
+# Single worker: completions run one at a time so they don't compete with uploads for CPU
+_completion_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outline-completion")
 
 
 class OutlineManager:
     """Handles PDF outline generation and management."""
+
+    def __init__(self):
+        self.outline_cache = OutlineCache()
+        self.page_cache = PageResultCache() if Config.INCREMENTAL_EXTRACTION else None
+        self.outline_index = OutlineIndex()
     
-    def generate_and_save_outline(self, doc_info: DocumentInfo) -> DocumentInfo:
-        """Generate and save outline for a document"""
-        print(f"📋 Generating outline...")
-        
+    def generate_and_save_outline(self, doc_info: DocumentInfo, mode: Optional[str] = None) -> DocumentInfo:
+        """Generate and save outline for a document, reusing a cached outline for identical PDF bytes.
+
+        Extraction is bounded by Config.MAX_PROCESSING_TIME / MAX_PROCESSING_PAGES; a partial
+        outline is saved with "complete": false and finished in the background. Layout
+        features for re-classification are also saved in the background.
+        ``mode`` is the outline mode ("fast", "balanced", "thorough"; default Config.DEFAULT_OUTLINE_MODE).
+        """
         # Ensure outline folder exists
         os.makedirs(settings.outline_folder, exist_ok=True)
         
-        # Generate outline
-        from utils import generate_pdf_outline
-        outline = generate_pdf_outline(doc_info.filepath)
+        if not doc_info.content_hash:
+            doc_info.content_hash = OutlineCache.compute_file_hash(doc_info.filepath)
+        
+        text_path = self._text_path_if_enabled(doc_info)
+        outline = self.outline_cache.get(doc_info.content_hash, mode)
+        if outline is not None:
+            print(f"📋 Reusing cached outline ({doc_info.content_hash[:12]})")
+            # Section offsets refer to this document's text blob, which the cache doesn't hold
+            if "sections" in outline and not os.path.exists(self.text_path(self._outline_path(doc_info))):
+                from utils import write_pdf_text
+                if not write_pdf_text(doc_info.filepath, self.text_path(self._outline_path(doc_info))):
+                    outline = {key: value for key, value in outline.items() if key != "sections"}
+        else:
+            print(f"📋 Generating outline...")
+            from utils import generate_pdf_outline
+            timer = self._new_timer()
+            outline = generate_pdf_outline(doc_info.filepath, time_budget=Config.MAX_PROCESSING_TIME, max_pages=Config.MAX_PROCESSING_PAGES,
+                                           text_path=text_path, page_cache=self.page_cache, timer=timer, mode=mode)
+            if outline.get("pages_reused"):
+                print(f"♻️ Reused results for {outline['pages_reused']} unchanged pages")
+            if "error" not in outline and outline.get("complete", True):
+                self.outline_cache.put(doc_info.content_hash, outline)
+            # Timings describe this run only, so they are added after caching
+            outline = self._with_timings(outline, timer)
         
         # Save outline with same base name as PDF
-        base_name = os.path.splitext(doc_info.filename)[0]
-        outline_path = os.path.join(settings.outline_folder, f"{base_name}.json")
+        outline_path = self._outline_path(doc_info)
         
         try:
-            with open(outline_path, 'w', encoding='utf-8') as f:
-                json.dump(outline, f, indent=2, ensure_ascii=False)
+            self._write_outline(outline_path, outline)
             print(f"💾 Saved outline: {outline_path}")
             
             # Update document info
             doc_info.outline_path = outline_path
             doc_info.has_outline = True
             
+            # Heading excerpts are then served from memory without reading the PDF
+            self._prime_document_text(doc_info.filepath, text_path, outline)
+            
         except Exception as e:
             print(f"❌ Failed to write outline for {doc_info.filename}: {e}")
             doc_info.outline_path = None
             doc_info.has_outline = False
+            return doc_info
+        
+        feature_path = self._feature_path_if_enabled(doc_info)
+        if not outline.get("complete", True):
+            print(f"⏳ Partial outline ({outline.get('pages_processed')}/{outline.get('page_count')} pages), completing in background")
+            _completion_executor.submit(self._complete_outline, doc_info.filepath, outline_path, doc_info.content_hash,
+                                        feature_path, text_path, outline.get("outline_mode"))
+        elif feature_path and outline.get("extraction_path") != "bookmarks" and not self._features_current(doc_info.filepath, feature_path):
+            # Parsing every page again would double the upload time, so it runs after the response
+            _completion_executor.submit(self._write_features, doc_info.filepath, feature_path)
         
         return doc_info
+
+    @staticmethod
+    def _write_features(pdf_path: str, feature_path: str) -> None:
+        """Save the layout features of an already outlined PDF (background job)"""
+        if not os.path.exists(pdf_path):
+            return
+        from utils import write_pdf_features
+        if write_pdf_features(pdf_path, feature_path):
+            OutlineManager._drop_if_deleted(pdf_path, feature_path)
+
+    @staticmethod
+    def _drop_if_deleted(pdf_path: str, feature_path: Optional[str]) -> None:
+        # The document may have been deleted while its features were written
+        if feature_path and not os.path.exists(pdf_path) and os.path.exists(feature_path):
+            os.remove(feature_path)
+
+    @staticmethod
+    def _features_current(pdf_path: str, feature_path: str) -> bool:
+        # Features of a PDF replaced under the same name are stale
+        return os.path.exists(feature_path) and os.path.getmtime(feature_path) >= os.path.getmtime(pdf_path)
+
+    def _complete_outline(self, pdf_path: str, outline_path: str, content_hash: str, feature_path: Optional[str] = None,
+                          text_path: Optional[str] = None, mode: Optional[str] = None) -> None:
+        """Run the unbounded extraction (in the partial outline's mode, saving layout features) and replace the partial outline"""
+        try:
+            if not os.path.exists(pdf_path):
+                return
+            from utils import generate_pdf_outline
+            timer = self._new_timer()
+            outline = generate_pdf_outline(pdf_path, feature_path=feature_path, text_path=text_path, page_cache=self.page_cache,
+                                           timer=timer, mode=mode)
+            if "error" in outline:
+                print(f"❌ Background outline failed for {pdf_path}: {outline['error']}")
+                return
+            # The document may have been deleted while extraction ran
+            if not os.path.exists(pdf_path):
+                self._drop_if_deleted(pdf_path, feature_path)
+                return
+            self.outline_cache.put(content_hash, outline)
+            self._write_outline(outline_path, self._with_timings(outline, timer))
+            self._prime_document_text(pdf_path, text_path, outline)
+            print(f"💾 Completed outline: {outline_path}")
+            # Search and connection indexes were built from the partial outline
+            from .utils import DocumentUtils
+            DocumentUtils.refresh_search_indexes()
+        except Exception as e:
+            print(f"❌ Background outline failed for {pdf_path}: {e}")
+
+    def regenerate_outline(self, doc_info: DocumentInfo, mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Run a full, unbudgeted extraction and replace the saved and cached outline"""
+        os.makedirs(settings.outline_folder, exist_ok=True)
+        if not doc_info.content_hash:
+            doc_info.content_hash = OutlineCache.compute_file_hash(doc_info.filepath)
+        from utils import generate_pdf_outline
+        timer = self._new_timer()
+        outline = generate_pdf_outline(doc_info.filepath, feature_path=self._feature_path_if_enabled(doc_info),
+                                       text_path=self._text_path_if_enabled(doc_info), page_cache=self.page_cache, timer=timer,
+                                       mode=mode)
+        if "error" in outline:
+            print(f"❌ Outline failed for {doc_info.filename}: {outline['error']}")
+            return None
+        self.outline_cache.put(doc_info.content_hash, outline)
+        self._write_outline(self._outline_path(doc_info), self._with_timings(outline, timer))
+        self._prime_document_text(doc_info.filepath, self._text_path_if_enabled(doc_info), outline)
+        return outline
+
+    def saved_outline_mode(self, doc_info: DocumentInfo) -> Optional[str]:
+        """Outline mode the saved outline was extracted in (None when unknown)"""
+        outline_path = self._outline_path(doc_info)
+        if not os.path.exists(outline_path):
+            return None
+        try:
+            with open(outline_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("outline_mode")
+        except Exception as e:
+            print(f"Failed to read outline mode for {doc_info.filename}: {e}")
+            return None
+
+    def is_outline_current(self, doc_info: DocumentInfo, mode: Optional[str] = None) -> bool:
+        """True when the saved outline exists and the cache holds this engine version's outline for the PDF bytes
+        (in ``mode`` or a more thorough one)"""
+        if not os.path.exists(self._outline_path(doc_info)):
+            return False
+        if not doc_info.content_hash:
+            doc_info.content_hash = OutlineCache.compute_file_hash(doc_info.filepath)
+        return self.outline_cache.get(doc_info.content_hash, mode) is not None
+
+    def reclassify_outline(self, doc_info: DocumentInfo) -> Optional[Dict[str, Any]]:
+        """Regenerate a document's outline from its layout features with the current classifier settings.
+
+        Features are saved at ingest; a document without them (ingested before, or its
+        background write still queued) has them written here first. Outlines taken from
+        bookmarks have nothing to re-classify.
+        """
+        if not Config.PERSIST_LAYOUT_FEATURES or not os.path.exists(doc_info.filepath):
+            return None
+        saved = self.get_document_outline(doc_info)
+        if saved and saved.get("extraction_path") == "bookmarks" and Config.USE_BOOKMARKS:
+            return None
+        feature_path = self.feature_path(self._outline_path(doc_info))
+        if not self._features_current(doc_info.filepath, feature_path):
+            from utils import write_pdf_features
+            os.makedirs(settings.outline_folder, exist_ok=True)
+            if not write_pdf_features(doc_info.filepath, feature_path):
+                return None
+        from utils import reclassify_pdf_outline
+        text_path = self._text_path_if_enabled(doc_info)
+        outline = reclassify_pdf_outline(feature_path, doc_info.filepath, text_path)
+        if "error" in outline:
+            print(f"❌ Re-classification failed for {doc_info.filename}: {outline['error']}")
+            return None
+        os.makedirs(settings.outline_folder, exist_ok=True)
+        self._write_outline(self._outline_path(doc_info), outline)
+        doc_info.outline_path = self._outline_path(doc_info)
+        doc_info.has_outline = True
+        self._prime_document_text(doc_info.filepath, text_path, outline)
+        return outline
+
+    @staticmethod
+    def _new_timer():
+        if not settings.enable_timing_measurements:
+            return None
+        from outline_engine.shared_utils import StageTimer
+        return StageTimer()
+
+    @staticmethod
+    def _with_timings(outline: Dict[str, Any], timer) -> Dict[str, Any]:
+        """Copy of the outline with the run's stage breakdown under metadata.timings"""
+        if timer is None:
+            return outline
+        timings = timer.as_dict()
+        timings["outline_mode"] = outline.get("outline_mode")
+        # Pages on which the expensive page.find_tables() pass ran in this extraction
+        timings["layout_table_pages"] = timings["stages"].get("find_tables", {}).get("pages", 0)
+        slowest = sorted(timings["stages"].items(), key=lambda item: item[1]["wall_ms"], reverse=True)[:3]
+        print(f"⏱️ Outline ({timings['outline_mode']}) in {timings['total']['wall_ms']:.0f} ms; slowest stages: "
+              + ", ".join(f"{name} {stage['wall_ms']:.0f} ms" for name, stage in slowest)
+              + f"; find_tables on {timings['layout_table_pages']} pages")
+        return dict(outline, metadata=dict(outline.get("metadata") or {}, timings=timings))
+
+    @staticmethod
+    def _outline_path(doc_info: DocumentInfo) -> str:
+        base_name = os.path.splitext(doc_info.filename)[0]
+        return os.path.join(settings.outline_folder, f"{base_name}.json")
+
+    @staticmethod
+    def feature_path(outline_path: str) -> str:
+        """Layout feature file stored next to an outline JSON"""
+        return os.path.splitext(outline_path)[0] + ".features.npz"
+
+    @staticmethod
+    def text_path(outline_path: str) -> str:
+        """Document text blob (offsets in outline "sections") stored next to an outline JSON"""
+        return os.path.splitext(outline_path)[0] + ".txt"
+
+    def _feature_path_if_enabled(self, doc_info: DocumentInfo) -> Optional[str]:
+        return self.feature_path(self._outline_path(doc_info)) if Config.PERSIST_LAYOUT_FEATURES else None
+
+    def _text_path_if_enabled(self, doc_info: DocumentInfo) -> Optional[str]:
+        return self.text_path(self._outline_path(doc_info)) if Config.PERSIST_SECTION_TEXT else None
+
+    @staticmethod
+    def _prime_document_text(pdf_path: str, text_path: Optional[str], outline: Dict[str, Any]):
+        """Cache the document text with the outline's section spans (replacing those of an older outline)"""
+        if not text_path:
+            return None
+        from utils import prime_document_text
+        return prime_document_text(pdf_path, text_path, outline)
+
+    def get_section_text(self, doc_info: Optional[DocumentInfo], heading_index: int) -> Optional[str]:
+        """Body text under the heading at ``heading_index`` of the saved outline, sliced from the
+        document text blob without opening the PDF"""
+        outline = self.get_document_outline(doc_info)
+        if not outline or "sections" not in outline:
+            return None
+        sections = outline["sections"]
+        if not 0 <= heading_index < len(sections["start"]):
+            return None
+        text_path = self.text_path(doc_info.outline_path)
+        if not os.path.exists(text_path):
+            return None
+        from outline_engine.rule_engine import SectionSegmenter
+        text = SectionSegmenter.read_text(text_path)
+        # A blob written for another version of the outline has different offsets
+        if len(text) != sections["page_offsets"][-1]:
+            return None
+        return SectionSegmenter.section_text(sections, text, heading_index).strip()
+
+    @staticmethod
+    def _write_outline(outline_path: str, outline: Dict[str, Any]) -> None:
+        """Write via a temp file and rename so readers never see a half-written outline"""
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(outline_path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(outline, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, outline_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
     
     def get_document_outline(self, doc_info: Optional[DocumentInfo]) -> Optional[Dict[str, Any]]:
         """Get document outline by document info"""
@@ -54,3 +303,27 @@ class OutlineManager:
         except Exception as e:
             print(f"Failed to read outline for {doc_info.id}: {e}")
             return None
+
+    def get_indexed_outline(self, doc_info: Optional[DocumentInfo]) -> Optional[IndexedOutline]:
+        """Compact, shared in-memory form of the document outline (see OutlineIndex)"""
+        return self.outline_index.get(doc_info)
+
+    def stream_document_outline(self, doc_info: Optional[DocumentInfo]) -> Optional[Iterator[Dict[str, Any]]]:
+        """Stream outline events for a document: the saved outline when it is complete (the same
+        headings GET /outline returns), else a live extraction in the saved outline's mode"""
+        if not doc_info or not os.path.exists(doc_info.filepath):
+            return None
+
+        outline = self.get_document_outline(doc_info)
+        if outline is not None and "error" not in outline and outline.get("complete", True):
+            return self._saved_outline_events(outline)
+        from utils import stream_pdf_outline
+        return stream_pdf_outline(doc_info.filepath, outline.get("outline_mode") if outline else None)
+
+    @staticmethod
+    def _saved_outline_events(outline: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        yield {"event": "title", "title": outline.get("title")}
+        for heading in outline.get("outline", []):
+            yield {"event": "heading", **heading}
+        yield {"event": "done", "title": outline.get("title"), "outline": outline.get("outline", []),
+               "extraction_path": outline.get("extraction_path"), "outline_mode": outline.get("outline_mode")}
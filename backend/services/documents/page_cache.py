@@ -0,0 +1,54 @@
+"""
+Page result cache module keyed by per-page content hash, for incremental outline extraction.
+"""
+
+import os
+import json
+import tempfile
+from typing import Dict, Any, Optional
+from config import settings
+from outline_engine import ENGINE_VERSION
+
+
+class PageResultCache:
+    """Stores per-page extraction results so revised PDFs only re-process the pages that changed.
+
+    Entries live in <cache_folder>/<hash[:2]>/<hash>.json to keep directories small.
+    """
+
+    def __init__(self, cache_folder: str = None, engine_version: str = ENGINE_VERSION):
+        self.cache_folder = cache_folder or settings.page_cache_folder
+        self.engine_version = engine_version
+
+    def _entry_path(self, page_hash: str) -> str:
+        return os.path.join(self.cache_folder, page_hash[:2], f"{page_hash}.json")
+
+    def get(self, page_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the cached page entry, or None on a miss or an entry from another engine version"""
+        entry_path = self._entry_path(page_hash)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read cached page {page_hash[:12]}: {e}")
+            return None
+        if entry.get('engine_version') != self.engine_version:
+            return None
+        return entry.get('page')
+
+    def put(self, page_hash: str, page: Dict[str, Any]) -> None:
+        """Store a page entry atomically"""
+        entry_path = self._entry_path(page_hash)
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'engine_version': self.engine_version, 'page': page}, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, entry_path)
+        except Exception as e:
+            print(f"⚠️ Could not cache page {page_hash[:12]}: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -17,6 +17,29 @@ class DocumentUtils:
         # Prevent empty
         return name or f"document_{uuid.uuid4().hex}.pdf"
     
+    @staticmethod
+    def format_size(num_bytes: int) -> str:
+        """Human-readable size for messages, e.g. 50MB, 1.5MB, 500KB, 900 bytes"""
+        for unit, scale in (('MB', 1024 * 1024), ('KB', 1024)):
+            if num_bytes >= scale:
+                return f"{num_bytes / scale:.1f}".rstrip('0').rstrip('.') + unit
+        return f"{num_bytes} bytes"
+    
+    @staticmethod
+    def refresh_search_indexes() -> None:
+        """Rebuild the heading search index and drop the connection caches (best-effort)"""
+        try:
+            from services.search_service import search_service  # local import
+            from services.connection_service import connection_service  # local import
+            search_service._build_search_index()
+            if hasattr(connection_service, 'heading_metadata'):
+                delattr(connection_service, 'heading_metadata')
+            if hasattr(connection_service, 'document_vectors'):
+                connection_service.document_vectors = {}
+            print(f"🔄 Refreshed search indexes")
+        except Exception as e:
+            print(f"⚠️ Index refresh warning: {e}")
+    
     def ensure_unique_filename(self, filename: str) -> str:
         """Ensure filename is unique in upload folder"""
         from config import settings
@@ -28,12 +28,11 @@ class DocumentContextManager:
         
         for doc in all_documents:
             if doc.id != document_id:  # Don't duplicate the primary document
-                outline = document_service.get_document_outline(doc.id)
+                outline = document_service.get_indexed_outline(doc.id)
                 if outline:
-                    outline_items = outline.get('outline', [])
-                    for item in outline_items[:3]:  # Limit to prevent token overflow
-                        heading = item.get('text', item.get('heading', 'Unknown'))
-                        page = item.get('page', 1)
+                    for item in outline.headings[:3]:  # Limit to prevent token overflow
+                        heading = item.text or 'Unknown'
+                        page = item.page
                         additional_sections.append({
                             'pdf_name': doc.filename,
                             'heading': heading,
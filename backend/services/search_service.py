@@ -1,9 +1,10 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from config import settings
 from services.document_service import document_service
+from services.documents.outline_index import HeadingRecord
 
 class SearchService:
     def __init__(self):
@@ -16,28 +17,36 @@ class SearchService:
             token_pattern=r'\b[a-zA-Z][a-zA-Z0-9]*\b'  # Better tokenization
         )
         self.heading_vectors = None
+        # Shared HeadingRecords from the document service's outline index, not copies
         self.heading_data = []
+        self.pdf_names: Dict[str, str] = {}
     
     def _build_search_index(self):
         """Build search index from all document outlines"""
-        all_headings = []
         self.heading_data = []
+        self.pdf_names = {}
         
         for doc_id, doc_info in document_service.documents.items():
-            outline = document_service.get_document_outline(doc_id)
+            outline = document_service.get_indexed_outline(doc_id)
             if outline:
-                for item in outline.get('outline', []):
-                    all_headings.append(item['text'])
-                    self.heading_data.append({
-                        'heading': item['text'],
-                        'page': item['page'],
-                        'pdf_name': doc_info.filename,
-                        'pdf_id': doc_id,
-                        'level': item['level']
-                    })
+                self.pdf_names[outline.doc_id] = doc_info.filename
+                self.heading_data.extend(outline.headings)
         
-        if all_headings:
-            self.heading_vectors = self.vectorizer.fit_transform(all_headings)
+        if self.heading_data:
+            self.heading_vectors = self.vectorizer.fit_transform([heading.text for heading in self.heading_data])
+    
+    def _result(self, heading: HeadingRecord, relevance_score: Optional[float] = None) -> Dict[str, Any]:
+        """API form of a heading record"""
+        result = {
+            'heading': heading.text,
+            'page': heading.page,
+            'pdf_name': self.pdf_names.get(heading.doc_id),
+            'pdf_id': heading.doc_id,
+            'level': heading.level
+        }
+        if relevance_score is not None:
+            result['relevance_score'] = relevance_score
+        return result
     
     def search_headings(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search for headings across all PDFs with enhanced matching"""
@@ -53,20 +62,19 @@ class SearchService:
         
         # First, try exact substring matching for immediate results
         exact_matches = []
-        for i, heading_data in enumerate(self.heading_data):
-            heading_lower = heading_data['heading'].lower()
+        for heading in self.heading_data:
+            heading_lower = heading.text.lower()
             if query_lower in heading_lower:
-                match_result = heading_data.copy()
                 # Calculate relevance based on position and length
                 if heading_lower.startswith(query_lower):
-                    match_result['relevance_score'] = 0.95  # High score for prefix match
+                    relevance_score = 0.95  # High score for prefix match
                 elif heading_lower == query_lower:
-                    match_result['relevance_score'] = 1.0   # Perfect match
+                    relevance_score = 1.0   # Perfect match
                 else:
                     # Partial match score based on query coverage
                     coverage = len(query_lower) / len(heading_lower)
-                    match_result['relevance_score'] = 0.8 + (coverage * 0.15)
-                exact_matches.append(match_result)
+                    relevance_score = 0.8 + (coverage * 0.15)
+                exact_matches.append(self._result(heading, relevance_score))
         
         # Sort exact matches by relevance
         exact_matches.sort(key=lambda x: x['relevance_score'], reverse=True)
@@ -83,15 +91,12 @@ class SearchService:
         top_indices = np.argsort(similarities)[-limit*2:][::-1]  # Get more candidates
         
         semantic_results = []
-        exact_match_indices = {i for i, _ in enumerate(self.heading_data) 
-                              if any(em['heading'] == self.heading_data[i]['heading'] 
-                                   for em in exact_matches)}
+        exact_match_headings = {em['heading'] for em in exact_matches}
         
         for idx in top_indices:
-            if similarities[idx] > 0.05 and idx not in exact_match_indices:  # Lower threshold for semantic
-                result = self.heading_data[idx].copy()
-                result['relevance_score'] = float(similarities[idx])
-                semantic_results.append(result)
+            heading = self.heading_data[idx]
+            if similarities[idx] > 0.05 and heading.text not in exact_match_headings:  # Lower threshold for semantic
+                semantic_results.append(self._result(heading, float(similarities[idx])))
         
         # Combine results: exact matches first, then semantic matches
         combined_results = exact_matches + semantic_results
@@ -114,7 +119,7 @@ class SearchService:
         if not self.heading_data:
             self._build_search_index()
         
-        return [h for h in self.heading_data if h['level'] == level]
+        return [self._result(h) for h in self.heading_data if h.level == level]
 
 # Create singleton instance
 search_service = SearchService()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Shared test fixtures: generated PDFs and an isolated working folder.
+
+Run from backend/:
+    python -m pytest -q
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional
+
+import fitz
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.synthetic_corpus import CorpusSpec, generate_document  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Small documents covering fonts, tables, a TOC page and running headers; the
+# outlines in data/baseline_outlines.json were extracted from these
+CORPUS_SPECS = [
+    CorpusSpec('plain_sans', pages=6, headings_per_page=3, running_header=False, seed=11),
+    CorpusSpec('serif_tables', pages=12, headings_per_page=2, table_every=3, font='serif', running_header=False, seed=12),
+    CorpusSpec('toc_mono', pages=14, headings_per_page=1.5, toc=True, font='mono', running_header=False, seed=13),
+    CorpusSpec('sans_long', pages=30, headings_per_page=1.5, table_every=4, running_header=False, seed=14),
+    CorpusSpec('with_headers', pages=12, headings_per_page=2, seed=15),
+]
+
+
+class DictPageCache:
+    """In-memory page cache with the PageResultCache interface, counting hits and misses"""
+
+    def __init__(self):
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, page_hash: str) -> Optional[Dict]:
+        entry = self.entries.get(page_hash)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, page_hash: str, entry: Dict) -> None:
+        self.entries[page_hash] = entry
+
+
+def make_xobject_pdf(path: str, headings: List[str]) -> str:
+    """One heading and a body line per page, each page drawn through a Form XObject
+    (the page contents are only "q /fzFrm0 Do Q", as show_pdf_page writes them)"""
+    source = fitz.open()
+    for heading in headings:
+        page = source.new_page()
+        page.insert_text((72, 100), heading, fontsize=20, fontname='hebo')
+        for line in range(6):
+            page.insert_text((72, 150 + 14 * line), "Body text of the section, set in the regular size.", fontsize=10)
+    wrapped = fitz.open()
+    for page_num in range(len(source)):
+        page = wrapped.new_page()
+        page.show_pdf_page(page.rect, source, page_num)
+    wrapped.save(path)
+    wrapped.close()
+    source.close()
+    return path
+
+
+@pytest.fixture(scope='session')
+def corpus(tmp_path_factory) -> Dict[str, str]:
+    """Spec name -> path of the generated PDF (generation is seeded, so the bytes are stable)"""
+    folder = tmp_path_factory.mktemp('corpus')
+    paths = {}
+    for spec in CORPUS_SPECS:
+        paths[spec.name] = str(folder / f"{spec.name}.pdf")
+        generate_document(paths[spec.name], spec)
+    return paths
+
+
+def outline_of(result: Dict) -> Dict:
+    """The part of an extraction result the equivalence tests compare"""
+    return {'title': result['title'], 'outline': result['outline']}
+
+
+@pytest.fixture(autouse=True)
+def working_dir(tmp_path, monkeypatch):
+    # settings folders are relative ("storage/..."), so each test gets its own
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def engine():
+    from outline_engine.rule_engine import SmartRuleEngine
+    return SmartRuleEngine()
@@ -0,0 +1,88 @@
+"""Hits and misses of the outline cache, the page result cache and incremental extraction."""
+
+import fitz
+import pytest
+
+from config import Config
+from services.documents.outline_cache import OutlineCache
+from services.documents.page_cache import PageResultCache
+from conftest import DictPageCache, outline_of
+
+OUTLINE = {'title': 'Annual Report', 'outline': [{'level': 'H1', 'text': '1. Scope', 'page': 1}]}
+
+
+@pytest.fixture
+def serial(monkeypatch):
+    monkeypatch.setattr(Config, 'ENABLE_PARALLEL', False)
+
+
+def test_outline_cache_round_trip(tmp_path):
+    cache = OutlineCache(str(tmp_path / 'outlines'), engine_version='1.0')
+    assert cache.get('abc') is None
+    cache.put('abc', dict(OUTLINE, outline_mode='thorough'))
+    assert cache.get('abc')['outline'] == OUTLINE['outline']
+    assert cache.get('def') is None
+
+
+def test_outline_cache_misses_other_engine_version(tmp_path):
+    OutlineCache(str(tmp_path / 'outlines'), engine_version='1.0').put('abc', dict(OUTLINE, outline_mode='thorough'))
+    assert OutlineCache(str(tmp_path / 'outlines'), engine_version='2.0').get('abc') is None
+
+
+def test_outline_cache_serves_only_as_thorough_modes(tmp_path):
+    cache = OutlineCache(str(tmp_path / 'outlines'), engine_version='1.0')
+    cache.put('abc', dict(OUTLINE, outline_mode='fast'))
+    assert cache.get('abc', 'fast')['outline_mode'] == 'fast'
+    assert cache.get('abc', 'thorough') is None
+    cache.put('abc', dict(OUTLINE, outline_mode='thorough'))
+    assert cache.get('abc', 'balanced')['outline_mode'] == 'thorough'
+
+
+def test_outline_cache_key_is_file_content(corpus, tmp_path):
+    copy = tmp_path / 'renamed.pdf'
+    copy.write_bytes(open(corpus['plain_sans'], 'rb').read())
+    assert OutlineCache.compute_file_hash(str(copy)) == OutlineCache.compute_file_hash(corpus['plain_sans'])
+    assert OutlineCache.compute_file_hash(str(copy)) != OutlineCache.compute_file_hash(corpus['toc_mono'])
+
+
+def test_page_cache_round_trip(tmp_path):
+    cache = PageResultCache(str(tmp_path / 'pages'), engine_version='1.0')
+    assert cache.get('ab12') is None
+    cache.put('ab12', {'headings': []})
+    assert cache.get('ab12') == {'headings': []}
+    assert PageResultCache(str(tmp_path / 'pages'), engine_version='2.0').get('ab12') is None
+
+
+def test_warm_page_cache_reuses_every_page(corpus, engine, serial):
+    path = corpus['serif_tables']
+    expected = outline_of(engine.extract(path))
+    with fitz.open(path) as doc:
+        page_count = len(doc)
+    cache = DictPageCache()
+
+    cold = engine.extract(path, page_cache=cache)
+    assert outline_of(cold) == expected
+    assert cold['pages_reused'] == 0
+    assert cache.hits == 0 and cache.entries
+
+    warm = engine.extract(path, page_cache=cache)
+    assert outline_of(warm) == expected
+    assert warm['pages_reused'] == page_count
+    assert cache.misses == page_count
+
+
+def test_revised_page_misses_the_page_cache(corpus, engine, serial, tmp_path):
+    revised = str(tmp_path / 'revised.pdf')
+    with fitz.open(corpus['plain_sans']) as doc:
+        doc[3].insert_text((72, 800), "Revised paragraph added after review.", fontsize=10)
+        doc.save(revised)
+        page_count = len(doc)
+    expected = outline_of(engine.extract(revised))
+    cache = DictPageCache()
+    engine.extract(corpus['plain_sans'], page_cache=cache)
+    cache.hits = cache.misses = 0
+
+    result = engine.extract(revised, page_cache=cache)
+    assert outline_of(result) == expected
+    assert result['pages_reused'] == page_count - 1
+    assert cache.misses == 1
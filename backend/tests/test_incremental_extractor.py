@@ -0,0 +1,27 @@
+"""Incremental extraction must match a full extraction, including across documents."""
+
+import fitz
+
+from outline_engine.rule_engine.incremental_extractor import IncrementalExtractor
+from conftest import DictPageCache, make_xobject_pdf
+
+
+def test_xobject_pages_hash_by_their_text(tmp_path):
+    a = make_xobject_pdf(str(tmp_path / 'a.pdf'), ['3. Budget Policy'])
+    b = make_xobject_pdf(str(tmp_path / 'b.pdf'), ['3. Travel Policy'])
+    with fitz.open(a) as doc_a, fitz.open(b) as doc_b:
+        assert doc_a[0].read_contents() == doc_b[0].read_contents()
+        assert IncrementalExtractor.page_hash(doc_a[0]) != IncrementalExtractor.page_hash(doc_b[0])
+
+
+def test_shared_cache_does_not_leak_xobject_pages(tmp_path, engine):
+    a = make_xobject_pdf(str(tmp_path / 'a.pdf'), ['1. Introduction', '2. Scope', '3. Budget Policy'])
+    b = make_xobject_pdf(str(tmp_path / 'b.pdf'), ['1. Introduction', '2. Scope', '3. Travel Policy'])
+    expected = engine.extract(b)
+    assert any(heading['text'] == '3. Travel Policy' for heading in expected['outline'])
+
+    cache = DictPageCache()
+    engine.extract(a, page_cache=cache)
+    result = engine.extract(b, page_cache=cache)
+    assert result['outline'] == expected['outline']
+    assert result['title'] == expected['title']
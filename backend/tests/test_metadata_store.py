@@ -0,0 +1,108 @@
+"""The SQLite document metadata store and its migration from documents_index.json."""
+
+import json
+import os
+import threading
+
+import pytest
+
+from services.documents.index_manager import IndexManager
+from services.documents.metadata_store import DocumentMetadataStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentMetadataStore(str(tmp_path / 'documents.db'))
+    yield store
+    store.close()
+
+
+def add_pdfs(*filenames):
+    os.makedirs('storage/pdfs', exist_ok=True)
+    for filename in filenames:
+        with open(os.path.join('storage/pdfs', filename), 'wb') as f:
+            f.write(b'%PDF-1.4\n')
+
+
+def test_upsert_update_remove(store):
+    store.upsert({'id': 'a', 'filename': 'a.pdf', 'page_count': 3})
+    store.upsert_many([{'id': 'b', 'filename': 'b.pdf'}, {'id': 'c', 'filename': 'c.pdf'}])
+    assert store.count() == 3
+
+    store.update('a', page_count=5, engine_version='2.0', unknown='ignored')
+    record = store.get_by_filename('a.pdf')
+    assert (record['id'], record['page_count'], record['engine_version']) == ('a', 5, '2.0')
+
+    assert store.remove('b')
+    assert not store.remove('b')
+    assert store.id_filename_map() == {'a': 'a.pdf', 'c': 'c.pdf'}
+    assert store.get_by_filename('b.pdf') is None
+
+
+def test_one_row_per_filename(store):
+    store.upsert({'id': 'a', 'filename': 'a.pdf'})
+    store.upsert({'id': 'b', 'filename': 'a.pdf'})
+    assert store.id_filename_map() == {'b': 'a.pdf'}
+
+
+def test_transaction_rolls_back_every_write(store):
+    store.upsert({'id': 'a', 'filename': 'a.pdf'})
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.upsert({'id': 'b', 'filename': 'b.pdf'})
+            store.remove('a')
+            raise RuntimeError("interrupted")
+    assert store.id_filename_map() == {'a': 'a.pdf'}
+
+
+def test_wal_readers_see_committed_rows(store):
+    store.upsert({'id': 'a', 'filename': 'a.pdf'})
+    assert store._connection().execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(store.count()))
+    thread.start()
+    thread.join()
+    assert seen == [1]
+
+
+@pytest.mark.parametrize('legacy', [
+    {'id-a': 'a.pdf', 'id-b': 'b.pdf', 'id-gone': 'gone.pdf'},
+    [{'id': 'id-a', 'filename': 'a.pdf'}, {'id': 'id-b', 'filename': 'b.pdf'}, {'id': 'id-gone', 'filename': 'gone.pdf'}],
+])
+def test_legacy_index_is_imported_once(legacy):
+    add_pdfs('a.pdf', 'b.pdf', 'new.pdf')
+    with open('documents_index.json', 'w', encoding='utf-8') as f:
+        json.dump(legacy, f)
+
+    index = IndexManager('storage/documents.db', 'documents_index.json')
+    index.rebuild_index_from_files()
+    id_map = index.get_id_filename_map()
+    assert id_map['id-a'] == 'a.pdf' and id_map['id-b'] == 'b.pdf'
+    assert 'id-gone' not in id_map
+    assert sorted(id_map.values()) == ['a.pdf', 'b.pdf', 'new.pdf']
+    assert not os.path.exists('documents_index.json')
+    assert os.path.exists('documents_index.json.migrated')
+
+    # An emptied library does not bring the legacy IDs back
+    for filename in os.listdir('storage/pdfs'):
+        os.remove(os.path.join('storage/pdfs', filename))
+    index.rebuild_index_from_files()
+    add_pdfs('a.pdf')
+    index.rebuild_index_from_files()
+    assert 'id-a' not in index.get_id_filename_map()
+
+
+def test_rebuild_keeps_ids_and_drops_stale_rows():
+    add_pdfs('a.pdf', 'b.pdf')
+    index = IndexManager('storage/documents.db')
+    index.rebuild_index_from_files()
+    ids = {filename: doc_id for doc_id, filename in index.get_id_filename_map().items()}
+
+    os.remove('storage/pdfs/b.pdf')
+    add_pdfs('c.pdf')
+    index.rebuild_index_from_files()
+    id_map = index.get_id_filename_map()
+    assert sorted(id_map.values()) == ['a.pdf', 'c.pdf']
+    assert id_map[ids['a.pdf']] == 'a.pdf'
+    assert index.find_by_filename('a.pdf')['id'] == ids['a.pdf']
+    assert index.find_by_filename('b.pdf') is None
@@ -0,0 +1,77 @@
+"""Outlines of the optimized engine must match the original one.
+
+data/baseline_outlines.json holds the title and outline the engine extracted from
+the CORPUS_SPECS documents at the baseline commit (f04f439, before the performance
+work), run serially. Every execution path below must still produce exactly those.
+"""
+
+import json
+import os
+
+import pytest
+
+from config import Config
+from outline_engine.rule_engine.page_prefetcher import PagePrefetcher
+from conftest import CORPUS_SPECS, DATA_DIR, outline_of
+
+NAMES = [spec.name for spec in CORPUS_SPECS]
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    with open(os.path.join(DATA_DIR, 'baseline_outlines.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def serial(monkeypatch):
+    monkeypatch.setattr(Config, 'ENABLE_PARALLEL', False)
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_serial_matches_baseline(name, corpus, baseline, engine, serial):
+    assert outline_of(engine.extract(corpus[name])) == baseline[f"{name}.pdf"]
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_parallel_matches_baseline(name, corpus, baseline, engine, monkeypatch):
+    monkeypatch.setattr(Config, 'ENABLE_PARALLEL', True)
+    monkeypatch.setattr(Config, 'MAX_WORKERS', 2)
+    monkeypatch.setattr(Config, 'PARALLEL_THRESHOLD', 1)
+    prefetcher = PagePrefetcher(workers=2, chunk_pages=4)
+    parsed = []
+    prefetch = prefetcher.prefetch
+    monkeypatch.setattr(prefetcher, 'prefetch', lambda *args, **kwargs: parsed.append(prefetch(*args, **kwargs)) or parsed[-1])
+    engine.page_prefetcher = prefetcher
+    assert outline_of(engine.extract(corpus[name])) == baseline[f"{name}.pdf"]
+    assert sum(parsed) > 0
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_low_memory_matches_baseline(name, corpus, baseline, engine, serial, monkeypatch):
+    monkeypatch.setattr(Config, 'LOW_MEMORY_WINDOW', 2)
+    result = engine.extract(corpus[name], low_memory=True)
+    assert outline_of(result) == baseline[f"{name}.pdf"]
+    assert 'peak_memory_mb' in result
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_reclassify_from_features_matches_baseline(name, corpus, baseline, engine, serial, tmp_path):
+    feature_path = str(tmp_path / f"{name}.features.npz")
+    engine.extract(corpus[name], feature_path=feature_path)
+    assert os.path.exists(feature_path)
+    assert outline_of(engine.extract_from_features(feature_path)) == baseline[f"{name}.pdf"]
+
+
+def test_generous_budget_matches_baseline(corpus, baseline, engine, serial):
+    result = engine.extract(corpus['sans_long'], time_budget=600, max_pages=1000)
+    assert result['complete']
+    assert outline_of(result) == baseline['sans_long.pdf']
+
+
+def test_page_budget_returns_partial_outline(corpus, baseline, engine, serial):
+    result = engine.extract(corpus['sans_long'], max_pages=5)
+    assert not result['complete']
+    assert result['pages_processed'] == 5
+    assert all(heading['page'] <= 5 for heading in result['outline'])
+    assert result['outline'] == [heading for heading in baseline['sans_long.pdf']['outline'] if heading['page'] <= 5]
@@ -1,7 +1,7 @@
 from .llm_client import chat_with_llm, generate_snippet_summary, generate_insights, generate_podcast_script
 from .core_llm import get_llm_client
 from .tts_client import generate_audio, create_podcast_audio
-from .pdf_utils import extract_pdf_info, extract_text_around_heading, get_page_text, generate_pdf_outline
+from .pdf_utils import extract_pdf_info, extract_text_around_heading, get_page_text, generate_pdf_outline, stream_pdf_outline, reclassify_pdf_outline, write_pdf_features, write_pdf_text, get_document_pool, get_page_text_cache, get_document_text, prime_document_text
 
 __all__ = [
     "chat_with_llm",
@@ -14,5 +14,13 @@ __all__ = [
     "extract_pdf_info",
     "extract_text_around_heading",
     "get_page_text",
-    "generate_pdf_outline"
+    "generate_pdf_outline",
+    "stream_pdf_outline",
+    "reclassify_pdf_outline",
+    "write_pdf_features",
+    "write_pdf_text",
+    "get_document_pool",
+    "get_page_text_cache",
+    "get_document_text",
+    "prime_document_text"
 ]
\ No newline at end of file
@@ -0,0 +1,82 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+import fitz  # PyMuPDF
+
+
+class DocumentPool:
+    """LRU pool of open fitz.Document handles keyed by (path, mtime).
+
+    A checked-out handle is used by one thread at a time (PyMuPDF documents are not
+    thread-safe): checkout takes it out of the pool and returns it afterwards. Callers
+    asking for a document that is already checked out get a fresh handle (a miss).
+    A file rewritten in place gets a new mtime and therefore a new handle.
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._handles: "OrderedDict[Tuple[str, int], fitz.Document]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(pdf_path: str) -> Tuple[str, int]:
+        return os.path.abspath(pdf_path), os.stat(pdf_path).st_mtime_ns
+
+    @contextmanager
+    def checkout(self, pdf_path: str) -> Iterator[fitz.Document]:
+        key = self._key(pdf_path)
+        with self._lock:
+            doc = self._handles.pop(key, None)
+            if doc is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                # Handles of an older version of the file are no use any more
+                self._close_matching(lambda other: other[0] == key[0])
+        if doc is None:
+            doc = fitz.open(pdf_path)
+        try:
+            yield doc
+        finally:
+            self._checkin(key, doc)
+
+    def _checkin(self, key: Tuple[str, int], doc: fitz.Document) -> None:
+        try:
+            current = self._key(key[0])
+        except OSError:
+            current = None  # deleted while checked out
+        with self._lock:
+            if current != key or key in self._handles or self.max_size <= 0:
+                doc.close()
+                return
+            self._handles[key] = doc
+            while len(self._handles) > self.max_size:
+                _, oldest = self._handles.popitem(last=False)
+                oldest.close()
+                self.evictions += 1
+
+    def _close_matching(self, predicate) -> None:
+        # Caller holds the lock
+        for key in [key for key in self._handles if predicate(key)]:
+            self._handles.pop(key).close()
+            self.evictions += 1
+
+    def evict(self, pdf_path: str) -> None:
+        """Close pooled handles of a file, e.g. before it is deleted"""
+        path = os.path.abspath(pdf_path)
+        with self._lock:
+            self._close_matching(lambda key: key[0] == path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._close_matching(lambda key: True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"open": len(self._handles), "max_size": self.max_size, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
@@ -13,14 +13,14 @@ def get_all_pdf_outlines() -> List[Dict[str, Any]]:
         documents = document_service.get_all_documents()
         
         for doc in documents:
-            outline = document_service.get_document_outline(doc.id)
+            outline = document_service.get_indexed_outline(doc.id)
             if outline:
-                # Format outline for LLM context
+                # Format outline for LLM context; headings go out as plain dicts, not the shared records
                 formatted_outline = {
                     "pdf_name": doc.filename,
                     "document_id": doc.id,
-                    "outline": outline.get('outline', []),
-                    "summary": outline.get('summary', outline.get('title', 'No summary available'))
+                    "outline": [heading.to_dict() for heading in outline.headings],
+                    "summary": outline.description
                 }
                 outlines.append(formatted_outline)
         
@@ -35,6 +35,7 @@ def format_outlines_for_context(outlines: List[Dict[str, Any]]) -> str:
     """Format PDF outlines for inclusion in LLM prompts"""
     if not outlines:
         return "No PDF documents have been uploaded yet."
+    from services.documents.outline_index import HeadingRecord
     
     context_parts = []
     context_parts.append("AVAILABLE DOCUMENTS AND THEIR STRUCTURE:")
@@ -47,23 +48,8 @@ def format_outlines_for_context(outlines: List[Dict[str, Any]]) -> str:
         outline_items = outline.get('outline', [])
         if outline_items:
             context_parts.append("Document Structure:")
-            for i, item in enumerate(outline_items):
-                if i >= 10:  # Limit to first 10 items to conserve tokens
-                    break
-                level = item.get('level', 'H1')
-                heading = item.get('text', item.get('heading', 'Unknown'))  # Try 'text' first, then 'heading'
-                try:
-                    # Handle both numeric and string levels
-                    if isinstance(level, str):
-                        if level.lower().startswith('h'):
-                            level_num = int(level[1:]) if level[1:].isdigit() else 1
-                        else:
-                            level_num = 1
-                    else:
-                        level_num = int(level) if level else 1
-                    indent = "  " * max(0, level_num - 1)
-                except (ValueError, TypeError):
-                    indent = ""
-                context_parts.append(f"{indent}- {heading}")
+            for item in outline_items[:10]:  # Limit to first 10 items to conserve tokens
+                indent = "  " * max(0, HeadingRecord.parse_level(item.get('level', 'H1')) - 1)
+                context_parts.append(f"{indent}- {item.get('text', item.get('heading')) or 'Unknown'}")
     
     return "\n".join(context_parts)
@@ -0,0 +1,133 @@
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class DocumentText:
+    """Text of every page of one document, held as one string with page offsets.
+
+    With the outline's section spans (see index_sections), excerpts start at the stored
+    heading position and stop at the end of its section. Other headings are located
+    once per (page, heading) and the offset is remembered, so repeated excerpts around
+    the same heading are plain slices.
+    """
+
+    def __init__(self, text: str, page_offsets: List[int]):
+        self.text = text
+        self.page_offsets = page_offsets
+        self.sections: Optional[Dict] = None
+        self._section_index: Dict[Tuple[int, str], int] = {}
+        self._lower_pages: Dict[int, str] = {}
+        self._heading_offsets: Dict[Tuple[int, str], int] = {}
+
+    @classmethod
+    def from_pages(cls, page_texts: Iterable[str]) -> 'DocumentText':
+        page_texts = list(page_texts)
+        page_offsets = [0]
+        for text in page_texts:
+            page_offsets.append(page_offsets[-1] + len(text))
+        return cls(''.join(page_texts), page_offsets)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_offsets) - 1
+
+    def page_text(self, page_number: int) -> str:
+        """Text of a 1-based page ('' when out of range)"""
+        if not 1 <= page_number <= self.page_count:
+            return ""
+        return self.text[self.page_offsets[page_number - 1]:self.page_offsets[page_number]]
+
+    def heading_offset(self, page_number: int, heading_text: str) -> int:
+        """Offset of the heading within its page text (case-insensitive), -1 if absent"""
+        key = (page_number, heading_text.lower())
+        offset = self._heading_offsets.get(key)
+        if offset is None:
+            lower_page = self._lower_pages.get(page_number)
+            if lower_page is None:
+                lower_page = self._lower_pages[page_number] = self.page_text(page_number).lower()
+            offset = self._heading_offsets[key] = lower_page.find(key[1])
+        return offset
+
+    def index_sections(self, outline: List[Dict], sections: Dict) -> None:
+        """Use the outline's section spans (SectionSegmenter offsets into this text) for its headings"""
+        self.sections = sections
+        self._section_index = {}
+        for index, heading in enumerate(outline):
+            if heading.get('text') and sections['heading_start'][index] >= 0:
+                self._section_index.setdefault((heading.get('page', 1), heading['text'].lower()), index)
+
+    def excerpt(self, page_number: int, heading_text: str, context_size: int = 500, before: int = 100) -> str:
+        """Text from ``before`` characters ahead of the heading (within its page) to ``context_size``
+        after it, cut at the end of the heading's section when section spans are known"""
+        index = self._section_index.get((page_number, heading_text.lower()))
+        if index is not None:
+            heading_start = self.sections['heading_start'][index]
+            page_start = self.page_offsets[bisect_right(self.page_offsets, heading_start) - 1]
+            start = max(page_start, heading_start - before)
+            end = min(self.sections['end'][index], self.sections['start'][index] + context_size)
+            return self.text[start:end].strip()
+        if not 1 <= page_number <= self.page_count:
+            return ""
+        offset = self.heading_offset(page_number, heading_text)
+        if offset == -1:
+            return ""
+        page_start, page_end = self.page_offsets[page_number - 1], self.page_offsets[page_number]
+        start = page_start + max(0, offset - before)
+        end = min(page_end, page_start + offset + len(heading_text) + context_size)
+        return self.text[start:end].strip()
+
+
+class PageTextCache:
+    """LRU cache of DocumentText keyed by (path, mtime); a rewritten file is re-read."""
+
+    def __init__(self, max_documents: int = 16):
+        self.max_documents = max_documents
+        self._documents: "OrderedDict[Tuple[str, int], DocumentText]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(pdf_path: str) -> Tuple[str, int]:
+        return os.path.abspath(pdf_path), os.stat(pdf_path).st_mtime_ns
+
+    def get(self, pdf_path: str, loader) -> DocumentText:
+        """Cached text of ``pdf_path``; ``loader()`` returns the page texts on a miss"""
+        key = self._key(pdf_path)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                self.hits += 1
+                return document
+            self.misses += 1
+        document = DocumentText.from_pages(loader())
+        self._store(key, document)
+        return document
+
+    def prime(self, pdf_path: str, document: DocumentText) -> None:
+        """Register text that is already at hand (e.g. the text blob written at ingest)"""
+        self._store(self._key(pdf_path), document)
+
+    def _store(self, key: Tuple[str, int], document: DocumentText) -> None:
+        with self._lock:
+            # Older versions of the same file are dropped
+            for stale in [other for other in self._documents if other[0] == key[0] and other != key]:
+                del self._documents[stale]
+            self._documents[key] = document
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def evict(self, pdf_path: str) -> None:
+        path = os.path.abspath(pdf_path)
+        with self._lock:
+            for key in [key for key in self._documents if key[0] == path]:
+                del self._documents[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"documents": len(self._documents), "max_documents": self.max_documents,
+                    "hits": self.hits, "misses": self.misses}
@@ -1,48 +1,75 @@
 import fitz  # PyMuPDF
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 import json
 from outline_engine.rule_engine import SmartRuleEngine
+from .document_pool import DocumentPool
+from .page_text_cache import PageTextCache, DocumentText
 
 _outline_engine_instance: Optional[SmartRuleEngine] = None
+_document_pool: Optional[DocumentPool] = None
+_page_text_cache: Optional[PageTextCache] = None
+
+def get_document_pool() -> DocumentPool:
+    """Shared pool of open PDF handles used for page text access"""
+    global _document_pool
+    if _document_pool is None:
+        from config import settings
+        _document_pool = DocumentPool(settings.document_pool_size)
+    return _document_pool
+
+def get_page_text_cache() -> PageTextCache:
+    """Shared cache of whole-document page text used for heading excerpts"""
+    global _page_text_cache
+    if _page_text_cache is None:
+        from config import settings
+        _page_text_cache = PageTextCache(settings.page_text_cache_size)
+    return _page_text_cache
+
+def get_document_text(pdf_path: str) -> DocumentText:
+    """Page text of the whole document, read once and cached until the file changes"""
+    def load_pages() -> List[str]:
+        with get_document_pool().checkout(pdf_path) as pdf_document:
+            return [page.get_text() for page in pdf_document]
+    return get_page_text_cache().get(pdf_path, load_pages)
+
+def prime_document_text(pdf_path: str, text_path: str, outline: Dict[str, Any]) -> Optional[DocumentText]:
+    """Cache page text from the text blob written at ingest, with the outline's section spans.
+    Only done when the blob holds every page's text (no skipped image-only pages)."""
+    sections = outline.get("sections")
+    if not sections or outline.get("skipped_pages") or not os.path.exists(text_path):
+        return None
+    try:
+        from outline_engine.rule_engine import SectionSegmenter
+        document = DocumentText(SectionSegmenter.read_text(text_path), sections["page_offsets"])
+        if document.page_offsets[-1] != len(document.text):
+            return None
+        document.index_sections(outline.get("outline", []), sections)
+        get_page_text_cache().prime(pdf_path, document)
+        return document
+    except Exception as e:
+        print(f"Error caching document text: {str(e)}")
+        return None
 
 def extract_pdf_info(pdf_path: str) -> Dict[str, Any]:
     """Extract basic information from PDF"""
     try:
-        pdf_document = fitz.open(pdf_path)
-        info = {
-            "page_count": len(pdf_document),
-            "title": pdf_document.metadata.get("title", os.path.basename(pdf_path)),
-            "author": pdf_document.metadata.get("author", "Unknown"),
-            "subject": pdf_document.metadata.get("subject", ""),
-            "keywords": pdf_document.metadata.get("keywords", ""),
-        }
-        pdf_document.close()
-        return info
+        with get_document_pool().checkout(pdf_path) as pdf_document:
+            return {
+                "page_count": len(pdf_document),
+                "title": pdf_document.metadata.get("title", os.path.basename(pdf_path)),
+                "author": pdf_document.metadata.get("author", "Unknown"),
+                "subject": pdf_document.metadata.get("subject", ""),
+                "keywords": pdf_document.metadata.get("keywords", ""),
+            }
     except Exception as e:
         print(f"Error extracting PDF info: {str(e)}")
         return {"page_count": 0, "title": os.path.basename(pdf_path)}
 
 def extract_text_around_heading(pdf_path: str, page_number: int, heading_text: str, context_size: int = 500) -> str:
-    """Extract text around a specific heading in a PDF"""
+    """Extract text around a specific heading in a PDF (cached page text; section spans when the outline has them)"""
     try:
-        pdf_document = fitz.open(pdf_path)
-        if page_number <= len(pdf_document):
-            page = pdf_document[page_number - 1]  # Convert to 0-based index
-            text = page.get_text()
-            
-            # Find the heading in the text
-            heading_index = text.lower().find(heading_text.lower())
-            if heading_index != -1:
-                # Extract context around the heading
-                start = max(0, heading_index - 100)
-                end = min(len(text), heading_index + len(heading_text) + context_size)
-                context_text = text[start:end]
-                pdf_document.close()
-                return context_text.strip()
-        
-        pdf_document.close()
-        return ""
+        return get_document_text(pdf_path).excerpt(page_number, heading_text, context_size)
     except Exception as e:
         print(f"Error extracting text around heading: {str(e)}")
         return ""
@@ -50,25 +77,75 @@ def extract_text_around_heading(pdf_path: str, page_number: int, heading_text: s
 def get_page_text(pdf_path: str, page_number: int) -> str:
     """Get full text from a specific page"""
     try:
-        pdf_document = fitz.open(pdf_path)
-        if page_number <= len(pdf_document):
-            page = pdf_document[page_number - 1]
-            text = page.get_text()
-            pdf_document.close()
-            return text
-        pdf_document.close()
+        with get_document_pool().checkout(pdf_path) as pdf_document:
+            if page_number <= len(pdf_document):
+                return pdf_document[page_number - 1].get_text()
         return ""
     except Exception as e:
         print(f"Error getting page text: {str(e)}")
         return ""
 
-def generate_pdf_outline(pdf_path: str) -> Dict[str, Any]:
-    """Generate outline using imported Round 1A SmartRuleEngine logic."""
+def generate_pdf_outline(pdf_path: str, time_budget: Optional[float] = None, max_pages: Optional[int] = None,
+                         feature_path: Optional[str] = None, text_path: Optional[str] = None, page_cache=None,
+                         timer=None, mode: Optional[str] = None) -> Dict[str, Any]:
+    """Generate outline using imported Round 1A SmartRuleEngine logic.
+    With a time/page budget the result may be partial ("complete": False).
+    With feature_path, the parsed layout is saved for reclassify_pdf_outline.
+    With text_path, the document text is saved and the outline gains "sections".
+    With page_cache, pages already seen in earlier uploads are not re-processed.
+    With timer (a StageTimer), per-stage wall/CPU time and page counts are recorded on it.
+    mode ("fast", "balanced" or "thorough") trades outline fidelity for speed; see OutlineMode."""
     global _outline_engine_instance
     if _outline_engine_instance is None:
         _outline_engine_instance = SmartRuleEngine()
     try:
-        return _outline_engine_instance.extract(pdf_path)
+        return _outline_engine_instance.extract(pdf_path, time_budget=time_budget, max_pages=max_pages,
+                                                feature_path=feature_path, text_path=text_path, page_cache=page_cache, timer=timer,
+                                                mode=mode)
     except Exception as e:
         # Fallback to minimal structure if extraction fails
-        return {"title": os.path.basename(pdf_path), "outline": []}
\ No newline at end of file
+        return {"title": os.path.basename(pdf_path), "outline": [], "error": str(e)}
+
+def reclassify_pdf_outline(feature_path: str, pdf_path: Optional[str] = None, text_path: Optional[str] = None) -> Dict[str, Any]:
+    """Re-run outline classification from a saved layout feature file (no PDF parsing)."""
+    global _outline_engine_instance
+    if _outline_engine_instance is None:
+        _outline_engine_instance = SmartRuleEngine()
+    try:
+        return _outline_engine_instance.extract_from_features(feature_path, pdf_path, text_path)
+    except Exception as e:
+        return {"title": os.path.basename(pdf_path or feature_path), "outline": [], "error": str(e)}
+
+def write_pdf_features(pdf_path: str, feature_path: str) -> bool:
+    """Write the layout feature file that reclassify_pdf_outline reads."""
+    global _outline_engine_instance
+    if _outline_engine_instance is None:
+        _outline_engine_instance = SmartRuleEngine()
+    try:
+        _outline_engine_instance.write_layout_features(pdf_path, feature_path)
+        return True
+    except Exception as e:
+        print(f"Error writing layout features: {str(e)}")
+        return False
+
+def write_pdf_text(pdf_path: str, text_path: str) -> bool:
+    """Write the document text blob that outline "sections" offsets refer to."""
+    global _outline_engine_instance
+    if _outline_engine_instance is None:
+        _outline_engine_instance = SmartRuleEngine()
+    try:
+        _outline_engine_instance.write_document_text(pdf_path, text_path)
+        return True
+    except Exception as e:
+        print(f"Error writing document text: {str(e)}")
+        return False
+
+def stream_pdf_outline(pdf_path: str, mode: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield outline events (title, heading..., done) while the outline is extracted in ``mode``."""
+    global _outline_engine_instance
+    if _outline_engine_instance is None:
+        _outline_engine_instance = SmartRuleEngine()
+    try:
+        yield from _outline_engine_instance.extract_stream(pdf_path, mode)
+    except Exception as e:
+        yield {"event": "error", "detail": str(e)}